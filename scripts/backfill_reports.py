@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Re-render historical CIO reports from the local data stores.
+
+For each report date (UTC+8) in a range, the inputs the daily job saw are
+reconstructed without touching the network:
+
+- local radar: the first data/timeseries.jsonl row of that UTC day (the
+  00:00 UTC build-report run that daily_report.yml follows), else the last
+  row before it, else the day's data/snapshots/{date}.snapshot.json.
+  With --rescore the day's snapshot is re-scored with the current
+  config/scenario_rules.json instead.
+- macro / crypto / venues: from the published JSON sidecar when one exists;
+  older reports predate sidecars, so those sections render as N/A. Such a
+  render is never written over the published report (its market numbers
+  would be lost); it is only written with --out-dir.
+
+Social archives (data/social) are not an input: the report's social section
+is omitted by design.
+
+Days are rendered across a process pool. By default nothing is written and
+only a summary of which days differ from the published reports is printed;
+--write replaces the published Markdown + sidecar atomically (or writes to
+--out-dir).
+
+    python scripts/backfill_reports.py --start 2026-03-01 --end 2026-03-28
+    python scripts/backfill_reports.py --start 2026-03-01 --rescore --write --out-dir /tmp/backfill
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import datetime as dt
+import difflib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import build_snapshot
+from generate_report import OUT_DIR, VENUE_SOURCES, render
+from thesislab import report_sidecar
+from thesislab.report_model import LocalState, ReportData, TS_PATH, gather_market
+
+ROOT = Path(__file__).resolve().parents[1]
+SNAPSHOT_DIR = ROOT / "data" / "snapshots"
+RULES_PATH = ROOT / "config" / "scenario_rules.json"
+UTC8 = dt.timezone(dt.timedelta(hours=8))
+
+
+def _parse_date(s: str) -> dt.date:
+    return dt.date.fromisoformat(s)
+
+
+def load_rows(path: Path = TS_PATH) -> list[dict]:
+    if not path.exists():
+        return []
+    rows = [json.loads(x) for x in path.read_text(encoding="utf-8").splitlines() if x.strip()]
+    return sorted((r for r in rows if r.get("as_of_utc")), key=lambda r: r["as_of_utc"])
+
+
+def load_snapshot(day: dt.date) -> dict | None:
+    path = SNAPSHOT_DIR / f"{day.isoformat()}.snapshot.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def row_for_day(rows: list[dict], keys: list[str], day: dt.date) -> dict | None:
+    """First row of UTC `day`, else the last row before it."""
+    prefix = day.isoformat()
+    i = bisect.bisect_left(keys, prefix)
+    if i < len(keys) and keys[i].startswith(prefix):
+        return rows[i]
+    return rows[i - 1] if i > 0 else None
+
+
+def rescored_row(snapshot: dict, rules: dict) -> dict:
+    snapshot = dict(snapshot)
+    snapshot["scenario_probabilities"] = build_snapshot.calculate_scenario_probabilities(snapshot, rules)
+    return build_snapshot.timeseries_row(snapshot)
+
+
+def reconstruct(day: dt.date, rows: list[dict], keys: list[str], rescore_rules: dict | None = None) -> dict:
+    """Picklable inputs for one report date: {"date", "local", "local_source", "sidecar"}."""
+    snapshot = load_snapshot(day)
+    if rescore_rules is not None:
+        local = rescored_row(snapshot, rescore_rules) if snapshot else None
+        local_source = "snapshot-rescored" if snapshot else "missing"
+    else:
+        local = row_for_day(rows, keys, day)
+        local_source = "timeseries" if local else "missing"
+        if local is None and snapshot:
+            local, local_source = build_snapshot.timeseries_row(snapshot), "snapshot"
+    published = OUT_DIR / f"{day.isoformat()}-CIO-Report.md"
+    return {
+        "date": day.isoformat(),
+        "local": local,
+        "local_source": local_source,
+        "sidecar": report_sidecar.load_sidecar(published),
+    }
+
+
+def report_data(inputs: dict) -> ReportData:
+    sidecar = inputs["sidecar"]
+    local = LocalState.from_row(inputs["local"])
+    if sidecar:
+        r = ReportData.from_sidecar(sidecar)
+        r.local = local
+        return r
+    day = dt.date.fromisoformat(inputs["date"])
+    generated_at = dt.datetime.combine(day, dt.time(8, 30), tzinfo=UTC8).isoformat()
+    market = gather_market(offline=True)
+    market.sources.update({name: {"status": "skipped", "elapsed_s": 0.0} for name in VENUE_SOURCES})
+    return ReportData(date=inputs["date"], generated_at=generated_at, offline=True, market=market, local=local)
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def backfill_day(inputs: dict, out_dir: str | None) -> dict:
+    """Render one day; write it if `out_dir` is set. Runs in a worker process."""
+    r = report_data(inputs)
+    out = render(r, ("md", "json"))
+    md = out["md"]
+
+    published = OUT_DIR / f"{r.date}-CIO-Report.md"
+    old = published.read_text(encoding="utf-8") if published.exists() else None
+    if old is None:
+        status, added, removed = "new", md.count("\n"), 0
+    elif old == md:
+        status, added, removed = "identical", 0, 0
+    else:
+        status, added, removed = "differs", 0, 0
+        for line in difflib.unified_diff(old.splitlines(), md.splitlines(), lineterm="", n=0):
+            if line.startswith("+") and not line.startswith("+++"):
+                added += 1
+            elif line.startswith("-") and not line.startswith("---"):
+                removed += 1
+
+    # Without a sidecar the market sections are N/A: never replace real published numbers with that.
+    keep_published = (
+        out_dir is not None and old is not None and not inputs["sidecar"]
+        and Path(out_dir).resolve() == OUT_DIR.resolve()
+    )
+    written = bool(out_dir) and status != "identical" and not keep_published
+    if written:
+        target = Path(out_dir)
+        target.mkdir(parents=True, exist_ok=True)
+        md_path = target / published.name
+        _write_atomic(md_path, md)
+        sidecar = {"schema_version": report_sidecar.SCHEMA_VERSION, **out["json"]}
+        _write_atomic(report_sidecar.sidecar_path(md_path), json.dumps(sidecar, ensure_ascii=False, indent=2) + "\n")
+
+    return {
+        "date": r.date,
+        "status": status,
+        "added": added,
+        "removed": removed,
+        "local": inputs["local_source"],
+        "market": "sidecar" if inputs["sidecar"] else "n/a",
+        "kept": keep_published and status != "identical",
+    }
+
+
+def date_range(start: dt.date, end: dt.date) -> list[dt.date]:
+    return [start + dt.timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Re-render historical CIO reports from local data")
+    parser.add_argument("--start", type=_parse_date, required=True, help="First report date (YYYY-MM-DD, UTC+8)")
+    parser.add_argument("--end", type=_parse_date, help="Last report date (default: today UTC+8)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--rescore", action="store_true", help="Re-score each day's snapshot with the current rules")
+    parser.add_argument("--write", action="store_true", help="Write changed reports (default: summary only)")
+    parser.add_argument("--out-dir", type=Path, help="With --write: write here instead of replacing published reports")
+    parser.add_argument("--all", action="store_true", help="List identical days in the summary too")
+    args = parser.parse_args(argv)
+
+    end = args.end or dt.datetime.now(UTC8).date()
+    if end < args.start:
+        parser.error("--end is before --start")
+
+    rows = load_rows()
+    keys = [r["as_of_utc"] for r in rows]
+    rules = json.loads(RULES_PATH.read_text(encoding="utf-8")) if args.rescore else None
+    days = [reconstruct(d, rows, keys, rules) for d in date_range(args.start, end)]
+    days = [d for d in days if d["local"] or d["sidecar"]]
+
+    out_dir = str(args.out_dir or OUT_DIR) if args.write else None
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        results = list(pool.map(backfill_day, days, [out_dir] * len(days), chunksize=4))
+
+    counts: dict[str, int] = {}
+    for res in results:
+        counts[res["status"]] = counts.get(res["status"], 0) + 1
+        if res["kept"]:
+            counts["kept"] = counts.get("kept", 0) + 1
+        if args.all or res["status"] != "identical":
+            print(
+                f"{res['date']}  {res['status']:9}  +{res['added']:<3} -{res['removed']:<3}  "
+                f"local={res['local']} market={res['market']}"
+                + ("  (kept published: no sidecar, use --out-dir)" if res["kept"] else "")
+            )
+    summary = ", ".join(f"{k}={v}" for k, v in sorted(counts.items())) or "no days with inputs"
+    where = f" -> {out_dir}" if out_dir else " (dry run)"
+    print(f"[backfill] {args.start}..{end}: {summary}{where}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Measure interpreter start-up cost of the report entry points.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for
+each target (cwd scripts/, like the workflows), subtracts a bare-interpreter
+baseline and lists the most expensive imports. Heavy dependencies (yfinance,
+pandas, requests) must stay deferred until a live fetch needs them.
+
+Usage:
+  python scripts/bench_import_time.py
+  python scripts/bench_import_time.py generate_report --top 15
+  python scripts/bench_import_time.py --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DEFAULT_TARGETS = ("generate_report", "daily_cio_briefing", "build_trend_data", "scrape_social")
+HEAVY_MODULES = ("yfinance", "pandas", "numpy", "requests")
+
+
+def _importtime(statement: str) -> tuple[list[dict], set[str]]:
+    """Run `statement` under -X importtime; return per-module rows and loaded names."""
+    probe = f"{statement}; import sys; print(','.join(sorted(sys.modules)))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=SCRIPTS_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "top_level": not name.startswith("  ", 1),
+        })
+    loaded = set(proc.stdout.strip().split(","))
+    return rows, loaded
+
+
+def _total_us(rows: list[dict]) -> int:
+    return sum(r["cumulative_us"] for r in rows if r["top_level"])
+
+
+def measure(module: str, baseline_us: int, baseline_mods: set[str], top: int) -> dict:
+    rows, loaded = _importtime(f"import {module}")
+    total = _total_us(rows)
+    extra = [r for r in rows if r["module"].strip() not in baseline_mods]
+    extra.sort(key=lambda r: r["cumulative_us"], reverse=True)
+    return {
+        "module": module,
+        "total_ms": round(total / 1000, 2),
+        "over_baseline_ms": round((total - baseline_us) / 1000, 2),
+        "modules_loaded": len(loaded),
+        "heavy_loaded": [m for m in HEAVY_MODULES if m in loaded],
+        "top": [
+            {"module": r["module"].strip(), "cumulative_ms": round(r["cumulative_us"] / 1000, 2)}
+            for r in extra[:top]
+        ],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark import time of report entry points")
+    parser.add_argument("targets", nargs="*", default=list(DEFAULT_TARGETS))
+    parser.add_argument("--top", type=int, default=8, help="Most expensive imports to list")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    base_rows, base_mods = _importtime("pass")
+    baseline_us = _total_us(base_rows)
+    results = [measure(t, baseline_us, base_mods, args.top) for t in args.targets]
+
+    if args.json:
+        print(json.dumps({"baseline_ms": round(baseline_us / 1000, 2), "results": results}, indent=2))
+    else:
+        print(f"bare interpreter: {baseline_us / 1000:.1f} ms")
+        for r in results:
+            heavy = ", ".join(r["heavy_loaded"]) or "none"
+            print(f"\n{r['module']}: {r['total_ms']:.1f} ms (+{r['over_baseline_ms']:.1f} ms), heavy: {heavy}")
+            for t in r["top"]:
+                print(f"  {t['cumulative_ms']:8.2f} ms  {t['module']}")
+
+    return 1 if any(r["heavy_loaded"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
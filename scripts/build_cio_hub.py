@@ -4,20 +4,32 @@
 Output:
 - docs/cio-reports/latest.md (hub page)
 - docs/cio-reports/archive/*.md (historical reports)
+
+Per-report metadata (mtime, size, sha256, bull probability, price) is kept in
+data/cache/cio_hub_index.json so only new or changed reports are parsed and
+copied, and the average bull probability is maintained as a running sum.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
 import re
 import shutil
 from datetime import datetime, timezone
 from pathlib import Path
 
+from thesislab import report_sidecar
+from thesislab.build_cache import BuildCache, file_sha256
+
 ROOT = Path(__file__).resolve().parents[1]
 REPORTS_DIR = ROOT / "reports" / "cio_briefings"
 DOCS_CIO_DIR = ROOT / "docs" / "cio-reports"
 ARCHIVE_DIR = DOCS_CIO_DIR / "archive"
 LATEST_MD = DOCS_CIO_DIR / "latest.md"
+INDEX_PATH = ROOT / "data" / "cache" / "cio_hub_index.json"
+INDEX_VERSION = 2
+GENERATOR_VERSION = "1"
 
 DATE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})-CIO-Report\.md$")
 BULL_RE = re.compile(r"Bull Probability:\s*([0-9]+(?:\.[0-9]+)?)%")
@@ -45,7 +57,87 @@ def _extract_metric(pattern: re.Pattern, text: str) -> float | None:
         return None
 
 
-def _copy_archive(reports: list[Path]) -> None:
+def _report_metrics(rp: Path, data: bytes) -> tuple[float | None, float | None]:
+    """Bull probability and price from the JSON sidecar; regex fallback for older reports."""
+    sidecar = report_sidecar.load_sidecar(rp)
+    if sidecar is not None:
+        metrics = sidecar.get("metrics") or {}
+        return metrics.get("bull_pct"), metrics.get("price_usd")
+    txt = data.decode("utf-8", errors="ignore")
+    return _extract_metric(BULL_RE, txt), _extract_metric(PRICE_RE, txt)
+
+
+def _empty_index() -> dict:
+    return {"version": INDEX_VERSION, "reports": {}, "bull_sum": 0.0, "bull_count": 0}
+
+
+def _load_index() -> dict:
+    if not INDEX_PATH.exists():
+        return _empty_index()
+    try:
+        index = json.loads(INDEX_PATH.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return _empty_index()
+    return index if index.get("version") == INDEX_VERSION else _empty_index()
+
+
+def _save_index(index: dict) -> None:
+    INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = INDEX_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(index, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    tmp.replace(INDEX_PATH)
+
+
+def _add_bull(index: dict, entry: dict | None, sign: int) -> None:
+    if entry and entry.get("bull") is not None:
+        index["bull_sum"] += sign * entry["bull"]
+        index["bull_count"] += sign
+
+
+def _update_index(index: dict, reports: list[Path]) -> dict:
+    """Re-parse only reports whose mtime/size (then sha) changed; keep running bull totals."""
+    entries = index["reports"]
+    counts = {"parsed": 0, "unchanged": 0, "removed": 0}
+
+    for name in set(entries) - {rp.name for rp in reports}:
+        _add_bull(index, entries.pop(name), -1)
+        counts["removed"] += 1
+
+    for rp in reports:
+        st = rp.stat()
+        sc = report_sidecar.sidecar_path(rp)
+        sc_mtime = sc.stat().st_mtime_ns if sc.exists() else None
+        old = entries.get(rp.name)
+        if old and old["mtime_ns"] == st.st_mtime_ns and old["size"] == st.st_size and old.get("sidecar_mtime_ns") == sc_mtime:
+            counts["unchanged"] += 1
+            continue
+        data = rp.read_bytes()
+        sha = hashlib.sha256(data).hexdigest()
+        if old and old["sha256"] == sha and old.get("sidecar_mtime_ns") == sc_mtime:
+            old.update(mtime_ns=st.st_mtime_ns, size=st.st_size)
+            counts["unchanged"] += 1
+            continue
+
+        bull, price = _report_metrics(rp, data)
+        entry = {
+            "date": DATE_RE.match(rp.name).group(1),
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sidecar_mtime_ns": sc_mtime,
+            "sha256": sha,
+            "bull": bull,
+            "price": price,
+        }
+        if old:
+            entry["archive"] = old.get("archive")
+        _add_bull(index, old, -1)
+        _add_bull(index, entry, +1)
+        entries[rp.name] = entry
+        counts["parsed"] += 1
+    return counts
+
+
+def _copy_archive(reports: list[Path], index: dict) -> int:
     ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
 
     # Keep only current reports in archive output.
@@ -54,29 +146,28 @@ def _copy_archive(reports: list[Path]) -> None:
     for stale in existing - needed:
         (ARCHIVE_DIR / stale).unlink(missing_ok=True)
 
+    # A copy is current if it was made from the same sha and nobody touched it since.
+    copied = 0
     for rp in reports:
-        shutil.copy2(rp, ARCHIVE_DIR / rp.name)
+        entry = index["reports"][rp.name]
+        dst = ARCHIVE_DIR / rp.name
+        archived = entry.get("archive") or {}
+        if archived.get("sha256") == entry["sha256"] and dst.exists() and dst.stat().st_mtime_ns == archived.get("mtime_ns"):
+            continue
+        shutil.copy2(rp, dst)
+        entry["archive"] = {"sha256": entry["sha256"], "mtime_ns": dst.stat().st_mtime_ns}
+        copied += 1
+    return copied
 
 
-def _build_summary(reports: list[Path]) -> tuple[str, list[str]]:
+def _build_summary(reports: list[Path], index: dict) -> tuple[str, list[str]]:
     first = DATE_RE.match(reports[0].name).group(1)
     last = DATE_RE.match(reports[-1].name).group(1)
 
-    bull_vals = []
-    price_vals = []
-
-    for rp in reports:
-        txt = rp.read_text(encoding="utf-8", errors="ignore")
-        b = _extract_metric(BULL_RE, txt)
-        p = _extract_metric(PRICE_RE, txt)
-        if b is not None:
-            bull_vals.append(b)
-        if p is not None:
-            price_vals.append(p)
-
-    avg_bull = sum(bull_vals) / len(bull_vals) if bull_vals else None
-    latest_bull = bull_vals[-1] if bull_vals else None
-    latest_price = price_vals[-1] if price_vals else None
+    entries = [index["reports"][rp.name] for rp in reports]
+    avg_bull = index["bull_sum"] / index["bull_count"] if index["bull_count"] else None
+    latest_bull = next((e["bull"] for e in reversed(entries) if e.get("bull") is not None), None)
+    latest_price = next((e["price"] for e in reversed(entries) if e.get("price") is not None), None)
 
     paragraph = (
         "Across our full CIO report sequence, the core thesis remains intact: "
@@ -114,10 +205,27 @@ def main() -> None:
         raise SystemExit("No CIO reports found")
 
     DOCS_CIO_DIR.mkdir(parents=True, exist_ok=True)
-    _copy_archive(reports)
+    index = _load_index()
+    counts = _update_index(index, reports)
+    copied = _copy_archive(reports, index)
+    _save_index(index)
+    print(
+        f"index: parsed {counts['parsed']}, unchanged {counts['unchanged']}, "
+        f"removed {counts['removed']}; archive copies {copied}"
+    )
+
+    cache = BuildCache()
+    key = cache.digest_key(
+        GENERATOR_VERSION,
+        {rp.name: index["reports"][rp.name]["sha256"] for rp in reports} | {"generator": file_sha256(Path(__file__))},
+    )
+    if cache.fresh(LATEST_MD, key):
+        print(f"{LATEST_MD} up to date with {len(reports)} reports")
+        cache.report(detail=False)
+        return
 
     latest_text = reports[-1].read_text(encoding="utf-8", errors="ignore").strip()
-    summary_para, summary_bullets = _build_summary(reports)
+    summary_para, summary_bullets = _build_summary(reports, index)
     archive_head, archive_tail = _build_archive_links(reports)
 
     generated_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
@@ -153,8 +261,10 @@ def main() -> None:
     hub.append("")
     hub.append(f"_Hub generated automatically at {generated_at}_")
 
-    LATEST_MD.write_text("\n".join(hub) + "\n", encoding="utf-8")
+    cache.write_text(LATEST_MD, "\n".join(hub) + "\n", key)
+    cache.save()
     print(f"wrote {LATEST_MD} with {len(reports)} reports")
+    cache.report(detail=False)
 
 
 if __name__ == "__main__":
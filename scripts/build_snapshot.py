@@ -1,26 +1,31 @@
 #!/usr/bin/env python3
 import datetime as dt
 import json
+import math
 import os
 import random
 import time
 import urllib.error
+import urllib.parse
 import urllib.request
 import base64
+import functools
 import hashlib
 import hmac
 from pathlib import Path
 from typing import Dict, Optional
 
+from thesislab import circuit, derivatives_history, dex_depth, dex_pairs, rpc_pool, source_matrix, stream, telemetry, triggers, venues
+
 COINGECKO_PUBLIC_URL = (
     "https://api.coingecko.com/api/v3/simple/price"
     "?ids=official-trump&vs_currencies=usd"
-    "&include_market_cap=true&include_24hr_vol=true"
+    "&include_market_cap=true&include_24hr_vol=true&include_last_updated_at=true"
 )
 COINGECKO_PRO_URL = (
     "https://pro-api.coingecko.com/api/v3/simple/price"
     "?ids=official-trump&vs_currencies=usd"
-    "&include_market_cap=true&include_24hr_vol=true"
+    "&include_market_cap=true&include_24hr_vol=true&include_last_updated_at=true"
 )
 DEXSCREENER_URL = "https://api.dexscreener.com/latest/dex/tokens/6p6xgHyF7AeE6TZkSmFsko444wqoP15icUSqi2jfGiPN"
 SOL_TOKEN_ADDRESS = "6p6xgHyF7AeE6TZkSmFsko444wqoP15icUSqi2jfGiPN"
@@ -50,6 +55,8 @@ SOLANA_RPC_URLS = [
 SNAPSHOT_DIR = Path("data/snapshots")
 TIMESERIES_PATH = Path("data/timeseries.jsonl")
 RULES_PATH = Path("config/scenario_rules.json")
+KNOWN_HOLDERS_PATH = Path("config/known_holders.json")
+OWNER_CACHE_PATH = Path("data/token_account_owners.json")  # committed: owners never change
 
 
 class ApiNonRetryableError(Exception):
@@ -68,34 +75,79 @@ class ApiRetryableError(Exception):
     pass
 
 
+def _host(url: str) -> str:
+    return urllib.parse.urlsplit(url).hostname or url
+
+
+def _upstream(url: str) -> str:
+    return f"upstream.{_host(url)}"
+
+
+_OPEN_CIRCUIT_ERRORS = {"unauthorized": ApiUnauthorizedError, "not_found": ApiNotFoundError}
+
+
 def fetch_json(url: str, headers: Optional[dict] = None, timeout: int = 25) -> dict:
+    with telemetry.span(_upstream(url)):
+        return _fetch_json(url, headers, timeout)
+
+
+def _fetch_json(url: str, headers: Optional[dict], timeout: int) -> dict:
     req_headers = {"User-Agent": "trump-thesis-lab/4.0"}
     if headers:
         req_headers.update(headers)
 
+    host = _host(url)
+    endpoint = circuit.endpoint_key(url)
+    auth = circuit.auth_fingerprint(headers)
+    breaker = circuit.breaker()
+    try:
+        breaker.check(endpoint, auth)
+        breaker.check(host, auth)
+    except circuit.CircuitOpen as e:
+        telemetry.incr("circuit_skips")
+        raise _OPEN_CIRCUIT_ERRORS.get(e.reason, ApiRetryableError)(f"{e}: {url}")
+
     last_err = None
     for attempt in range(3):
+        circuit.bucket(host).acquire()
+        retry_after = None
         try:
             req = urllib.request.Request(url, headers=req_headers)
             with urllib.request.urlopen(req, timeout=timeout) as r:
-                return json.loads(r.read().decode("utf-8"))
+                body = r.read()
+                telemetry.incr("bytes_in", len(body))
+                data = json.loads(body.decode("utf-8"))
+            breaker.success(host)
+            breaker.success(endpoint)
+            return data
         except urllib.error.HTTPError as e:
             code = e.code
             if code in (401, 403):
+                breaker.failure(host, "unauthorized", hard=True, auth=auth)
                 raise ApiUnauthorizedError(f"{code} unauthorized/forbidden: {url}")
             if code == 404:
+                breaker.failure(endpoint, "not_found", hard=True, auth=auth)
                 raise ApiNotFoundError(f"404 not found: {url}")
             if code == 429 or 500 <= code < 600:
                 last_err = ApiRetryableError(f"retryable HTTP {code}: {url}")
+                retry_after = circuit.parse_retry_after(e.headers.get("Retry-After") if e.headers else None)
             else:
                 raise ApiNonRetryableError(f"non-retryable HTTP {code}: {url}")
         except (urllib.error.URLError, TimeoutError) as e:
             last_err = ApiRetryableError(str(e))
 
+        if retry_after is not None and retry_after > circuit.MAX_INLINE_WAIT_S:
+            breaker.failure(host, "rate_limited", retry_after=retry_after, auth=auth)
+            raise last_err
         if attempt < 2:
-            backoff = (2 ** attempt) + random.uniform(0.05, 0.35)
-            time.sleep(backoff)
+            telemetry.incr("retries")
+            if retry_after is not None:
+                circuit.bucket(host).pause(retry_after)
+            else:
+                backoff = (2 ** attempt) + random.uniform(0.05, 0.35)
+                time.sleep(backoff)
 
+    breaker.failure(host, "unavailable", auth=auth)
     if last_err:
         raise last_err
     raise ApiRetryableError(f"unknown retry failure: {url}")
@@ -104,6 +156,7 @@ def fetch_json(url: str, headers: Optional[dict] = None, timeout: int = 25) -> d
 
 
 # Binance USD-M Futures public endpoints (no auth required)
+BINANCE_SPOT_TICKER_URL = "https://api.binance.com/api/v3/ticker/24hr"
 BINANCE_FAPI_EXCHANGE_INFO = "https://fapi.binance.com/fapi/v1/exchangeInfo"
 BINANCE_FAPI_FUNDING_RATE = "https://fapi.binance.com/fapi/v1/fundingRate"
 BINANCE_FAPI_OPEN_INTEREST = "https://fapi.binance.com/fapi/v1/openInterest"
@@ -123,12 +176,38 @@ def fetch_binance_futures_symbol_exists(symbol: str) -> bool:
 
 
 def fetch_binance_futures_metrics(symbol: str = "TRUMPUSDT") -> dict:
-    """Fetch lightweight derivatives metrics for trend scoring (public endpoints, no auth)."""
-    out = {"source": "binance-futures", "symbol": symbol}
-    if not fetch_binance_futures_symbol_exists(symbol):
-        out["error"] = f"symbol_not_found:{symbol}"
-        return out
+    """Fetch lightweight derivatives metrics for trend scoring (public endpoints, no auth).
 
+    While scripts/stream_ingest.py keeps data/stream/latest.json fresh, the
+    latest values come from the WebSocket aggregates and the REST polls are
+    skipped; the history store is updated either way.
+    """
+    live = stream.load_latest(symbol)
+    if live:
+        out = dict(live)
+    else:
+        out = {"source": "binance-futures", "symbol": symbol}
+        if not fetch_binance_futures_symbol_exists(symbol):
+            out["error"] = f"symbol_not_found:{symbol}"
+            return out
+        fetch_binance_futures_rest(symbol, out)
+
+    # multi-window features from the local history store (fetches only rows newer than the last stored one)
+    with telemetry.span("stage.derivatives_history"):
+        derivatives_history.update(symbol, fetch_json)
+        # Windows without stored rows come back None: keep the REST/stream value for those.
+        out.update({k: v for k, v in derivatives_history.features(symbol).items() if v is not None})
+    if out.get("open_interest_24h_change_pct") is None:
+        out["open_interest_24h_change_pct"] = out.get("open_interest_change_pct_1d")
+    if live and out.get("open_interest") is None:
+        oi = derivatives_history.load(symbol, "open_interest")
+        out["open_interest"] = oi[-1].get("oi") if oi else None
+
+    return out
+
+
+def fetch_binance_futures_rest(symbol: str, out: dict) -> None:
+    """Latest funding, open interest and 1d taker ratio from the REST endpoints (fills `out`)."""
     # funding rate (latest 8h)
     try:
         fr = fetch_json(f"{BINANCE_FAPI_FUNDING_RATE}?symbol={symbol}&limit=1")
@@ -165,7 +244,6 @@ def fetch_binance_futures_metrics(symbol: str = "TRUMPUSDT") -> dict:
     except Exception:
         pass
 
-    return out
 
 def load_rules(path: Path = RULES_PATH) -> dict:
     return json.loads(path.read_text(encoding="utf-8"))
@@ -235,24 +313,103 @@ def _compute_top10_pct(holders: list, total_supply: Optional[float], decimals: O
     return round(pct, 4)
 
 
-def rpc_call(method: str, params: list) -> dict:
-    payload = json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params}).encode("utf-8")
-    last_err = None
-    for rpc_url in SOLANA_RPC_URLS:
-        try:
-            req = urllib.request.Request(
-                rpc_url,
-                data=payload,
-                headers={"Content-Type": "application/json", "User-Agent": "trump-thesis-lab/3.3"},
-            )
-            with urllib.request.urlopen(req, timeout=25) as r:
-                return json.loads(r.read().decode("utf-8"))
-        except Exception as e:
-            last_err = e
-            continue
-    if last_err:
-        raise last_err
-    raise RuntimeError("No Solana RPC endpoint available")
+@functools.lru_cache(maxsize=None)
+def _probe_matrix() -> Optional[dict]:
+    """Latest debug_onchain_sources.py matrix (if fresh): source order and timeouts."""
+    return source_matrix.load()
+
+
+@functools.lru_cache(maxsize=None)
+def _rpc_pool() -> rpc_pool.RpcPool:
+    return rpc_pool.RpcPool(SOLANA_RPC_URLS)
+
+
+def rpc_call(method: str, params: list, race: bool = False) -> dict:
+    """One JSON-RPC call on the fastest healthy endpoint (race=True: top two in parallel)."""
+    return _rpc_pool().call(method, params, race=race)
+
+
+def rpc_batch(calls: list[tuple[str, list]], race: bool = False) -> list[dict]:
+    """Several JSON-RPC calls in one HTTP round-trip; responses in call order."""
+    return _rpc_pool().batch(calls, race=race)
+
+
+def _load_owner_cache() -> Dict[str, str]:
+    try:
+        return json.loads(OWNER_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _resolve_owners(token_accounts: list[str]) -> Dict[str, str]:
+    """Token account -> owner wallet. Owners never change, so only unseen accounts cost an RPC call."""
+    cache = _load_owner_cache()
+    missing = [a for a in token_accounts if a not in cache]
+    if missing:
+        resp = rpc_call("getMultipleAccounts", [missing, {"encoding": "jsonParsed"}])
+        values = ((resp.get("result") or {}).get("value") or []) if isinstance(resp, dict) else []
+        for addr, acc in zip(missing, values):
+            owner = ((((acc or {}).get("data") or {}).get("parsed") or {}).get("info") or {}).get("owner")
+            if owner:
+                cache[addr] = owner
+        OWNER_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        OWNER_CACHE_PATH.write_text(json.dumps(cache, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return {a: cache[a] for a in token_accounts if a in cache}
+
+
+def fetch_rpc_top10() -> tuple[Optional[float], dict]:
+    """Top-10 owner concentration from Solana RPC: largest accounts + supply in one batched round-trip.
+
+    Token accounts are grouped by owner (cached in the committed
+    data/token_account_owners.json, so a CI run only pays a second RPC call
+    for accounts it has never seen), so one wallet holding several accounts
+    counts once. Owners listed in config/known_holders.json are only labelled
+    in the returned breakdown (by_kind_pct): exchange and LP wallets still
+    count toward the top-10 percentage. getTokenLargestAccounts returns the
+    20 largest accounts, which bounds the owner grouping.
+    """
+    largest, supply = rpc_batch(
+        [("getTokenLargestAccounts", [SOL_TOKEN_ADDRESS]), ("getTokenSupply", [SOL_TOKEN_ADDRESS])],
+        race=True,
+    )
+    for resp in (largest, supply):
+        if not isinstance(resp, dict) or "error" in resp:
+            raise ApiRetryableError(f"solana rpc error: {(resp or {}).get('error')}")
+    accounts = (largest.get("result") or {}).get("value") or []
+    sv = (supply.get("result") or {}).get("value") or {}
+    total_supply, decimals = to_float(sv.get("amount")), to_float(sv.get("decimals"))
+
+    try:
+        owners = _resolve_owners([a["address"] for a in accounts if a.get("address")])
+    except Exception:
+        owners = {}
+    by_owner: Dict[str, float] = {}
+    for a in accounts:
+        key = owners.get(a.get("address"), a.get("address"))
+        by_owner[key] = by_owner.get(key, 0.0) + (to_float(a.get("amount")) or 0.0)
+    holders = [{"owner": o, "amount": amt} for o, amt in sorted(by_owner.items(), key=lambda kv: -kv[1])]
+
+    pct = _compute_top10_pct(holders, total_supply, decimals, amount_key="amount")
+    try:
+        known = json.loads(KNOWN_HOLDERS_PATH.read_text(encoding="utf-8")).get("owners") or {}
+    except (OSError, json.JSONDecodeError):
+        known = {}
+    detail = {"owners_resolved": len(owners), "accounts": len(accounts), "by_kind_pct": {}}
+    if pct is not None:
+        for h in holders[:10]:
+            kind = (known.get(h["owner"]) or {}).get("kind", "unlabelled")
+            share = h["amount"] / total_supply * 100.0
+            detail["by_kind_pct"][kind] = round(detail["by_kind_pct"].get(kind, 0.0) + share, 4)
+    return pct, detail
+
+
+def fetch_dex_depth(pairs: list, price_usd: Optional[float]) -> dict:
+    """Depth-2% estimate over the DexScreener pools; CLMM pools use their on-chain active liquidity when RPC answers."""
+    try:
+        clmm = dex_depth.clmm_states(pairs, rpc_call)
+    except Exception:
+        clmm = None
+    return dex_depth.estimate(pairs, SOL_TOKEN_ADDRESS, price_usd, clmm=clmm)
 
 
 def compute_top10_proxy(liquidity_usd: Optional[float], fdv_usd: Optional[float]) -> Optional[float]:
@@ -310,8 +467,11 @@ def fetch_bitget_token_info() -> Optional[dict]:
     )
 
     try:
-        with urllib.request.urlopen(req, timeout=30) as r:
-            data = json.loads(r.read().decode("utf-8"))
+        timeout = source_matrix.timeout_for(_probe_matrix(), "bitget/baseinfo", 30)
+        with telemetry.span(_upstream(base_url)), urllib.request.urlopen(req, timeout=timeout) as r:
+            body = r.read()
+            telemetry.incr("bytes_in", len(body))
+            data = json.loads(body.decode("utf-8"))
             if data.get("status") == 0:
                 token_list = ((data.get("data") or {}).get("list") or [])
                 if token_list:
@@ -330,12 +490,13 @@ def fetch_okx_token_info() -> Optional[dict]:
         if not okx_script.exists():
             return None
 
-        result = subprocess.run(
-            ["python3", str(okx_script)],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        with telemetry.span("upstream.okx-onchainos"):
+            result = subprocess.run(
+                ["python3", str(okx_script)],
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
         if result.returncode == 0:
             data = json.loads(result.stdout)
             if "error" not in data:
@@ -351,7 +512,7 @@ def fetch_binance_web3_token_info() -> Optional[dict]:
         resp = fetch_json(
             BINANCE_WEB3_DYNAMIC_URL + f"?chainId=CT_501&contractAddress={SOL_TOKEN_ADDRESS}",
             headers={"Accept-Encoding": "identity"},
-            timeout=25,
+            timeout=source_matrix.timeout_for(_probe_matrix(), "binance-web3/dynamic", 25),
         )
         if isinstance(resp, dict):
             data = resp.get("data") or {}
@@ -362,6 +523,40 @@ def fetch_binance_web3_token_info() -> Optional[dict]:
     return None
 
 
+def fetch_binance_spot_ticker(symbol: str = "TRUMPUSDT") -> Optional[dict]:
+    """Binance spot 24h ticker (CEX anchor for the venue reconciliation)."""
+    try:
+        data = fetch_json(BINANCE_SPOT_TICKER_URL + f"?symbol={symbol}", timeout=15)
+    except Exception:
+        return None
+    return data if isinstance(data, dict) and data.get("lastPrice") else None
+
+
+def venue_quote(name: str, data, dex: dict) -> dict:
+    """Price/liquidity/volume (and the venue's own timestamp, if any) from one venue payload."""
+    if name == "dexscreener":
+        return {"price_usd": dex["price_usd"], "liquidity_usd": dex["liquidity_usd"], "volume_24h_usd": dex["volume_24h_usd"]}
+    if not data:
+        return {}
+    if name == "coingecko":
+        t = data.get("official-trump") or {}
+        return {"price_usd": to_float(t.get("usd")), "volume_24h_usd": to_float(t.get("usd_24h_vol")),
+                "as_of": to_float(t.get("last_updated_at"))}
+    if name == "binance-web3":
+        return {"price_usd": to_float(data.get("price")), "liquidity_usd": to_float(data.get("liquidity")),
+                "volume_24h_usd": to_float(data.get("volume24h"))}
+    if name == "okx-onchainos":
+        return {"price_usd": to_float(data.get("price_usd")), "liquidity_usd": to_float(data.get("liquidity")),
+                "volume_24h_usd": to_float(data.get("volume_24h"))}
+    if name == "bitget-wallet":
+        return {"price_usd": to_float(data.get("price")), "liquidity_usd": to_float(data.get("liquidity"))}
+    if name == "binance-spot":
+        close_ms = to_float(data.get("closeTime"))
+        return {"price_usd": to_float(data.get("lastPrice")), "volume_24h_usd": to_float(data.get("quoteVolume")),
+                "as_of": close_ms / 1000 if close_ms else None}
+    return {}
+
+
 def fetch_dune_whale_exchange_flow() -> Optional[dict]:
     """Optional Dune-backed whale->exchange netflow feed.
 
@@ -399,49 +594,48 @@ def fetch_dune_whale_exchange_flow() -> Optional[dict]:
         return None
 
 
-def fetch_top10_holder_pct(liquidity_usd: Optional[float], fdv_usd: Optional[float], binance_data: Optional[dict] = None) -> tuple[Optional[float], str, bool, list[str]]:
+def fetch_top10_holder_pct(liquidity_usd: Optional[float], fdv_usd: Optional[float], venue_results: Optional[dict] = None, breakdown: Optional[dict] = None) -> tuple[Optional[float], str, bool, list[str]]:
     """
     Returns (top10_holder_pct, source_id, using_proxy, risk_flags).
+    `venue_results` is the venues.gather() output of build(); tier 0 only reads it, never re-fetches.
+    If `breakdown` is given, it is filled with the Solana RPC owner breakdown when that tier answers.
     Fallback tree:
       Tier 0a: Binance Web3 (primary)
       Tier 0b: OKX OnChainOS (backup 1)
       Tier 0c: Bitget Wallet (backup 2)
       Tier 1: Solscan Pro hard truth
+      Tier 1b: Solana RPC largest accounts (first-party)
       Tier 2: Moralis trend proxy (holder stats)
       Tier 3: Heuristic proxy
     """
     flags: list[str] = []
+    venue_results = venue_results or {}
+
+    def gathered(venue: str, flag: str) -> Optional[dict]:
+        r = venue_results.get(venue) or {}
+        if r.get("status") in ("error", "timeout"):
+            flags.append(flag)
+        return r.get("data")
 
     # Tier 0a: Binance Web3 (primary)
-    try:
-        bd = binance_data if binance_data else fetch_binance_web3_token_info()
-        if bd:
-            top10_pct = to_float(bd.get("top10HoldersPercentage") or bd.get("holdersTop10Percent"))
-            if top10_pct is not None:
-                return round(top10_pct, 4), "binance-web3", False, flags
-    except Exception:
-        flags.append("binance_web3_unavailable")
+    bd = gathered("binance-web3", "binance_web3_unavailable")
+    if bd:
+        top10_pct = to_float(bd.get("top10HoldersPercentage") or bd.get("holdersTop10Percent"))
+        if top10_pct is not None:
+            return round(top10_pct, 4), "binance-web3", False, flags
 
     # Tier 0b: OKX OnChainOS (backup 1)
-    try:
-        okx_data = fetch_okx_token_info()
-        if okx_data:
-            # OKX currently has no direct top10 holder concentration output for this token.
-            pass
-    except Exception:
-        flags.append("okx_unavailable")
+    # OKX currently has no direct top10 holder concentration output for this token.
+    gathered("okx-onchainos", "okx_unavailable")
 
     # Tier 0c: Bitget Wallet (backup 2)
-    try:
-        bitget_data = fetch_bitget_token_info()
-        if bitget_data:
-            top10_pct = to_float(bitget_data.get("top10_holder_percent"))
-            if top10_pct is not None:
-                # Bitget returns decimal (0.9137 = 91.37%), convert to percentage
-                top10_pct_normalized = top10_pct * 100 if top10_pct < 1.0 else top10_pct
-                return round(top10_pct_normalized, 4), "bitget-wallet", False, flags
-    except Exception:
-        flags.append("bitget_wallet_unavailable")
+    bitget_data = gathered("bitget-wallet", "bitget_wallet_unavailable")
+    if bitget_data:
+        top10_pct = to_float(bitget_data.get("top10_holder_percent"))
+        if top10_pct is not None:
+            # Bitget returns decimal (0.9137 = 91.37%), convert to percentage
+            top10_pct_normalized = top10_pct * 100 if top10_pct < 1.0 else top10_pct
+            return round(top10_pct_normalized, 4), "bitget-wallet", False, flags
 
     # Tier 1: Solscan Pro hard truth
     try:
@@ -464,6 +658,16 @@ def fetch_top10_holder_pct(liquidity_usd: Optional[float], fdv_usd: Optional[flo
     except (ApiNotFoundError, ApiNonRetryableError, ApiRetryableError):
         flags.append("solscan_pro_unavailable")
 
+    # Tier 1b: first-party Solana RPC (largest accounts + supply, one batched call)
+    try:
+        pct, detail = fetch_rpc_top10()
+        if pct is not None:
+            if breakdown is not None:
+                breakdown.update(detail)
+            return pct, "solana-rpc", False, flags
+    except Exception:
+        flags.append("solana_rpc_unavailable")
+
     # Tier 2: Moralis holder stats (real holder count + change trends)
     try:
         moralis_key = os.getenv("MORALIS_API_KEY")
@@ -499,8 +703,9 @@ def fetch_top10_holder_pct(liquidity_usd: Optional[float], fdv_usd: Optional[flo
     return None, "heuristic-proxy", True, flags + ["using_heuristic_proxy"]
 
 
-def append_timeseries(snapshot: dict) -> None:
-    row = {
+def timeseries_row(snapshot: dict) -> dict:
+    """The data/timeseries.jsonl projection of a snapshot."""
+    return {
         "as_of_utc": snapshot.get("as_of_utc"),
         "price_usd": (snapshot.get("market") or {}).get("price_usd"),
         "mcap_usd": (snapshot.get("market") or {}).get("mcap_usd"),
@@ -510,13 +715,44 @@ def append_timeseries(snapshot: dict) -> None:
         "sells_24h": (snapshot.get("market") or {}).get("sells_24h"),
         "txn_total_24h": (snapshot.get("market") or {}).get("txn_total_24h"),
         "top10_holder_pct": (snapshot.get("onchain") or {}).get("top10_holder_pct"),
+        "dex_depth_2pct_usd": (snapshot.get("onchain") or {}).get("dex_depth_2pct_usd"),
+        "exchange_netflow_usd_24h": (snapshot.get("onchain") or {}).get("exchange_netflow_usd_24h"),
         "derivatives": snapshot.get("derivatives") or {},
         "scenario_probabilities": snapshot.get("scenario_probabilities") or {},
-        "risk_flags": [rf.get("id") for rf in (snapshot.get("risk_flags") or [])]
+        "risk_flags": [rf.get("id") for rf in (snapshot.get("risk_flags") or [])],
+        "triggers": {k: v.get("state") for k, v in (snapshot.get("triggers") or {}).items()},
+        "trigger_transitions": snapshot.get("trigger_transitions") or [],
     }
+
+
+def append_timeseries(snapshot: dict) -> dict:
+    row = timeseries_row(snapshot)
     TIMESERIES_PATH.parent.mkdir(parents=True, exist_ok=True)
     with TIMESERIES_PATH.open("a", encoding="utf-8") as f:
         f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    return row
+
+
+HORIZON_MINUTES = {"5m": 5, "1h": 60, "4h": 240, "1d": 1440, "7d": 10080}
+
+
+def stream_covers(derivatives: dict, horizon: str, stream_only: bool = False) -> bool:
+    """Whether a horizon's value can be trusted: history-store windows always, stream-only
+    values once the WebSocket stream has run for the whole horizon (`minutes`)."""
+    if not stream_only and horizon in derivatives_history.WINDOWS_MS:
+        return True
+    minutes = to_float(derivatives.get("minutes"))
+    return minutes is not None and minutes >= HORIZON_MINUTES.get(horizon, math.inf)
+
+
+def blended_taker_ratio(derivatives: dict, horizon_weights: dict) -> Optional[float]:
+    """Weighted geometric mean of taker_buy_sell_ratio_<h> over the covered horizons present."""
+    ratios = {h: to_float(derivatives.get(f"taker_buy_sell_ratio_{h}")) for h in horizon_weights if stream_covers(derivatives, h)}
+    ratios = {h: r for h, r in ratios.items() if r is not None and r > 0}
+    total = sum(float(horizon_weights[h]) for h in ratios)
+    if total <= 0:
+        return None
+    return math.exp(sum(float(horizon_weights[h]) * math.log(r) for h, r in ratios.items()) / total)
 
 
 def calculate_scenario_probabilities(data: dict, rules: dict) -> Dict[str, float]:
@@ -543,7 +779,8 @@ def calculate_scenario_probabilities(data: dict, rules: dict) -> Dict[str, float
             add_alloc(probs, liq_alloc["fragile"])
 
     # 2) Momentum (A: trend-first)
-    #   - Primary: Binance Futures taker buy/sell ratio (derivatives_momentum)
+    #   - Primary: Binance Futures taker buy/sell ratio, blended over horizons, and
+    #     liquidation imbalance from the WebSocket bars (derivatives_momentum)
     #   - Secondary: Dex txns buy/sell ratio (dex_momentum, low weight)
 
     # 2a) Derivatives momentum (primary)
@@ -551,7 +788,7 @@ def calculate_scenario_probabilities(data: dict, rules: dict) -> Dict[str, float
     der_taker = (der_cfg.get("taker_buy_sell_ratio") or {})
     der_alloc = (der_taker.get("allocations") or {})
 
-    taker_ratio = to_float((data.get("derivatives") or {}).get("taker_buy_sell_ratio_1d"))
+    taker_ratio = blended_taker_ratio(data.get("derivatives") or {}, der_taker.get("horizon_weights") or {"1d": 1.0})
     bull_min = float(der_taker.get("bull_min_ratio", 1.02))
     stress_max = float(der_taker.get("stress_max_ratio", 0.85))
     bull_den = float((der_taker.get("strength_scales") or {}).get("bull_denominator", 0.4))
@@ -581,12 +818,27 @@ def calculate_scenario_probabilities(data: dict, rules: dict) -> Dict[str, float
         probs["Base"] += float(neutral["base"]) - abs(shift) * 0.5
         probs["Stress"] += float(neutral["stress"]) - shift
 
+    # Liquidation imbalance: forced short covering leans Bull, forced long selling leans Stress.
+    liqd_cfg = der_cfg.get("liquidation_imbalance") or {}
+    horizon = liqd_cfg.get("horizon", "1h")
+    der = data.get("derivatives") or {}
+    imbalance = to_float(der.get(f"liquidation_imbalance_{horizon}"))
+    liq_total = (to_float(der.get(f"liquidations_long_usd_{horizon}")) or 0.0) + (to_float(der.get(f"liquidations_short_usd_{horizon}")) or 0.0)
+    if (imbalance is not None and stream_covers(der, horizon, stream_only=True)
+            and liq_total >= float(liqd_cfg.get("min_total_usd", 50000))):
+        shift = clamp(imbalance, -1.0, 1.0) * float(liqd_cfg.get("max_shift", 0.02))
+        probs["Bull"] += shift
+        probs["Stress"] -= shift
+
     # trend-first: only light soft penalties
     soft = (der_cfg.get("soft_penalties") or {})
     fr_cfg = (soft.get("funding_abs_8h_pct") or {})
     oi_cfg = (soft.get("open_interest_change_24h_pct") or {})
 
-    fr = to_float((data.get("derivatives") or {}).get("funding_rate"))
+    # Funding EMA (history store) when available: one 8h print is too noisy for a penalty.
+    fr = to_float((data.get("derivatives") or {}).get("funding_ema"))
+    if fr is None:
+        fr = to_float((data.get("derivatives") or {}).get("funding_rate"))
     if fr is not None:
         fr_abs_pct = abs(fr) * 100.0
         if fr_abs_pct >= float(fr_cfg.get("high", 0.05)):
@@ -696,35 +948,54 @@ def calculate_scenario_probabilities(data: dict, rules: dict) -> Dict[str, float
     return probs
 
 
-def main() -> None:
-    rules = load_rules()
+def main(rules: Optional[dict] = None) -> dict:
+    """Build today's snapshot; returns the snapshot and the appended timeseries row."""
+    telemetry.start("build_snapshot")
+    try:
+        return build(rules)
+    finally:
+        circuit.save()
+        _rpc_pool().save()
+        telemetry.finish()
+
+
+def build(rules: Optional[dict] = None) -> dict:
+    if rules is None:
+        rules = load_rules()
     now = dt.datetime.now(dt.UTC).replace(microsecond=0)
     as_of = now.isoformat().replace("+00:00", "Z")
     date_key = now.strftime("%Y-%m-%d")
 
     today_file = SNAPSHOT_DIR / f"{date_key}.snapshot.json"
 
-    cg = fetch_coingecko_price()
-    ds = fetch_json(DEXSCREENER_URL)
-
-    token = cg.get("official-trump", {})
-    pairs = ds.get("pairs", [])
-    p0 = pairs[0] if pairs else {}
+    # Every venue at once; a venue that fails or hangs is dropped, not waited for.
+    with telemetry.span("stage.venues"):
+        raw = venues.gather({
+            "coingecko": fetch_coingecko_price,
+            "dexscreener": lambda: fetch_json(DEXSCREENER_URL),
+            "binance-web3": fetch_binance_web3_token_info,
+            "okx-onchainos": fetch_okx_token_info,
+            "bitget-wallet": fetch_bitget_token_info,
+            "binance-spot": fetch_binance_spot_ticker,
+        })
+    token = (raw["coingecko"]["data"] or {}).get("official-trump", {})
+    pairs = (raw["dexscreener"]["data"] or {}).get("pairs") or []
+    with telemetry.span("stage.dex_pairs"):
+        dex = dex_pairs.aggregate(pairs, SOL_TOKEN_ADDRESS)
 
-    # Binance Web3 primary market dataset; Dexscreener/CoinGecko remain fallback/cross-check.
-    binance_data = fetch_binance_web3_token_info()
+    # Binance Web3 primary for FDV/price change; price, liquidity and volume are the cross-venue consensus.
+    binance_data = raw["binance-web3"]["data"]
+    rec = venues.reconcile({name: venue_quote(name, r["data"], dex) for name, r in raw.items()}, raw)
+    consensus = {field: c["value"] for field, c in rec["consensus"].items()}
 
-    liquidity_usd = to_float((binance_data or {}).get("liquidity")) if binance_data else None
-    if liquidity_usd is None:
-        liquidity_usd = to_float(((p0.get("liquidity") or {}).get("usd")))
+    liquidity_usd = consensus["liquidity_usd"]
 
     fdv_usd = to_float((binance_data or {}).get("marketCap")) if binance_data else None
     if fdv_usd is None:
-        fdv_usd = to_float(p0.get("fdv"))
+        fdv_usd = dex["fdv_usd"]
 
-    txns_h24 = p0.get("txns", {}).get("h24", {}) if isinstance(p0.get("txns"), dict) else {}
-    buys_24h = to_float(txns_h24.get("buys"))
-    sells_24h = to_float(txns_h24.get("sells"))
+    buys_24h = dex["buys_24h"]
+    sells_24h = dex["sells_24h"]
     buy_sell_ratio_24h = None
     if buys_24h is not None and sells_24h is not None:
         buy_sell_ratio_24h = 9.99 if sells_24h == 0 else buys_24h / sells_24h
@@ -735,23 +1006,30 @@ def main() -> None:
 
     price_change_24h_pct = to_float((binance_data or {}).get("percentChange24h")) if binance_data else None
     if price_change_24h_pct is None:
-        price_change_24h_pct = to_float(((p0.get("priceChange") or {}).get("h24")))
+        price_change_24h_pct = dex["price_change_24h_pct"]
 
     liq_fdv_ratio = None
     if liquidity_usd is not None and fdv_usd not in (None, 0):
         liq_fdv_ratio = liquidity_usd / fdv_usd
 
-    top10_holder_pct, holder_source, using_proxy, top10_flags = fetch_top10_holder_pct(liquidity_usd, fdv_usd, binance_data=binance_data)
+    top10_breakdown: dict = {}
+    top10_holder_pct, holder_source, using_proxy, top10_flags = fetch_top10_holder_pct(
+        liquidity_usd, fdv_usd, venue_results=raw, breakdown=top10_breakdown
+    )
     exchange_flow = fetch_dune_whale_exchange_flow() or {}
     derivatives = fetch_binance_futures_metrics("TRUMPUSDT")
 
+    price_usd = consensus["price_usd"]
+    depth = fetch_dex_depth(dex["accepted"], price_usd)
+    dex_depth_2pct_usd = depth.pop("depth_2pct_usd")
+
     snapshot = {
         "as_of_utc": as_of,
         "asset": "TRUMP",
         "market": {
-            "price_usd": to_float((binance_data or {}).get("price")) if binance_data else to_float(token.get("usd")),
+            "price_usd": price_usd,
             "mcap_usd": to_float((binance_data or {}).get("marketCap")) if binance_data else to_float(token.get("usd_market_cap")),
-            "volume_24h_usd": to_float((binance_data or {}).get("volume24h")) if binance_data else to_float(token.get("usd_24h_vol")),
+            "volume_24h_usd": consensus["volume_24h_usd"],
             "liquidity_usd": liquidity_usd,
             "fdv_usd": fdv_usd,
             "buys_24h": buys_24h,
@@ -762,7 +1040,9 @@ def main() -> None:
         "onchain": {
             "top10_holder_pct": top10_holder_pct,
             "top10_holder_source": holder_source,
-            "dex_depth_2pct_usd": None,
+            "top10_holder_breakdown": top10_breakdown or None,
+            "dex_depth_2pct_usd": dex_depth_2pct_usd,
+            "dex_depth_detail": depth if dex_depth_2pct_usd is not None else None,
             "exchange_inflow_usd_24h": exchange_flow.get("exchange_inflow_usd_24h"),
             "exchange_outflow_usd_24h": exchange_flow.get("exchange_outflow_usd_24h"),
             "exchange_netflow_usd_24h": exchange_flow.get("exchange_netflow_usd_24h"),
@@ -773,6 +1053,13 @@ def main() -> None:
             "liquidity_change_24h": round(liquidity_change_24h, 6) if liquidity_change_24h is not None else None,
             "price_change_24h_pct": round(price_change_24h_pct, 4) if price_change_24h_pct is not None else None
         },
+        "venues": {"consensus": rec["consensus"], "quotes": rec["venues"]},
+        "dex": {
+            "price_usd": dex["price_usd"],
+            "volume_24h_usd": dex["volume_24h_usd"],
+            "by_dex": dex["by_dex"],
+            "pairs": dex["table"],
+        },
         "derivatives": derivatives,
         "scenario_probabilities": {},
         "risk_flags": [],
@@ -809,6 +1096,23 @@ def main() -> None:
             "evidence": [f"source:{holder_source}"]
         })
 
+    for venue, field in rec["divergent"]:
+        q = rec["venues"][venue]
+        snapshot["risk_flags"].append({
+            "id": f"venue_divergent_{venue}",
+            "triggered": True,
+            "severity": "medium" if field == "price_usd" else "low",
+            "evidence": [f"field:{field}", f"value:{q[field]}", f"consensus:{rec['consensus'][field]['value']}"]
+        })
+
+    if dex_depth_2pct_usd is None:
+        snapshot["risk_flags"].append({
+            "id": "dex_depth_unavailable",
+            "triggered": True,
+            "severity": "low",
+            "evidence": ["source:dexscreener(pairs)"]
+        })
+
     if snapshot["onchain"].get("exchange_inflow_usd_24h") is None or snapshot["onchain"].get("exchange_outflow_usd_24h") is None:
         snapshot["risk_flags"].append({
             "id": "exchange_flow_unavailable",
@@ -817,13 +1121,23 @@ def main() -> None:
             "evidence": ["source:dune(optional)"]
         })
 
-    snapshot["scenario_probabilities"] = calculate_scenario_probabilities(snapshot, rules)
+    with telemetry.span("stage.score"):
+        snapshot["scenario_probabilities"] = calculate_scenario_probabilities(snapshot, rules)
+
+    with telemetry.span("stage.triggers"):
+        engine = triggers.from_rows(triggers.load_rows(TIMESERIES_PATH), until=as_of)
+        snapshot["trigger_transitions"] = engine.update(timeseries_row(snapshot))
+        snapshot["triggers"] = engine.report()
+        for t in snapshot["trigger_transitions"]:
+            print(f"trigger {t['trigger']}: {t['from']} -> {t['to']}")
 
-    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
-    today_file.write_text(json.dumps(snapshot, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
-    append_timeseries(snapshot)
+    with telemetry.span("stage.write"):
+        SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+        today_file.write_text(json.dumps(snapshot, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        row = append_timeseries(snapshot)
     print(f"wrote {today_file}")
     print(f"appended {TIMESERIES_PATH}")
+    return {"snapshot": snapshot, "timeseries_row": row}
 
 
 if __name__ == "__main__":
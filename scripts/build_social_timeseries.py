@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""Maintain hourly social engagement aggregates (see thesislab/social_timeseries.py).
+
+Usage:
+  python scripts/build_social_timeseries.py            # refresh rolling windows
+  python scripts/build_social_timeseries.py --rebuild  # re-ingest every raw social file
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from thesislab import social_timeseries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain hourly social engagement aggregates")
+    parser.add_argument("--rebuild", action="store_true", help="Re-ingest all raw social files")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        rows = social_timeseries.rebuild()
+        print(f"wrote {social_timeseries.TIMESERIES_PATH} ({rows} bucket rows)")
+    social_timeseries.refresh_rolling()
+    print(f"wrote {social_timeseries.ROLLING_PATH}")
+
+
+if __name__ == "__main__":
+    main()
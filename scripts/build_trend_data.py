@@ -5,6 +5,8 @@ Output: docs/assets/data/trends.json
 Includes:
 - points_raw: original snapshot-level points
 - points_daily: day-level averages for smoother dashboard view
+- social: rolling 24h/72h/7d engagement windows + last 7d of hourly buckets
+  (pre-aggregated by thesislab/social_timeseries.py at ingest)
 """
 
 from __future__ import annotations
@@ -14,9 +16,13 @@ from collections import defaultdict
 from pathlib import Path
 from datetime import datetime, timezone
 
+from thesislab import social_timeseries
+from thesislab.build_cache import BuildCache
+
 ROOT = Path(__file__).resolve().parents[1]
 INPUT_PATH = ROOT / "data" / "timeseries.jsonl"
 OUTPUT_PATH = ROOT / "docs" / "assets" / "data" / "trends.json"
+GENERATOR_VERSION = "1"
 
 
 def _to_pct(v):
@@ -36,47 +42,59 @@ def _avg(values):
     return round(sum(vals) / len(vals), 4)
 
 
-def load_points_raw() -> list[dict]:
+def load_timeseries_rows() -> list[dict]:
     if not INPUT_PATH.exists():
         return []
 
-    points = []
+    rows = []
     with INPUT_PATH.open("r", encoding="utf-8") as f:
         for line in f:
             line = line.strip()
             if not line:
                 continue
             try:
-                row = json.loads(line)
+                rows.append(json.loads(line))
             except json.JSONDecodeError:
                 continue
+    return rows
 
-            ts = row.get("as_of_utc")
-            if not ts:
-                continue
 
-            probs = row.get("scenario_probabilities") or {}
-
-            points.append(
-                {
-                    "ts": ts,
-                    "price_usd": row.get("price_usd"),
-                    "top10_holder_pct": row.get("top10_holder_pct"),
-                    "bull_probability_pct": _to_pct(probs.get("Bull")),
-                    "dex": {
-                        "buys_24h": row.get("buys_24h"),
-                        "sells_24h": row.get("sells_24h"),
-                        "txn_total_24h": row.get("txn_total_24h"),
-                        "buy_sell_ratio_24h": row.get("buy_sell_txn_ratio_24h"),
-                    },
-                    "derivatives": {
-                        "taker_buy_sell_ratio_1d": (row.get("derivatives") or {}).get("taker_buy_sell_ratio_1d"),
-                        "funding_rate": (row.get("derivatives") or {}).get("funding_rate"),
-                        "open_interest": (row.get("derivatives") or {}).get("open_interest"),
-                        "open_interest_24h_change_pct": (row.get("derivatives") or {}).get("open_interest_24h_change_pct"),
-                    }
+def load_points_raw(rows: list[dict] | None = None) -> list[dict]:
+    """Chart points from timeseries rows (read from INPUT_PATH unless given)."""
+    if rows is None:
+        rows = load_timeseries_rows()
+
+    points = []
+    for row in rows:
+        ts = row.get("as_of_utc")
+        if not ts:
+            continue
+
+        probs = row.get("scenario_probabilities") or {}
+
+        points.append(
+            {
+                "ts": ts,
+                "price_usd": row.get("price_usd"),
+                "top10_holder_pct": row.get("top10_holder_pct"),
+                "bull_probability_pct": _to_pct(probs.get("Bull")),
+                "dex": {
+                    "buys_24h": row.get("buys_24h"),
+                    "sells_24h": row.get("sells_24h"),
+                    "txn_total_24h": row.get("txn_total_24h"),
+                    "buy_sell_ratio_24h": row.get("buy_sell_txn_ratio_24h"),
+                },
+                "derivatives": {
+                    "taker_buy_sell_ratio_1d": (row.get("derivatives") or {}).get("taker_buy_sell_ratio_1d"),
+                    "funding_rate": (row.get("derivatives") or {}).get("funding_rate"),
+                    "open_interest": (row.get("derivatives") or {}).get("open_interest"),
+                    "open_interest_24h_change_pct": (row.get("derivatives") or {}).get("open_interest_24h_change_pct"),
+                    "taker_buy_sell_ratio_4h": (row.get("derivatives") or {}).get("taker_buy_sell_ratio_4h"),
+                    "open_interest_z_1d": (row.get("derivatives") or {}).get("open_interest_z_1d"),
+                    "funding_ema": (row.get("derivatives") or {}).get("funding_ema"),
                 }
-            )
+            }
+        )
 
     points.sort(key=lambda x: _parse_iso(x["ts"]))
     return points
@@ -104,14 +122,28 @@ def build_daily(points_raw: list[dict]) -> list[dict]:
     return points_daily
 
 
-def main() -> None:
-    points_raw = load_points_raw()
+def main(rows: list[dict] | None = None) -> None:
+    cache = BuildCache()
+    key = cache.key(
+        GENERATOR_VERSION,
+        [INPUT_PATH, social_timeseries.TIMESERIES_PATH, social_timeseries.ROLLING_PATH, Path(__file__)],
+    )
+    if cache.fresh(OUTPUT_PATH, key):
+        print(f"{OUTPUT_PATH} up to date")
+        cache.report(detail=False)
+        return
+
+    points_raw = load_points_raw(rows)
 
     # Keep latest ~30 days by default if dataset is larger.
     if len(points_raw) > 200:
         points_raw = points_raw[-200:]
 
     points_daily = build_daily(points_raw)
+    social = {
+        "rolling": social_timeseries.load_rolling(),
+        "hourly": social_timeseries.load_hourly(since_hours=social_timeseries.WINDOWS_HOURS["7d"]),
+    }
 
     payload = {
         "generated_at_utc": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
@@ -119,11 +151,13 @@ def main() -> None:
         "count_daily": len(points_daily),
         "points_raw": points_raw,
         "points_daily": points_daily,
+        "social": social,
     }
 
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    OUTPUT_PATH.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    print(f"wrote {OUTPUT_PATH} (raw={len(points_raw)}, daily={len(points_daily)})")
+    cache.write_text(OUTPUT_PATH, json.dumps(payload, ensure_ascii=False, indent=2), key)
+    cache.save()
+    print(f"wrote {OUTPUT_PATH} (raw={len(points_raw)}, daily={len(points_daily)}, social_hourly={len(social['hourly'])})")
+    cache.report(detail=False)
 
 
 if __name__ == "__main__":
@@ -7,6 +7,8 @@ Rule:
 then fail with non-zero exit code.
 
 Important:
+- The report's social status comes from its JSON sidecar
+  (`sections.social.status`); Markdown is only scanned for older reports.
 - Guard checks tweet `time` field freshness (content freshness), not file mtime.
 - This keeps CI logic aligned with generate_report.py social filtering.
 """
@@ -18,17 +20,22 @@ import json
 import sys
 from pathlib import Path
 
+from thesislab import report_sidecar
+
 ROOT = Path(__file__).resolve().parents[1]
 REPORT_DIR = ROOT / "reports" / "cio_briefings"
 SOCIAL_DIR = ROOT / "data" / "social"
 
 
 def latest_report() -> Path | None:
-    files = sorted(REPORT_DIR.glob("*-CIO-Report.md"))
-    return files[-1] if files else None
+    return report_sidecar.latest_report(REPORT_DIR)
 
 
 def report_has_no_fresh_social(report_path: Path) -> bool:
+    sidecar = report_sidecar.load_sidecar(report_path)
+    if sidecar is not None:
+        return report_sidecar.section_status(sidecar, "social") == "no_fresh"
+    # Reports written before the JSON sidecar existed.
     text = report_path.read_text(encoding="utf-8", errors="ignore")
     return "No fresh social signals" in text
 
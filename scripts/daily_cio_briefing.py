@@ -1,190 +1,79 @@
 #!/usr/bin/env python3
+import argparse
 import datetime as dt
-import json
 from pathlib import Path
 
-import requests
-import yfinance as yf
+from thesislab import social_index, social_rank
+from thesislab.market import crypto_lines, macro_lines
+from thesislab.render import Heading, para, to_markdown
+from thesislab.report_model import LocalState, gather_market, latest_timeseries_row
 
 ROOT = Path(__file__).resolve().parents[1]
 TS_PATH = ROOT / "data" / "timeseries.jsonl"
 OUT_DIR = ROOT / "reports" / "cio_briefings"
 PRIVATE_DIR = ROOT / "PRIVATE_WORKAREA" / "cio_briefings"
+SOCIAL_HALF_LIFE_HOURS = 24
+SOCIAL_ANALYSIS_PLACEHOLDER = (
+    "[CIO Deep Analysis: interpret social engagement patterns as leading indicators of holder conviction "
+    "and reflexive upside potential]"
+)
 
 
-def pct(v):
-    if v is None:
-        return "N/A"
-    return f"{v:+.2f}%"
-
-
-def get_quote(symbol: str):
-    t = yf.Ticker(symbol)
-    h = t.history(period="2d", interval="1d")
-    if h.empty:
-        return {"price": None, "change_pct": None}
-    close = float(h["Close"].iloc[-1])
-    prev = float(h["Close"].iloc[-2]) if len(h) > 1 else None
-    chg = ((close - prev) / prev * 100) if prev else None
-    return {"price": close, "change_pct": chg}
-
-
-def get_coingecko_prices():
-    url = "https://api.coingecko.com/api/v3/simple/price"
-    params = {
-        "ids": "bitcoin,ethereum",
-        "vs_currencies": "usd",
-        "include_24hr_change": "true",
-    }
-    r = requests.get(url, params=params, timeout=20)
-    r.raise_for_status()
-    d = r.json()
-    return {
-        "btc": {
-            "price": d.get("bitcoin", {}).get("usd"),
-            "change_pct": d.get("bitcoin", {}).get("usd_24h_change"),
-        },
-        "eth": {
-            "price": d.get("ethereum", {}).get("usd"),
-            "change_pct": d.get("ethereum", {}).get("usd_24h_change"),
-        },
-    }
-
-
-def get_fear_greed():
-    r = requests.get("https://api.alternative.me/fng/", timeout=20)
-    r.raise_for_status()
-    d = r.json().get("data", [{}])[0]
-    return {
-        "value": d.get("value"),
-        "classification": d.get("value_classification"),
-    }
-
-
-def get_local_trump_state():
-    if not TS_PATH.exists():
-        return None
-    lines = [x for x in TS_PATH.read_text(encoding="utf-8").splitlines() if x.strip()]
-    if not lines:
-        return None
-    row = json.loads(lines[-1])
-    sp = row.get("scenario_probabilities", {})
-    return {
-        "price": row.get("price_usd"),
-        "top10_holder_pct": row.get("top10_holder_pct"),
-        "bull": sp.get("Bull"),
-        "risk_flags": row.get("risk_flags", []),
-    }
-
-
-def get_social_intelligence():
-    """Load latest social data from data/social/*.json"""
+def get_social_intelligence(limit: int = 5):
+    """Top tweets of the day from data/social, streamed through a bounded heap."""
     social_dir = ROOT / "data" / "social"
     if not social_dir.exists():
         return None
-    
+
     # Find today's files
     today = dt.datetime.now(dt.timezone.utc).strftime("%Y-%m-%d")
-    files = sorted(social_dir.glob(f"{today}_*.json"))
-    
+    files = social_index.day_files(today, social_dir)
+
     if not files:
         return None
-    
-    all_tweets = []
-    for f in files:
-        try:
-            tweets = json.loads(f.read_text())
-            if isinstance(tweets, list):
-                all_tweets.extend(tweets)
-        except (json.JSONDecodeError, Exception):
-            continue
-    
-    if not all_tweets:
-        return None
-    
-    # Parse likes from string format "16245 Likes. Like" -> 16245
-    def parse_likes(tweet):
-        likes_str = tweet.get("metrics", {}).get("likes", "0")
-        if isinstance(likes_str, int):
-            return likes_str
-        # Extract number from "16245 Likes. Like"
-        try:
-            return int(likes_str.split()[0])
-        except (ValueError, IndexError):
-            return 0
-    
-    # Sort by engagement (likes) and take top 5
-    all_tweets.sort(key=parse_likes, reverse=True)
-    return all_tweets[:5]
-
-
-def main():
-    now = dt.datetime.now(dt.timezone(dt.timedelta(hours=8)))
-    date_s = now.strftime("%Y-%m-%d")
 
-    macro_map = {
-        "S&P 500": "^GSPC",
-        "Nasdaq": "^IXIC",
-        "DXY": "DX-Y.NYB",
-        "US10Y": "^TNX",
-        "Gold": "GC=F",
-        "Crude": "CL=F",
-    }
-    macro = {k: get_quote(v) for k, v in macro_map.items()}
-    cg = get_coingecko_prices()
-    fg = get_fear_greed()
-    trump = get_local_trump_state() or {}
-    social = get_social_intelligence()
+    # likes + 2x retweets, halved every SOCIAL_HALF_LIFE_HOURS so that pinned
+    # months-old profile posts do not crowd out the last 24h.
+    score = social_rank.engagement_scorer(half_life_hours=SOCIAL_HALF_LIFE_HOURS)
+    top = social_rank.top_k(social_index.iter_tweets(files), limit, score)
+    return top or None
+
+
+def briefing_blocks(date_s, market, local, social) -> list:
+    """Layout of the public briefing: hard data plus placeholder-only analysis blocks."""
+    blocks = [Heading(1, f"📅 {date_s} Daily Cross-Market Briefing (CIO Internal)", gap=True)]
+    blocks += [
+        Heading(2, "🌍 1. Macro & TradFi"),
+        para(
+            " | ".join(macro_lines(market.macro)),
+            "[CIO Deep Analysis: assess how today's macro liquidity conditions suppress/support risk assets; extract latest Fed implications]",
+        ),
+        Heading(2, "🏛️ 2. Policy, Regulation & Prediction Markets (Polymarket)"),
+        para("[CIO Deep Analysis: track key Polymarket odds shifts, US political game dynamics, and SEC regulatory direction]"),
+        Heading(2, "🪙 3. Crypto Liquidity & Narratives"),
+        para(
+            " | ".join(crypto_lines(market.btc, market.eth, market.fear_greed)),
+            "[CIO Deep Analysis: analyze ETF flow direction, scan social/community narrative hotspots, and detect whale anomalies]",
+        ),
+    ]
+
+    p, c, b = local.price_usd, local.top10_holder_pct, local.bull
+    flags = local.risk_flags
+    blocks += [
+        Heading(2, "💎 4. $TRUMP Local Radar"),
+        para(
+            f"Price: ${p if p is not None else 'N/A'}"
+            f" | Concentration: {c if c is not None else 'N/A'}%"
+            f" | Bull Probability: {round(b*100,2) if isinstance(b,(int,float)) else 'N/A'}%"
+            f" | System Flags: {', '.join(flags) if flags else 'none'}",
+            "[CIO Deep Analysis: combine external macro and internal metrics to assess current Diamond Hands structural health]",
+        ),
+    ]
 
-    md = []
-    md.append(f"# 📅 {date_s} Daily Cross-Market Briefing (CIO Internal)")
-    md.append("")
-    md.append("## 🌍 1. Macro & TradFi")
-    md.append(
-        "S&P 500: "
-        f"{macro['S&P 500']['price']:.2f} ({pct(macro['S&P 500']['change_pct'])})"
-        " | Nasdaq: "
-        f"{macro['Nasdaq']['price']:.2f} ({pct(macro['Nasdaq']['change_pct'])})"
-        " | DXY: "
-        f"{macro['DXY']['price']:.2f} ({pct(macro['DXY']['change_pct'])})"
-        " | US10Y: "
-        f"{macro['US10Y']['price']:.2f} ({pct(macro['US10Y']['change_pct'])})"
-        " | Gold: "
-        f"{macro['Gold']['price']:.2f} ({pct(macro['Gold']['change_pct'])})"
-        " | Crude Oil: "
-        f"{macro['Crude']['price']:.2f} ({pct(macro['Crude']['change_pct'])})"
-    )
-    md.append("[CIO Deep Analysis: assess how today's macro liquidity conditions suppress/support risk assets; extract latest Fed implications]")
-    md.append("")
-    md.append("## 🏛️ 2. Policy, Regulation & Prediction Markets (Polymarket)")
-    md.append("[CIO Deep Analysis: track key Polymarket odds shifts, US political game dynamics, and SEC regulatory direction]")
-    md.append("")
-    md.append("## 🪙 3. Crypto Liquidity & Narratives")
-    md.append(
-        f"BTC: ${cg['btc']['price']:.2f} ({pct(cg['btc']['change_pct'])})"
-        f" | ETH: ${cg['eth']['price']:.2f} ({pct(cg['eth']['change_pct'])})"
-        f" | Fear & Greed: {fg['value']} ({fg['classification']})"
-    )
-    md.append("[CIO Deep Analysis: analyze ETF flow direction, scan social/community narrative hotspots, and detect whale anomalies]")
-    md.append("")
-    md.append("## 💎 4. $TRUMP Local Radar")
-    p = trump.get("price")
-    c = trump.get("top10_holder_pct")
-    b = trump.get("bull")
-    flags = trump.get("risk_flags", [])
-    md.append(
-        f"Price: ${p if p is not None else 'N/A'}"
-        f" | Concentration: {c if c is not None else 'N/A'}%"
-        f" | Bull Probability: {round(b*100,2) if isinstance(b,(int,float)) else 'N/A'}%"
-        f" | System Flags: {', '.join(flags) if flags else 'none'}"
-    )
-    md.append("[CIO Deep Analysis: combine external macro and internal metrics to assess current Diamond Hands structural health]")
-    md.append("")
     # Social intelligence (auto-collected from CDP scraper)
-    md.append("### 📣 Social Intelligence")
+    blocks.append(Heading(3, "📣 Social Intelligence"))
     if social:
-        md.append(f"**Top {len(social)} tweets by engagement (24h):**")
-        md.append("")
+        blocks.append(para(f"**Top {len(social)} tweets by engagement (24h):**"))
         for i, tweet in enumerate(social, 1):
             text = (tweet.get("text") or "(media only)")[:120]
             likes_str = tweet.get("metrics", {}).get("likes", "?")
@@ -194,22 +83,36 @@ def main():
             except (IndexError, AttributeError):
                 likes = "?"
             url = tweet.get("url", "")
-            md.append(f"{i}. [{likes} ❤️] {text}")
-            if url:
-                md.append(f"   {url}")
-            md.append("")
-        md.append("[CIO Deep Analysis: interpret social engagement patterns as leading indicators of holder conviction and reflexive upside potential]")
+            blocks.append(para(f"{i}. [{likes} ❤️] {text}", *([f"   {url}"] if url else [])))
+        blocks.append(para(SOCIAL_ANALYSIS_PLACEHOLDER))
     else:
-        md.append("[Auto-populated by scrape_social.py — @GetTrumpMemes activity, $TRUMP community buzz, Trump policy positive signals]")
-        md.append("[CIO Deep Analysis: interpret social engagement patterns as leading indicators of holder conviction and reflexive upside potential]")
-    md.append("")
-    md.append("## ⚠️ 5. Actionable Insights")
-    md.append("[CIO Deep Analysis: summarize 1-2 key risk points or high-probability tactical setups]")
+        blocks.append(para(
+            "[Auto-populated by scrape_social.py — @GetTrumpMemes activity, $TRUMP community buzz, Trump policy positive signals]",
+            SOCIAL_ANALYSIS_PLACEHOLDER,
+        ))
+    blocks += [
+        Heading(2, "⚠️ 5. Actionable Insights"),
+        para("[CIO Deep Analysis: summarize 1-2 key risk points or high-probability tactical setups]"),
+    ]
+    return blocks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the daily cross-market CIO briefing")
+    parser.add_argument("--offline", action="store_true", help="Skip network fetches; render from local state")
+    args = parser.parse_args(argv)
+
+    now = dt.datetime.now(dt.timezone(dt.timedelta(hours=8)))
+    date_s = now.strftime("%Y-%m-%d")
+
+    market = gather_market(args.offline)
+    local = LocalState.from_row(latest_timeseries_row(TS_PATH))
+    social = get_social_intelligence()
 
     # Public report: hard data + placeholder-only analysis blocks (safe to publish)
     OUT_DIR.mkdir(parents=True, exist_ok=True)
     out = OUT_DIR / f"{date_s}-CIO-Report.md"
-    out.write_text("\n".join(md) + "\n", encoding="utf-8")
+    out.write_text(to_markdown(briefing_blocks(date_s, market, local, social)), encoding="utf-8")
     print(f"wrote {out}")
 
     # Private report workspace: for sensitive CIO deep analysis (never committed)
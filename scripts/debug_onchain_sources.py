@@ -1,20 +1,33 @@
 #!/usr/bin/env python3
+"""Probe every on-chain source used by build_snapshot.py, all in parallel.
+
+Covers Binance Web3, Bitget Wallet, OKX OnChainOS, Solscan, Moralis, Birdeye,
+each Solana RPC endpoint and Dune, with every auth-header variant for the
+keyed APIs (--used-only: just the endpoints and headers build_snapshot
+calls, as the pipeline does to spare paid quota). Prints a status/latency/size table (keys masked) and writes the
+machine-readable matrix (thesislab/source_matrix.py) to
+data/cache/source_matrix.json, from which build_snapshot takes source order
+and timeouts.
+
+    python scripts/debug_onchain_sources.py [--timeout 10] [--used-only] [--json] [--verbose]
+"""
+
+from __future__ import annotations
+
+import argparse
 import json
 import os
+import subprocess
+import time
 import urllib.error
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-TOKEN_ADDRESS = "6p6xgHyF7AeE6TZkSmFsko444wqoP15icUSqi2jfGiPN"
+import build_snapshot as bs
+from thesislab import source_matrix
 
-MORALIS_ENDPOINTS = [
-    f"https://solana-gateway.moralis.io/token/mainnet/{TOKEN_ADDRESS}/holders",
-    f"https://solana-gateway.moralis.io/token/mainnet/{TOKEN_ADDRESS}/metadata",
-]
-
-SOLSCAN_ENDPOINTS = [
-    f"https://pro-api.solscan.io/v2.0/token/holders?address={TOKEN_ADDRESS}&page=1&page_size=10",
-    f"https://pro-api.solscan.io/v2.0/token/meta?address={TOKEN_ADDRESS}",
-]
+USER_AGENT = "trump-thesis-lab/debug-onchain"
 
 
 def mask(secret: str | None) -> str:
@@ -25,60 +38,166 @@ def mask(secret: str | None) -> str:
     return f"{secret[:4]}***{secret[-4:]}"
 
 
-def probe(name: str, url: str, headers: dict):
-    req = urllib.request.Request(url, headers={"User-Agent": "trump-thesis-lab/debug-onchain"} | headers)
+def _auth_variants(key: str | None, header: str, used_only: bool = False) -> list[tuple[str, dict]]:
+    """Header variants to probe; the first is the one build_snapshot sends."""
+    if not key:
+        return [("no-auth", {})]
+    variants = [(header, {header: key}), ("Authorization", {"Authorization": f"Bearer {key}"})]
+    return variants[:1] if used_only else variants
+
+
+def _bitget_probe() -> dict:
+    base_url = os.getenv("BGW_BASE_URL", "https://bopenapi.bgwapi.io")
+    api_key = os.getenv("BGW_API_KEY", "4843D8C3F1E20772C0E634EDACC5C5F9A0E2DC92")
+    api_secret = os.getenv("BGW_API_SECRET", "F2ABFDC684BDC6775FD6286B8D06A3AAD30FD587")
+    path = "/bgw-pro/market/v3/coin/batchGetBaseInfo"
+    body = {"list": [{"chain": "sol", "contract": bs.SOL_TOKEN_ADDRESS}]}
+    ts = str(int(time.time() * 1000))
+    return {
+        "name": "bitget/baseinfo", "group": "bitget", "url": base_url + path, "auth": "signed",
+        "method": "POST", "data": json.dumps(body, separators=(",", ":"), sort_keys=True).encode("utf-8"),
+        "headers": {
+            "Content-Type": "application/json",
+            "x-api-key": api_key,
+            "x-api-timestamp": ts,
+            "x-api-signature": bs._bitget_sign(path, body, api_key, api_secret, ts),
+        },
+    }
+
+
+def build_probes(used_only: bool = False) -> list[dict]:
+    probes = [
+        {
+            "name": "binance-web3/dynamic", "group": "binance-web3", "auth": "no-auth",
+            "url": bs.BINANCE_WEB3_DYNAMIC_URL + f"?chainId=CT_501&contractAddress={bs.SOL_TOKEN_ADDRESS}",
+            "headers": {"Accept-Encoding": "identity"},
+        },
+        _bitget_probe(),
+        {"name": "okx/onchainos", "group": "okx", "auth": "script", "kind": "okx"},
+    ]
+
+    # (group, key, header, endpoints, endpoints build_snapshot calls)
+    keyed = (
+        ("solscan", os.getenv("SOLSCAN_API_KEY"), "token",
+         {"holders": bs.SOLSCAN_HOLDERS_URL, "meta": bs.SOLSCAN_META_URL}, {"holders", "meta"}),
+        ("moralis", os.getenv("MORALIS_API_KEY"), "X-API-Key",
+         {"holders": bs.MORALIS_HOLDERS_URL, "holder-stats": bs.MORALIS_HOLDER_STATS_URL, "meta": bs.MORALIS_META_URL},
+         {"holder-stats"}),
+        ("birdeye", os.getenv("BIRDEYE_API_KEY"), "X-API-KEY",
+         {"holders": bs.BIRDEYE_HOLDERS_URL, "meta": bs.BIRDEYE_META_URL}, set()),
+    )
+    for group, key, header, endpoints, used in keyed:
+        extra = {"x-chain": "solana"} if group == "birdeye" else {}
+        if used_only:
+            endpoints = {name: url for name, url in endpoints.items() if name in used}
+        for auth, headers in _auth_variants(key, header, used_only):
+            for endpoint, url in endpoints.items():
+                probes.append({
+                    "name": f"{group}/{endpoint}/{auth}", "group": group, "url": url,
+                    "auth": auth, "headers": headers | extra,
+                })
+
+    payload = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "getSlot", "params": []}).encode("utf-8")
+    for url in bs.SOLANA_RPC_URLS:
+        probes.append({
+            "name": url, "group": "solana-rpc", "url": url, "auth": "no-auth", "method": "POST",
+            "data": payload, "headers": {"Content-Type": "application/json"},
+        })
+
+    dune_key = os.getenv("DUNE_API_KEY")
+    query_id = os.getenv("DUNE_TRUMP_WHALE_FLOW_QUERY_ID")
+    if dune_key and query_id:
+        probes.append({
+            "name": "dune/whale-flow", "group": "dune", "auth": "X-Dune-API-Key",
+            "url": f"https://api.dune.com/api/v1/query/{query_id}/results",
+            "headers": {"X-Dune-API-Key": dune_key},
+        })
+    return probes
+
+
+def _okx(timeout: float) -> tuple[int | None, bytes, str | None]:
+    script = Path.home() / "projects-public/trump-thesis-lab/scripts/fetch_okx_data.py"
+    if not script.exists():
+        return None, b"", "script not found"
+    r = subprocess.run(["python3", str(script)], capture_output=True, timeout=timeout)
+    return r.returncode, r.stdout, None if r.returncode == 0 else r.stderr.decode("utf-8", "ignore")[:200]
+
+
+def run_probe(p: dict, timeout: float) -> dict:
+    t0 = time.perf_counter()
+    status = None
+    body = b""
+    error = None
     try:
-        with urllib.request.urlopen(req, timeout=20) as r:
-            body = r.read().decode("utf-8", errors="ignore")
-            print(f"\n[{name}] {url}")
-            print(f"status={r.status}")
-            print("body[0:500]=")
-            print(body[:500])
+        if p.get("kind") == "okx":
+            status, body, error = _okx(timeout)
+        else:
+            req = urllib.request.Request(
+                p["url"], data=p.get("data"), method=p.get("method", "GET"),
+                headers={"User-Agent": USER_AGENT} | p.get("headers", {}),
+            )
+            with urllib.request.urlopen(req, timeout=timeout) as r:
+                status, body = r.status, r.read()
     except urllib.error.HTTPError as e:
-        body = e.read().decode("utf-8", errors="ignore")
-        print(f"\n[{name}] {url}")
-        print(f"status={e.code}")
-        print("body[0:500]=")
-        print(body[:500])
-    except Exception as e:
-        print(f"\n[{name}] {url}")
-        print(f"error={e}")
-
-
-def main():
-    moralis = os.getenv("MORALIS_API_KEY")
-    solscan = os.getenv("SOLSCAN_API_KEY")
+        status, body = e.code, e.read()
+    except Exception as e:  # noqa: BLE001 - a probe reports, never raises
+        error = f"{type(e).__name__}: {e}"
+    latency = round(time.perf_counter() - t0, 3)
+    ok = status in (0, 200) and error is None
+    return {
+        "name": p["name"],
+        "group": p["group"],
+        "url": p.get("url", "").split("?")[0],
+        "auth": p["auth"],
+        "ok": ok,
+        "status": status,
+        "latency_s": latency if status is not None else None,
+        "bytes": len(body),
+        "error": error,
+        "suggested_timeout_s": source_matrix.suggested_timeout(latency, ok, timeout),
+        "head": body[:500].decode("utf-8", errors="ignore"),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Probe all on-chain sources concurrently")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-probe timeout in seconds")
+    parser.add_argument("--out", type=Path, default=source_matrix.MATRIX_PATH, help="Matrix output path")
+    parser.add_argument("--used-only", action="store_true", help="Probe only the endpoints and auth headers build_snapshot calls")
+    parser.add_argument("--json", action="store_true", help="Print the matrix JSON instead of the table")
+    parser.add_argument("--verbose", action="store_true", help="Show the first 500 bytes of each body")
+    args = parser.parse_args(argv)
+
+    probes = build_probes(args.used_only)
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(probes)) as pool:
+        results = list(pool.map(lambda p: run_probe(p, args.timeout), probes))
+    wall = time.perf_counter() - t0
+
+    heads = {r["name"]: r.pop("head") for r in results}
+    matrix = source_matrix.build(results, args.timeout)
+    path = source_matrix.save(matrix, args.out)
+
+    if args.json:
+        print(json.dumps(matrix, indent=2))
+        return 0
 
     print("== Key presence (masked) ==")
-    print("MORALIS_API_KEY:", mask(moralis))
-    print("SOLSCAN_API_KEY:", mask(solscan))
-
-    print("\n== Moralis probes ==")
-    moralis_headers_list = []
-    if moralis:
-        moralis_headers_list.append({"X-API-Key": moralis})
-        moralis_headers_list.append({"Authorization": f"Bearer {moralis}"})
-    else:
-        moralis_headers_list.append({})
-
-    for h in moralis_headers_list:
-        label = "moralis " + ("X-API-Key" if "X-API-Key" in h else "Authorization" if "Authorization" in h else "no-auth")
-        for url in MORALIS_ENDPOINTS:
-            probe(label, url, h)
-
-    print("\n== Solscan probes ==")
-    sol_headers_list = []
-    if solscan:
-        sol_headers_list.append({"token": solscan})
-        sol_headers_list.append({"Authorization": f"Bearer {solscan}"})
-    else:
-        sol_headers_list.append({})
-
-    for h in sol_headers_list:
-        label = "solscan " + ("token" if "token" in h else "Authorization" if "Authorization" in h else "no-auth")
-        for url in SOLSCAN_ENDPOINTS:
-            probe(label, url, h)
+    for env in ("MORALIS_API_KEY", "SOLSCAN_API_KEY", "BIRDEYE_API_KEY", "DUNE_API_KEY", "BGW_API_KEY"):
+        print(f"{env}: {mask(os.getenv(env))}")
+    print(f"\n== {len(results)} probes in {wall:.2f}s (timeout {args.timeout:g}s) ==")
+    for r in sorted(results, key=lambda r: (r["group"], r["name"])):
+        latency = f"{r['latency_s']:.2f}s" if r["latency_s"] is not None else "-"
+        print(
+            f"{'OK ' if r['ok'] else 'ERR'} {r['name']:48} status={str(r['status']):5} "
+            f"{latency:>7} {r['bytes']:>8}B  timeout->{r['suggested_timeout_s'] or '-'}"
+            f"{'  ' + r['error'] if r['error'] else ''}"
+        )
+        if args.verbose and heads[r["name"]]:
+            print(f"    {heads[r['name']]}")
+    print(f"\nwrote {path}")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -5,10 +5,14 @@ import os
 import urllib.request
 from pathlib import Path
 
+from thesislab import report_sidecar, telemetry, triggers
+
 REPO = os.getenv("GITHUB_REPOSITORY", "AlphaC007/trump-thesis-lab")
 TOKEN = os.getenv("GITHUB_TOKEN", "")
 TS = Path("data/timeseries.jsonl")
 OUT = Path("docs/DAILY_HEALTH_REPORT.md")
+REPORT_DIR = Path("reports/cio_briefings")
+LATENCY_RUNS = int(os.getenv("HEALTH_LATENCY_RUNS", "30"))
 
 
 def gh_api(url: str):
@@ -27,6 +31,64 @@ def load_timeseries():
     return latest, prev
 
 
+def cio_report_health() -> list[str]:
+    """Section and upstream status of the latest CIO report, from its JSON sidecar."""
+    rp = report_sidecar.latest_report(REPORT_DIR)
+    sidecar = report_sidecar.load_sidecar(rp) if rp else None
+    if sidecar is None:
+        return ["- Latest CIO report: no structured sidecar available"]
+
+    sections = sidecar.get("sections") or {}
+    unavailable = sorted(k for k, v in sections.items() if (v or {}).get("status") == "unavailable")
+    lines = [
+        f"- Latest CIO report: {sidecar.get('date')}"
+        f"{' (offline render)' if sidecar.get('offline') else ''}"
+        f" · unavailable sections: {', '.join(unavailable) if unavailable else 'none'}"
+    ]
+    sources = sidecar.get("sources") or {}
+    timed = [(k, v) for k, v in sources.items() if (v or {}).get("status") != "skipped"]
+    if timed:
+        parts = [f"{k} {v.get('elapsed_s', 0):.2f}s{'' if v.get('status') == 'ok' else ' (' + str(v.get('status')) + ')'}" for k, v in timed]
+        lines.append(f"- Report upstreams: {' | '.join(parts)}")
+    return lines
+
+
+def upstream_latency(last: int = LATENCY_RUNS) -> list[str]:
+    """p50/p95 per upstream over the last `last` telemetry runs (data/telemetry)."""
+    runs = telemetry.load_runs(last)
+    summary = telemetry.latency_summary(runs)
+    if not summary:
+        return ["- No telemetry runs recorded yet"]
+    lines = [
+        f"- Window: last {len(runs)} runs ({runs[0].get('started_at')} → {runs[-1].get('started_at')})",
+        "",
+        "| Upstream | Calls | Errors | p50 (s) | p95 (s) |",
+        "|---|---:|---:|---:|---:|",
+    ]
+    for name, s in sorted(summary.items(), key=lambda kv: -kv[1]["p95_s"]):
+        lines.append(f"| {name} | {s['n']} | {s['errors']} | {s['p50_s']:.2f} | {s['p95_s']:.2f} |")
+    retries = sum((r.get("counters") or {}).get("retries", 0) for r in runs)
+    cache_hits = sum((r.get("counters") or {}).get("cache_hits", 0) for r in runs)
+    lines.append("")
+    lines.append(f"- Retries: {retries} · cache hits: {cache_hits}")
+    return lines
+
+
+BLIND_SPOTS = {
+    "A": "missing 24H exchange netflow field",
+    "B": "dex_depth_2pct_usd not consistently available",
+    "C": "top10_holder_pct missing in latest snapshot",
+}
+
+
+def trigger_line(name: str, t: dict) -> str:
+    if t["state"] == "blind":
+        return f"Data blind spot ({BLIND_SPOTS[name]})"
+    value = f"{t['value']:.4f}" if isinstance(t["value"], (int, float)) else "N/A"
+    status = "Triggered" if t["state"] == "confirmed" else "Not triggered"
+    return f"{status} ({value} vs threshold {t['threshold']:g}, {t['samples']} samples in {t['window_h']}H)"
+
+
 def main():
     now_cn = dt.datetime.now(dt.timezone(dt.timedelta(hours=8))).strftime("%Y-%m-%d %H:%M")
 
@@ -56,12 +118,9 @@ def main():
         ps = prev["scenario_probabilities"]["Stress"]
         drift = f"Bull {bull-pb:+.4f}, Base {base-pba:+.4f}, Stress {stress-ps:+.4f}"
 
-    # falsification visibility based on available fields
-    trigger_a = "Data blind spot (missing real-time exchange netflow field)"
-    trigger_b = "Data blind spot (dex_depth_2pct_usd not consistently available)"
-    trigger_c = "Not triggered"
-    if prev and abs(latest.get("top10_holder_pct", 0) - prev.get("top10_holder_pct", 0)) > 3:
-        trigger_c = "Triggered"
+    # falsification triggers, replayed over the rolling windows of the timeseries
+    engine = triggers.from_rows(triggers.load_rows(TS))
+    trigger_a, trigger_b, trigger_c = (trigger_line(name, t) for name, t in engine.report().items())
 
     dh_state = "Stable" if stress <= 0.12 else "Under Pressure"
 
@@ -77,22 +136,26 @@ def main():
             text.append(f"- Most recent run #{i}: {r[2]} ({r[1]}) · {r[0]} · {r[3]}")
     else:
         text.append("- Last two runs: unable to read GitHub Actions API")
+    text.extend(cio_report_health())
     text.append("- Upstream APIs: CoinGecko/DexScreener normal; on-chain may trigger fallback.")
     text.append("")
-    text.append("## 2) Data Delta")
+    text.append("## 2) Upstream Latency")
+    text.extend(upstream_latency())
+    text.append("")
+    text.append("## 3) Data Delta")
     text.append(f"- as_of_utc: {latest['as_of_utc']}")
     text.append(f"- price_usd: {latest['price_usd']}")
     text.append(f"- top10_holder_pct: {latest['top10_holder_pct']}")
     text.append(f"- scenario_probabilities: Bull {bull}, Base {base}, Stress {stress}")
     text.append(f"- Probability drift: {drift}")
     text.append("")
-    text.append("## 3) Falsification Radar")
+    text.append("## 4) Falsification Radar")
     text.append(f"- Trigger A: {trigger_a}")
     text.append(f"- Trigger B: {trigger_b}")
     text.append(f"- Trigger C: {trigger_c}")
     text.append(f"- Diamond Hands state: [{dh_state}]")
     text.append("")
-    text.append("## 4) Risk Flags & Honesty Boundary")
+    text.append("## 5) Risk Flags & Honesty Boundary")
     text.append("- If `using_heuristic_proxy` is active, it must be explicitly disclosed in snapshots.")
     text.append("- This report follows: conclusion first, data-backed evidence, and explicit blind-spot disclosure.")
 
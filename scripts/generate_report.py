@@ -1,103 +1,56 @@
 #!/usr/bin/env python3
+"""Generate the daily bull-first CIO report.
+
+Data gathering (`gather`) is separate from rendering: section builders are
+pure functions of a ReportData (thesislab/report_model.py) that emit layout
+blocks (thesislab/render.py), so Markdown, HTML and the JSON sidecar come
+from one dataset and a sidecar can be re-rendered without any fetches.
+
+Usage:
+  python scripts/generate_report.py                 # full report (live upstreams)
+  python scripts/generate_report.py --offline       # local state only, no network
+  python scripts/generate_report.py --social-only   # print the social section
+  python scripts/generate_report.py --formats md,json,html
+  python scripts/generate_report.py --from-sidecar reports/cio_briefings/<date>-CIO-Report.json
+  python scripts/generate_report.py --record fixtures/replay/<name>
+  python scripts/generate_report.py --replay fixtures/replay/<name> --latency-scale 0 --check
+
+fixtures/replay/report-stub is a recording made with stubbed upstreams (every
+venue, macro and derivatives section populated); CI replays it with --check,
+so a rendering change shows up as a Markdown diff. Re-record it when the
+change is intended.
+"""
+import argparse
 import datetime as dt
+import difflib
 import json
 import re
+import time
 from pathlib import Path
 
-import requests
-import yfinance as yf
+from thesislab import replay, report_sidecar, social_dedup, social_index, social_rank, social_timeseries, telemetry
+from thesislab.market import crypto_lines, macro_lines
+from thesislab.render import Heading, Rule, bullets, para, static_section, to_html, to_markdown
+from thesislab.triggers import TRIGGERS
+from thesislab.report_model import DerivativesPanel, LocalState, ReportData, gather_market, latest_timeseries_row, timed
 
 ROOT = Path(__file__).resolve().parents[1]
 OUT_DIR = ROOT / "reports" / "cio_briefings"
 TS_PATH = ROOT / "data" / "timeseries.jsonl"
 
 
-def pct(v):
-    return "N/A" if v is None else f"{v:+.2f}%"
-
-
-def get_quote(symbol: str):
-    """Fetch 2d daily close via yfinance.
-
-    Fail-safe: yfinance sometimes returns nonstandard payloads (e.g. missing 'chart'),
-    which previously crashed the whole report build. We degrade to N/A instead.
-    """
-    try:
-        t = yf.Ticker(symbol)
-        h = t.history(period="2d", interval="1d")
-        if getattr(h, "empty", True):
-            return {"price": None, "change_pct": None}
-        close = float(h["Close"].iloc[-1])
-        prev = float(h["Close"].iloc[-2]) if len(h) > 1 else None
-        chg = ((close - prev) / prev * 100) if prev else None
-        return {"price": close, "change_pct": chg}
-    except Exception:
-        return {"price": None, "change_pct": None}
-
-
-def get_coingecko_prices():
-    url = "https://api.coingecko.com/api/v3/simple/price"
-    params = {
-        "ids": "bitcoin,ethereum",
-        "vs_currencies": "usd",
-        "include_24hr_change": "true",
-    }
-    r = requests.get(url, params=params, timeout=20)
-    r.raise_for_status()
-    d = r.json()
-    return {
-        "btc": {
-            "price": d.get("bitcoin", {}).get("usd"),
-            "change_pct": d.get("bitcoin", {}).get("usd_24h_change"),
-        },
-        "eth": {
-            "price": d.get("ethereum", {}).get("usd"),
-            "change_pct": d.get("ethereum", {}).get("usd_24h_change"),
-        },
-    }
-
-
-def get_fear_greed():
-    r = requests.get("https://api.alternative.me/fng/", timeout=20)
-    r.raise_for_status()
-    d = r.json().get("data", [{}])[0]
-    return {
-        "value": d.get("value"),
-        "classification": d.get("value_classification"),
-    }
-
-
 def get_latest_local_state():
-    if not TS_PATH.exists():
-        return None
-    lines = [x for x in TS_PATH.read_text(encoding="utf-8").splitlines() if x.strip()]
-    if not lines:
-        return None
-    return json.loads(lines[-1])
+    return latest_timeseries_row(TS_PATH)
 
 
 def _extract_likes(tweet):
     """Extract numeric likes from metrics string like '16245 Likes. Like'."""
-    try:
-        raw = tweet.get("metrics", {}).get("likes", "0")
-        parts = str(raw).split()
-        if parts:
-            return int(parts[0].replace(",", ""))
-    except (ValueError, IndexError):
-        pass
-    return 0
+    return social_index.metric_count(tweet, "likes")
 
 
 def _extract_retweets(tweet):
     """Extract numeric retweets from metrics string."""
-    try:
-        raw = tweet.get("metrics", {}).get("retweets", "0")
-        parts = str(raw).split()
-        if parts:
-            return int(parts[0].replace(",", ""))
-    except (ValueError, IndexError):
-        pass
-    return 0
+    return social_index.metric_count(tweet, "retweets")
 
 
 def _is_fresh(tweet, max_hours=48):
@@ -120,7 +73,7 @@ def _filter_fresh(tweets, max_hours=48):
 
 def _engagement_score(tweet):
     """Combined engagement score for ranking."""
-    return _extract_likes(tweet) + _extract_retweets(tweet) * 2
+    return social_index.engagement_score(tweet)
 
 
 _SPAM_PATTERNS = [
@@ -200,6 +153,8 @@ def run_social_scrape():
                             existing.append(t)
                             seen.add(t["url"])
                     outpath.write_text(json.dumps(existing, indent=2, ensure_ascii=False))
+                    social_index.record_file(outpath, existing)
+                    social_timeseries.ingest_file(outpath, existing)
                     print(f"  social: {len(existing)} tweets → {filename}")
         except Exception as e:
             print(f"  social scrape warning ({target}): {e}")
@@ -218,54 +173,34 @@ def _load_interpreted_social_fallback(social_dir: Path, max_days=7):
     converts interpreted dimensions into minimal pseudo-tweets so the report keeps
     social coverage continuity.
     """
-    key_map = {
-        "GetTrumpMemes": "meme_account",
-        "TRUMP": "search_trump",
-        "TRUMPMEME": "search_trump",
-        "TRUMP_memecoin": "search_trump",
-        "Trump_policy": "trump_policy",
-        "Trump_crypto": "trump_crypto",
-        "WhiteHouse": "white_house",
-    }
-
-    now = dt.datetime.now(dt.timezone.utc)
-    buckets = {
-        "meme_account": [],
-        "search_trump": [],
-        "trump_policy": [],
-        "trump_crypto": [],
-        "white_house": [],
-    }
-
-    for d in _date_candidates(days=max_days):
-        fp = social_dir / f"{d}_interpreted.json"
-        if not fp.exists():
-            continue
-        try:
-            payload = json.loads(fp.read_text(encoding="utf-8"))
-            dims = payload.get("dimensions") or {}
-            # Skip empty interpreted artifacts (common in failed CI scrape runs)
-            if not dims:
+    buckets = {k: [] for k in social_index.DIMENSIONS}
+
+    # Day manifests already record which interpreted snapshots are non-empty
+    # (empty ones are common in failed CI scrape runs).
+    found = social_index.latest_interpreted(_date_candidates(days=max_days), social_dir)
+    if not found:
+        return buckets
+    d, fp = found
+    try:
+        payload = json.loads(fp.read_text(encoding="utf-8"))
+        dims = payload.get("dimensions") or {}
+
+        # Synthesize timestamp at day's noon UTC for freshness filtering.
+        ts = f"{d}T12:00:00+00:00"
+        for dim_name, info in dims.items():
+            key = social_index.LABEL_DIMENSIONS.get(dim_name)
+            if key not in buckets:
                 continue
-
-            # Synthesize timestamp at day's noon UTC for freshness filtering.
-            ts = f"{d}T12:00:00+00:00"
-            for dim_name, info in dims.items():
-                key = key_map.get(dim_name)
-                if not key:
-                    continue
-                for sig in (info.get("top_signals") or [])[:3]:
-                    buckets[key].append({
-                        "time": ts,
-                        "text": sig.get("text_preview") or info.get("bull_interpretation") or "",
-                        "handle": f"@{dim_name}",
-                        "url": "",
-                        "metrics": {"likes": str(sig.get("engagement", "0")), "retweets": "0"},
-                    })
-            # First recent non-empty interpreted snapshot is enough as fallback.
-            break
-        except Exception:
-            continue
+            for sig in (info.get("top_signals") or [])[:3]:
+                buckets[key].append({
+                    "time": ts,
+                    "text": sig.get("text_preview") or info.get("bull_interpretation") or "",
+                    "handle": f"@{dim_name}",
+                    "url": "",
+                    "metrics": {"likes": str(sig.get("engagement", "0")), "retweets": "0"},
+                })
+    except Exception:
+        return buckets
 
     # Respect freshness window from report config.
     fresh = {k: _filter_fresh(v, max_hours=max_days * 24) for k, v in buckets.items()}
@@ -280,57 +215,43 @@ def get_social_pulse(max_hours=72):
     1) Search across recent dates (today -> previous days), not only today.
     2) Accept known filename variants for each dimension.
     3) Deduplicate by URL and keep latest posts.
+
+    File selection goes through the per-day social manifests (see
+    social_index.py): only files whose tweet time range reaches into the
+    freshness window are opened, in a single pass across all dimensions.
     """
     social_dir = ROOT / "data" / "social"
 
-    result = {
-        "meme_account": [],
-        "search_trump": [],
-        "trump_policy": [],
-        "trump_crypto": [],
-        "white_house": [],
-    }
+    result = {k: [] for k in social_index.DIMENSIONS}
 
     # Track which files were actually used for transparency/debugging.
     source_files = {k: [] for k in result.keys()}
 
-    patterns = {
-        "meme_account": ["{d}_GetTrumpMemes.json"],
-        "search_trump": ["{d}_TRUMP.json", "{d}_TRUMPMEME.json", "{d}_TRUMP_memecoin.json"],
-        "trump_policy": ["{d}_Trump_policy.json"],
-        "trump_crypto": ["{d}_Trump_crypto.json"],
-        "white_house": ["{d}_WhiteHouse.json"],
-    }
-
-    for key, pats in patterns.items():
-        merged = []
-        seen = set()
-        for d in _date_candidates(days=4):
-            for p in pats:
-                fp = social_dir / p.format(d=d)
-                if not fp.exists():
+    cutoff = dt.datetime.now(dt.timezone.utc) - dt.timedelta(hours=max_hours)
+    seen = {k: set() for k in result.keys()}
+    for key, fp in social_index.files_in_window(_date_candidates(days=4), cutoff, social_dir):
+        try:
+            tweets = json.loads(fp.read_text(encoding="utf-8"))
+            if not isinstance(tweets, list):
+                continue
+            source_files[key].append(fp.name)
+            for t in tweets:
+                url = t.get("url")
+                # Dedup by URL when available
+                if url and url in seen[key]:
                     continue
-                try:
-                    tweets = json.loads(fp.read_text(encoding="utf-8"))
-                    if not isinstance(tweets, list):
-                        continue
-                    source_files[key].append(fp.name)
-                    for t in tweets:
-                        url = t.get("url")
-                        # Dedup by URL when available
-                        if url and url in seen:
-                            continue
-                        if url:
-                            seen.add(url)
-                        merged.append(t)
-                except Exception as e:
-                    print(f"Warning: failed to load {fp.name}: {e}")
-
-        # Keep only fresh + non-spam signals
-        fresh = _filter_fresh(merged, max_hours=max_hours)
-        clean = [t for t in fresh if not _is_low_quality_social(t)]
+                if url:
+                    seen[key].add(url)
+                # Keep only fresh + non-spam signals
+                if _is_fresh(t, max_hours) and not _is_low_quality_social(t):
+                    result[key].append(t)
+        except Exception as e:
+            print(f"Warning: failed to load {fp.name}: {e}")
+
+    # Copy-pasta / quote-tweet clusters count once (see social_dedup.py).
+    result = social_dedup.collapse_dimensions(result)
+    for clean in result.values():
         clean.sort(key=lambda t: t.get("time", ""), reverse=True)
-        result[key] = clean
 
     # Fallback path: CI can have zero raw social files due gitignore policy.
     # Use recent interpreted snapshot to preserve continuity.
@@ -349,6 +270,11 @@ def get_social_pulse(max_hours=72):
     return result, source_files
 
 
+def _cluster_note(tweet) -> str:
+    n = tweet.get("cluster_size") or 1
+    return f" (+{n - 1} near-duplicates)" if n > 1 else ""
+
+
 def format_social_section(social, source_files=None, freshness_hours=72):
     """Format social data: conclusion-first, then supporting evidence by dimension."""
     lines = []
@@ -374,7 +300,7 @@ def format_social_section(social, source_files=None, freshness_hours=72):
 
     confidence_factors = []
     if meme:
-        avg_likes = sum(_extract_likes(t) for t in meme) / len(meme) if meme else 0
+        avg_likes = sum(_extract_likes(t) for t in meme) / len(meme)
         confidence_factors.append(f"official account active ({len(meme)} posts, avg {int(avg_likes)} likes)")
     if search:
         confidence_factors.append(f"community discussion alive ({len(search)} $TRUMP mentions)")
@@ -395,6 +321,17 @@ def format_social_section(social, source_files=None, freshness_hours=72):
     lines.append(f"- **Signal Coverage**: {total_signals} fresh posts across {dimensions_active} independent dimensions ({freshness_hours}h window)")
     for cf in confidence_factors:
         lines.append(f"  - ✅ {cf}")
+    # Pre-aggregated engagement (thesislab/social_timeseries.py), re-windowed as of now. It counts
+    # every ingested post (URL-deduplicated only), so it is labelled apart from the filtered counts above.
+    rolling = social_timeseries.current_windows(dt.datetime.now(dt.timezone.utc))
+    trend_parts = []
+    for label, dims in rolling.items():
+        if dims:
+            posts = sum(d.get("count", 0) for d in dims.values())
+            engagement = sum(d.get("engagement_sum", 0) for d in dims.values())
+            trend_parts.append(f"{label}: {posts} posts / {engagement:,} engagement")
+    if trend_parts:
+        lines.append(f"- **Engagement Trend (rolling, all ingested posts, unfiltered)**: {' | '.join(trend_parts)}")
     lines.append("")
     lines.append("- **Interpretation**: Social engagement across multiple independent channels is consistent with a *base-building* regime, not capitulation. Multi-dimensional conviction signal remains a leading indicator of reflexive upside potential.")
     if source_files:
@@ -405,56 +342,56 @@ def format_social_section(social, source_files=None, freshness_hours=72):
     # ── SUPPORTING EVIDENCE ──
 
     if meme:
-        top_meme = sorted(meme, key=_engagement_score, reverse=True)[:3]
+        top_meme = social_rank.top_k(meme, 3, _engagement_score)
         lines.append("### 📣 Dim 1: @GetTrumpMemes — Official Community Voice")
         for t in top_meme:
             text = (t.get("text") or "(media post)").replace("\n", " ")[:120]
             likes = _extract_likes(t)
             rts = _extract_retweets(t)
             time_str = t.get("time", "")[:16].replace("T", " ")
-            lines.append(f"- \"{text}\" — ❤️ {likes} 🔁 {rts} ({time_str})")
+            lines.append(f"- \"{text}\" — ❤️ {likes} 🔁 {rts} ({time_str}){_cluster_note(t)}")
             if t.get("url"):
                 lines.append(f"  → {t['url']}")
         lines.append("")
 
     if search:
-        top_search = sorted(search, key=_engagement_score, reverse=True)[:3]
+        top_search = social_rank.top_k(search, 3, _engagement_score)
         lines.append(f"### 🔍 Dim 2: $TRUMP Community Pulse ({len(search)} posts)")
         for t in top_search:
             text = (t.get("text") or "").replace("\n", " ")[:100]
             handle = t.get("handle", "")
             likes = _extract_likes(t)
-            lines.append(f"- {handle}: \"{text}\" — ❤️ {likes}")
+            lines.append(f"- {handle}: \"{text}\" — ❤️ {likes}{_cluster_note(t)}")
         lines.append("")
 
     if policy:
-        top_policy = sorted(policy, key=_engagement_score, reverse=True)[:3]
+        top_policy = social_rank.top_k(policy, 3, _engagement_score)
         lines.append(f"### 🏛️ Dim 3: Trump Policy Tailwinds ({len(policy)} signals)")
         for t in top_policy:
             text = (t.get("text") or "").replace("\n", " ")[:120]
             handle = t.get("handle", "")
             likes = _extract_likes(t)
-            lines.append(f"- {handle}: \"{text}\" — ❤️ {likes}")
+            lines.append(f"- {handle}: \"{text}\" — ❤️ {likes}{_cluster_note(t)}")
         lines.append("")
 
     if crypto:
-        top_crypto = sorted(crypto, key=_engagement_score, reverse=True)[:3]
+        top_crypto = social_rank.top_k(crypto, 3, _engagement_score)
         lines.append(f"### 🪙 Dim 4: Crypto Ecosystem Sentiment ({len(crypto)} signals)")
         for t in top_crypto:
             text = (t.get("text") or "").replace("\n", " ")[:120]
             handle = t.get("handle", "")
             likes = _extract_likes(t)
-            lines.append(f"- {handle}: \"{text}\" — ❤️ {likes}")
+            lines.append(f"- {handle}: \"{text}\" — ❤️ {likes}{_cluster_note(t)}")
         lines.append("")
 
     if wh:
-        top_wh = sorted(wh, key=_engagement_score, reverse=True)[:3]
+        top_wh = social_rank.top_k(wh, 3, _engagement_score)
         lines.append(f"### 🇺🇸 Dim 5: White House Official ({len(wh)} posts)")
         for t in top_wh:
             text = (t.get("text") or "").replace("\n", " ")[:120]
             likes = _extract_likes(t)
             rts = _extract_retweets(t)
-            lines.append(f"- \"{text}\" — ❤️ {likes} 🔁 {rts}")
+            lines.append(f"- \"{text}\" — ❤️ {likes} 🔁 {rts}{_cluster_note(t)}")
         lines.append("")
 
     return "\n".join(lines)
@@ -532,273 +469,394 @@ def get_derivatives_panel(symbol: str = "TRUMP"):
     return None
 
 
-def main():
-    now = dt.datetime.now(dt.timezone(dt.timedelta(hours=8)))
-    date_s = now.strftime("%Y-%m-%d")
+VENUE_SOURCES = ("binance", "okx", "bitget", "derivatives")
+FORMATS = ("md", "json", "html")
+
+BULL_INTERPRETATION = (
+    "Current profile is consistent with a washout / bottom-building regime: "
+    "seller pressure is being absorbed while concentrated core supply remains sticky."
+)
+BULL_ENTRY = (
+    "Bias remains long-on-strength if liquidity remains stable and no falsification trigger fires. "
+    "Preferred entries are staged rather than all-in, focused on failed downside continuation."
+)
+HOLD_REINFORCEMENT = (
+    "Hold confidence is supported by concentrated supply stickiness and absence of confirmed systemic trigger. "
+    "Current structure still permits reflexive upside if incremental demand returns."
+)
+INVALIDATION = (
+    "Invalidate bull bias if Trigger A (24H whale-to-exchange net inflow >5% liquidity, any sample in 4H) OR "
+    "Trigger B (Depth-2% >30% 1H collapse unrecovered) OR "
+    "Trigger C (top10_holder_pct absolute decay >3%/24H) is confirmed."
+)
+
+
+# ---------------------------------------------------------------------------
+# Data gathering
+# ---------------------------------------------------------------------------
+
+def gather(offline=False, local=None, now=None) -> ReportData:
+    """Fetch every upstream once and return the report dataset."""
+    now = now or dt.datetime.now(dt.timezone(dt.timedelta(hours=8)))
 
     # Social section removed by design (source instability).
 
-    # Fetch Binance/OKX/Bitget datasets (best-effort, non-blocking)
-    print("Fetching Binance data (primary)...")
-    binance_data = get_binance_data()
-
-    print("Fetching OKX OnChainOS data (backup 1)...")
-    okx_data = get_okx_data()
-
-    print("Fetching Bitget Wallet data (backup 2)...")
-    bitget = get_bitget_data()
-
-    print("Fetching derivatives panel...")
-    derivatives = get_derivatives_panel("TRUMP")
-
-    macro_map = {
-        "S&P 500": "^GSPC",
-        "Nasdaq": "^IXIC",
-        "DXY": "DX-Y.NYB",
-        "US10Y": "^TNX",
-        "Gold": "GC=F",
-        "Crude": "CL=F",
-    }
-    macro = {k: get_quote(v) for k, v in macro_map.items()}
-    cg = get_coingecko_prices()
-    fg = get_fear_greed()
-    local = get_latest_local_state() or {}
-
-    tr_price = local.get("price_usd")
-    tr_conc = local.get("top10_holder_pct")
-    probs = local.get("scenario_probabilities", {})
-    bull = probs.get("Bull")
-    base = probs.get("Base")
-    stress = probs.get("Stress")
-    flags = local.get("risk_flags", [])
-
-    # Bull-first interpretation (fact-preserving)
-    buy_sell = local.get("buy_sell_txn_ratio_24h")
-    adverse = []
-    if isinstance(buy_sell, (int, float)) and buy_sell < 1.0:
-        adverse.append(f"Seller-dominant transaction flow (buy/sell={buy_sell:.4f})")
-    if isinstance(tr_conc, (int, float)) and tr_conc >= 90:
-        adverse.append(f"Very high concentration (top10_holder_pct={tr_conc:.2f}%)")
+    market = gather_market(offline)
+    sources = market.sources
+    if offline:
+        binance_data = okx_data = bitget = derivatives = None
+        sources.update({name: {"status": "skipped", "elapsed_s": 0.0} for name in VENUE_SOURCES})
+    else:
+        # Fetch Binance/OKX/Bitget datasets (best-effort, non-blocking)
+        print("Fetching Binance data (primary)...")
+        binance_data = timed(sources, "binance", get_binance_data)
+
+        print("Fetching OKX OnChainOS data (backup 1)...")
+        okx_data = timed(sources, "okx", get_okx_data)
+
+        print("Fetching Bitget Wallet data (backup 2)...")
+        bitget = timed(sources, "bitget", get_bitget_data)
+
+        print("Fetching derivatives panel...")
+        derivatives = timed(sources, "derivatives", get_derivatives_panel, "TRUMP")
+
+    # The local row is part of a recording too, so a replay renders the same report.
+    local = replay.call("local_state", lambda: local if local is not None else get_latest_local_state())
+
+    bitget_data = (bitget or {}).get("data") or {}
+    return ReportData(
+        date=now.strftime("%Y-%m-%d"),
+        generated_at=now.isoformat(),
+        offline=offline,
+        market=market,
+        local=LocalState.from_row(local),
+        derivatives=DerivativesPanel.from_panel(derivatives),
+        binance=binance_data if binance_data and "error" not in binance_data else None,
+        okx=okx_data if okx_data and "error" not in okx_data else None,
+        bitget={
+            "tx_stats": bitget_data.get("trump_tx_stats"),
+            "security": bitget_data.get("trump_security"),
+        } if bitget_data else None,
+    )
 
-    adverse_signal = "; ".join(adverse) if adverse else "No dominant adverse structural signal in current snapshot"
 
-    bull_interpretation = (
-        "Current profile is consistent with a washout / bottom-building regime: "
-        "seller pressure is being absorbed while concentrated core supply remains sticky."
-    )
+# ---------------------------------------------------------------------------
+# Sections (pure functions of ReportData)
+# ---------------------------------------------------------------------------
 
-    confidence = "medium"
-    if isinstance(bull, (int, float)) and bull >= 0.45:
-        confidence = "medium-high"
+def section_macro(r: ReportData):
+    yield Heading(2, "🌍 1. Macro & TradFi (Fact Layer)")
+    yield bullets(*macro_lines(r.market.macro))
 
-    bull_entry = (
-        "Bias remains long-on-strength if liquidity remains stable and no falsification trigger fires. "
-        "Preferred entries are staged rather than all-in, focused on failed downside continuation."
-    )
-    hold_reinforcement = (
-        "Hold confidence is supported by concentrated supply stickiness and absence of confirmed systemic trigger. "
-        "Current structure still permits reflexive upside if incremental demand returns."
-    )
-    invalidation = (
-        "Invalidate bull bias if Trigger A (4H whale-to-exchange net inflow >5% liquidity) OR "
-        "Trigger B (Depth-2% >30% 1H collapse unrecovered) OR "
-        "Trigger C (top10_holder_pct absolute decay >3%/24H) is confirmed."
-    )
 
-    md = []
-    md.append(f"# 📅 {date_s} Daily Cross-Market Briefing (CIO Internal)")
-    md.append("")
-    md.append("## 🌍 1. Macro & TradFi (Fact Layer)")
-    def fmt_quote(q):
-        p = q.get("price")
-        return "N/A" if p is None else f"{p:.2f}"
-
-    md.append(
-        f"- S&P 500: {fmt_quote(macro['S&P 500'])} ({pct(macro['S&P 500']['change_pct'])})\n"
-        f"- Nasdaq: {fmt_quote(macro['Nasdaq'])} ({pct(macro['Nasdaq']['change_pct'])})\n"
-        f"- DXY: {fmt_quote(macro['DXY'])} ({pct(macro['DXY']['change_pct'])})\n"
-        f"- US10Y: {fmt_quote(macro['US10Y'])} ({pct(macro['US10Y']['change_pct'])})\n"
-        f"- Gold: {fmt_quote(macro['Gold'])} ({pct(macro['Gold']['change_pct'])})\n"
-        f"- Crude Oil: {fmt_quote(macro['Crude'])} ({pct(macro['Crude']['change_pct'])})"
+@static_section
+def section_policy():
+    yield Heading(2, "🏛️ 2. Policy / Regulation / Prediction Markets (Fact Layer)")
+    yield bullets(
+        "Key policy events: monitor macro policy headlines and regulatory flow.",
+        "Prediction-market shifts: monitor probability shocks and narrative regime shifts.",
     )
-    md.append("")
-    md.append("## 🏛️ 2. Policy / Regulation / Prediction Markets (Fact Layer)")
-    md.append("- Key policy events: monitor macro policy headlines and regulatory flow.")
-    md.append("- Prediction-market shifts: monitor probability shocks and narrative regime shifts.")
-    md.append("")
-    md.append("## 🪙 3. Crypto Liquidity & Narratives (Fact Layer)")
-    md.append(f"- BTC: ${cg['btc']['price']:.2f} ({pct(cg['btc']['change_pct'])})")
-    md.append(f"- ETH: ${cg['eth']['price']:.2f} ({pct(cg['eth']['change_pct'])})")
-    md.append(f"- Fear & Greed: {fg['value']} ({fg['classification']})")
-
-    if derivatives and isinstance(derivatives, dict):
-        oi_list = derivatives.get("open_interest") or []
-        funding_list = derivatives.get("funding_rates") or []
-        taker_list = derivatives.get("taker_buy_sell") or []
-
-        if isinstance(oi_list, list) and oi_list:
-            oi_parts = []
-            for x in oi_list[:3]:
-                ex = x.get("exchange", "?")
-                oi_usd = x.get("oi_usd")
-                oi_qty = x.get("oi_quantity")
-                if isinstance(oi_usd, (int, float)):
-                    oi_parts.append(f"{ex}: ${oi_usd:,.0f}")
-                elif isinstance(oi_qty, (int, float)):
-                    oi_parts.append(f"{ex}: {oi_qty:,.0f} qty")
-            if oi_parts:
-                md.append(f"- Open Interest: {' | '.join(oi_parts)}")
-
-        if isinstance(funding_list, list) and funding_list:
-            fr_parts = []
-            for x in funding_list[:3]:
-                ex = x.get("exchange", "?")
-                fr = x.get("funding_rate")
-                if isinstance(fr, (int, float)):
-                    fr_parts.append(f"{ex}: {fr*100:+.4f}%")
-            if fr_parts:
-                md.append(f"- Funding Rate: {' | '.join(fr_parts)}")
-
-        if isinstance(taker_list, list) and taker_list:
-            latest_taker = taker_list[-1]
-            ratio = latest_taker.get("buy_sell_ratio")
-            if isinstance(ratio, (int, float)):
-                md.append(f"- Taker Buy/Sell Ratio (latest 4h): {ratio:.3f}")
+
+
+def section_crypto(r: ReportData):
+    items = crypto_lines(r.market.btc, r.market.eth, r.market.fear_greed)
+
+    d = r.derivatives
+    if d is not None:
+        oi_parts = []
+        for x in d.open_interest:
+            if isinstance(x["oi_usd"], (int, float)):
+                oi_parts.append(f"{x['exchange']}: ${x['oi_usd']:,.0f}")
+            elif isinstance(x["oi_quantity"], (int, float)):
+                oi_parts.append(f"{x['exchange']}: {x['oi_quantity']:,.0f} qty")
+        if oi_parts:
+            items.append(f"Open Interest: {' | '.join(oi_parts)}")
+
+        fr_parts = [
+            f"{x['exchange']}: {x['funding_rate']*100:+.4f}%"
+            for x in d.funding_rates
+            if isinstance(x["funding_rate"], (int, float))
+        ]
+        if fr_parts:
+            items.append(f"Funding Rate: {' | '.join(fr_parts)}")
+
+        if d.taker_buy_sell_ratio_4h is not None:
+            items.append(f"Taker Buy/Sell Ratio (latest 4h): {d.taker_buy_sell_ratio_4h:.3f}")
     else:
-        md.append("- Funding / OI / Liquidation snapshot: temporarily unavailable (derivatives panel fetch failed).")
-
-    md.append("")
-    md.append("## 💎 4. $TRUMP Local Radar (Fact Layer)")
-    md.append(f"- Price: ${tr_price}")
-    md.append(f"- Concentration: {tr_conc}%")
-    md.append(f"- Bull Probability: {round(bull*100,2) if isinstance(bull, (int, float)) else 'N/A'}%")
-    md.append(f"- Base Probability: {round(base*100,2) if isinstance(base, (int, float)) else 'N/A'}%")
-    md.append(f"- Stress Probability: {round(stress*100,2) if isinstance(stress, (int, float)) else 'N/A'}%")
-    md.append(f"- Risk Flags: {', '.join(flags) if flags else 'none'}")
-    md.append("")
-    
+        items.append("Funding / OI / Liquidation snapshot: temporarily unavailable (derivatives panel fetch failed).")
+
+    yield Heading(2, "🪙 3. Crypto Liquidity & Narratives (Fact Layer)")
+    yield bullets(*items)
+
+
+def _pct_text(v):
+    return round(v * 100, 2) if isinstance(v, (int, float)) else "N/A"
+
+
+def section_local_radar(r: ReportData):
+    loc = r.local
+    yield Heading(2, "💎 4. $TRUMP Local Radar (Fact Layer)")
+    yield bullets(
+        f"Price: ${loc.price_usd}",
+        f"Concentration: {loc.top10_holder_pct}%",
+        f"Bull Probability: {_pct_text(loc.bull)}%",
+        f"Base Probability: {_pct_text(loc.base)}%",
+        f"Stress Probability: {_pct_text(loc.stress)}%",
+        f"Risk Flags: {', '.join(loc.risk_flags) if loc.risk_flags else 'none'}",
+    )
+
+
+def section_venues(r: ReportData):
     # Primary on-chain dataset: Binance
-    if binance_data and "error" not in binance_data:
-        md.append("### 📈 On-Chain Data (Primary Feed: Binance)")
-        md.append(f"- Price: ${binance_data.get('price_usd', 0):.4f}")
-        md.append(f"- 24h Volume: ${binance_data.get('volume_24h', 0):,.0f}")
-        md.append(f"- Market Cap: ${binance_data.get('market_cap', 0):,.0f}")
-        md.append(f"- Liquidity: ${binance_data.get('liquidity', 0):,.0f}")
-        md.append(f"- Holders: {binance_data.get('holders', 'N/A')}")
-        md.append(f"- Top10 Holder %: {binance_data.get('top10_holder_pct', 'N/A')}")
-
-        txs = binance_data.get('txs', {})
-        if txs.get('24h') is not None:
-            md.append(f"- 24h Txs: {txs.get('24h', 0):,}")
-
-        chg = binance_data.get('price_change', {})
-        md.append(f"- Price Change: 1h {chg.get('1h', 0):+.2f}% | 24h {chg.get('24h', 0):+.2f}%")
-
-        spot = binance_data.get('spot', {})
+    b = r.binance
+    if b is not None:
+        items = [
+            f"Price: ${b.get('price_usd', 0):.4f}",
+            f"24h Volume: ${b.get('volume_24h', 0):,.0f}",
+            f"Market Cap: ${b.get('market_cap', 0):,.0f}",
+            f"Liquidity: ${b.get('liquidity', 0):,.0f}",
+            f"Holders: {b.get('holders', 'N/A')}",
+            f"Top10 Holder %: {b.get('top10_holder_pct', 'N/A')}",
+        ]
+        txs = b.get("txs", {})
+        if txs.get("24h") is not None:
+            items.append(f"24h Txs: {txs.get('24h', 0):,}")
+        chg = b.get("price_change", {})
+        items.append(f"Price Change: 1h {chg.get('1h', 0):+.2f}% | 24h {chg.get('24h', 0):+.2f}%")
+        spot = b.get("spot", {})
         if spot:
-            md.append(f"- CEX Anchor ({spot.get('symbol', 'TRUMPUSDT')}): ${spot.get('last_price', 0):.4f} ({spot.get('price_change_pct', 0):+.2f}%)")
-            md.append(f"- CEX 24h Quote Volume: ${spot.get('volume_quote', 0):,.0f}")
-        md.append("")
+            items.append(f"CEX Anchor ({spot.get('symbol', 'TRUMPUSDT')}): ${spot.get('last_price', 0):.4f} ({spot.get('price_change_pct', 0):+.2f}%)")
+            items.append(f"CEX 24h Quote Volume: ${spot.get('volume_quote', 0):,.0f}")
+        yield Heading(3, "📈 On-Chain Data (Primary Feed: Binance)")
+        yield bullets(*items)
 
     # Backup 1: OKX cross-validation
-    if okx_data and "error" not in okx_data:
-        md.append("### 📊 Cross-Validation (Backup 1: OKX)")
-        md.append(f"- Price: ${okx_data.get('price_usd', 0):.4f}")
-        md.append(f"- 24h Volume: ${okx_data.get('volume_24h', 0):,.0f}")
-        md.append(f"- Liquidity: ${okx_data.get('liquidity', 0):,.0f}")
-        md.append(f"- Holders: {okx_data.get('holders', 'N/A')}")
-        md.append("")
+    o = r.okx
+    if o is not None:
+        yield Heading(3, "📊 Cross-Validation (Backup 1: OKX)")
+        yield bullets(
+            f"Price: ${o.get('price_usd', 0):.4f}",
+            f"24h Volume: ${o.get('volume_24h', 0):,.0f}",
+            f"Liquidity: ${o.get('liquidity', 0):,.0f}",
+            f"Holders: {o.get('holders', 'N/A')}",
+        )
 
     # Backup 2: Bitget verification feed
-    if bitget and bitget.get("data"):
-        bg_data = bitget["data"]
-        tx_stats = bg_data.get("trump_tx_stats", {})
-        security = bg_data.get("trump_security", {})
-
+    if r.bitget is not None:
+        tx_stats = r.bitget.get("tx_stats") or {}
+        security = r.bitget.get("security") or {}
         if tx_stats:
-            md.append("### 🧪 Cross-Validation (Backup 2: Bitget)")
             h24 = tx_stats.get("24h", {})
             h1 = tx_stats.get("1h", {})
-            md.append(f"- 24h Volume: ${h24.get('volume', 0):,.0f}")
-            md.append(f"- 24h Buyers/Sellers: {h24.get('buyers', 0)}/{h24.get('sellers', 0)} (ratio: {h24.get('buyers', 0)/(h24.get('sellers', 1) or 1):.2f})")
-            md.append(f"- 1h Volume: ${h1.get('volume', 0):,.0f}")
-            md.append(f"- 1h Buyers/Sellers: {h1.get('buyers', 0)}/{h1.get('sellers', 0)}")
-            md.append("")
-
+            yield Heading(3, "🧪 Cross-Validation (Backup 2: Bitget)")
+            yield bullets(
+                f"24h Volume: ${h24.get('volume', 0):,.0f}",
+                f"24h Buyers/Sellers: {h24.get('buyers', 0)}/{h24.get('sellers', 0)} (ratio: {h24.get('buyers', 0)/(h24.get('sellers', 1) or 1):.2f})",
+                f"1h Volume: ${h1.get('volume', 0):,.0f}",
+                f"1h Buyers/Sellers: {h1.get('buyers', 0)}/{h1.get('sellers', 0)}",
+            )
         if security:
-            safe = security.get("safe", False)
-            risk_count = security.get("risk_count", 0)
-            md.append("### 🛡️ Security Audit (Backup 2: Bitget)")
-            md.append(f"- Status: {'✅ SAFE' if safe else '⚠️ RISK DETECTED'}")
-            md.append(f"- Risk Count: {risk_count}")
-            md.append(f"- Buy/Sell Tax: {security.get('buy_tax', 0)}% / {security.get('sell_tax', 0)}%")
-            md.append(f"- Freeze Auth: {'Yes' if security.get('freeze_auth') else 'No'}")
-            md.append(f"- Mint Auth: {'Yes' if security.get('mint_auth') else 'No'}")
-            md.append("")
-
-    md.append("---")
-    md.append("")
-    md.append("## 🧠 Interpretation Layer (Bull-First)")
-    md.append("")
-    md.append("### A) Bull-First Structural Read")
-    md.append(f"- Primary bull interpretation: {bull_interpretation}")
-    md.append(f"- Confidence: {confidence}")
-    md.append("- Supporting evidence IDs: snapshot/latest, timeseries/latest, scenario_rules_v1.2")
-    md.append("")
-    md.append("### B) Adverse Data Reframing (without hiding facts)")
-    md.append(f"- Adverse signal observed: {adverse_signal}")
-    md.append("- Bull-context explanation: this is interpreted as healthy washout / seller fatigue / base construction rather than confirmed trend failure.")
-    md.append("- Dependency / caveat: concentration currently includes fallback/proxy path; conviction must remain trigger-disciplined.")
-    md.append("")
-    md.append("---")
-    md.append("")
-    md.append("## ✅ Conclusion Layer (Mandatory)")
-    md.append("")
-    md.append("### 1) Bull Entry Thesis")
-    md.append(bull_entry)
-    md.append("")
-    md.append("### 2) Hold-Confidence Reinforcement")
-    md.append(hold_reinforcement)
-    md.append("")
-    md.append("### 3) Invalidation Line")
-    md.append(invalidation)
-    md.append("")
-    md.append("---")
-    md.append("")
-    md.append("## Transparency & Falsification")
-    md.append("- Trigger A (whale-to-exchange inflow spike): not confirmed")
-    md.append("- Trigger B (orderbook depth shock): not confirmed")
-    md.append("- Trigger C (holder concentration decay): not confirmed")
+            yield Heading(3, "🛡️ Security Audit (Backup 2: Bitget)")
+            yield bullets(
+                f"Status: {'✅ SAFE' if security.get('safe', False) else '⚠️ RISK DETECTED'}",
+                f"Risk Count: {security.get('risk_count', 0)}",
+                f"Buy/Sell Tax: {security.get('buy_tax', 0)}% / {security.get('sell_tax', 0)}%",
+                f"Freeze Auth: {'Yes' if security.get('freeze_auth') else 'No'}",
+                f"Mint Auth: {'Yes' if security.get('mint_auth') else 'No'}",
+            )
 
+
+def section_interpretation(r: ReportData):
+    adverse = r.adverse_signals
+    adverse_signal = "; ".join(adverse) if adverse else "No dominant adverse structural signal in current snapshot"
+    yield Heading(2, "🧠 Interpretation Layer (Bull-First)", gap=True)
+    yield Heading(3, "A) Bull-First Structural Read")
+    yield bullets(
+        f"Primary bull interpretation: {BULL_INTERPRETATION}",
+        f"Confidence: {r.confidence}",
+        "Supporting evidence IDs: snapshot/latest, timeseries/latest, scenario_rules_v1.2",
+    )
+    yield Heading(3, "B) Adverse Data Reframing (without hiding facts)")
+    yield bullets(
+        f"Adverse signal observed: {adverse_signal}",
+        "Bull-context explanation: this is interpreted as healthy washout / seller fatigue / base construction rather than confirmed trend failure.",
+        "Dependency / caveat: concentration currently includes fallback/proxy path; conviction must remain trigger-disciplined.",
+    )
+
+
+@static_section
+def section_conclusion():
+    yield Heading(2, "✅ Conclusion Layer (Mandatory)", gap=True)
+    yield Heading(3, "1) Bull Entry Thesis")
+    yield para(BULL_ENTRY)
+    yield Heading(3, "2) Hold-Confidence Reinforcement")
+    yield para(HOLD_REINFORCEMENT)
+    yield Heading(3, "3) Invalidation Line")
+    yield para(INVALIDATION)
+
+
+TRIGGER_STATE_TEXT = {
+    "confirmed": "CONFIRMED",
+    "not_confirmed": "not confirmed",
+    "blind": "not evaluable (data blind spot)",
+}
+
+
+def section_transparency(r: ReportData):
+    items = [
+        f"Trigger {name} ({TRIGGERS[name]['label']}): {TRIGGER_STATE_TEXT.get(state, state)}"
+        for name, state in r.trigger_states.items()
+    ]
     # Dynamic confidence notes based on concentration source quality
-    using_proxy = any(flag in flags for flag in ['using_heuristic_proxy', 'using_moralis_enhanced_proxy'])
-    if using_proxy:
-        md.append("- Concentration quality: model-estimated fallback path in use (direct holder feed temporarily unavailable)")
-        md.append("- Confidence mode: conservative (positioning should be trigger-disciplined until direct feed recovers)")
+    if r.using_proxy:
+        items.append("Concentration quality: model-estimated fallback path in use (direct holder feed temporarily unavailable)")
+        items.append("Confidence mode: conservative (positioning should be trigger-disciplined until direct feed recovers)")
     else:
-        md.append("- Concentration quality: direct on-chain holder feed available")
-        md.append("- Confidence mode: standard")
-    
-    md.append("")
-    md.append("## Human Value Note")
-    md.append("- Beyond positions and probabilities, this system is built to preserve what matters most: dignity, care, and gratitude for those who gave us life.")
-    md.append("- Daily gratitude to mothers: before every empire of thought, there is a mother’s hand; before every law of reason, there is mercy. From that sacrifice, life receives its covenant — and in this work, with gratitude to zlf, we renew the duty to be worthy of it.")
-    md.append("")
-    md.append("---")
-    md.append("")
-    md.append("## Collaboration & Inquiries")
-    md.append("")
-    md.append("Interested in our intelligence capabilities, research methodology, or agent integration?")
-    md.append("")
-    md.append("- X/Twitter: [@AlphaC007](https://x.com/AlphaC007) (DM open)")
-    md.append("- GitHub: [@AlphaC007](https://github.com/AlphaC007)")
-    md.append("- Agent developers: see [For Agents](https://alphac007.github.io/trump3fight/for-agents/) for structured entry points.")
-
-    OUT_DIR.mkdir(parents=True, exist_ok=True)
-    out = OUT_DIR / f"{date_s}-CIO-Report.md"
-    out.write_text("\n".join(md) + "\n", encoding="utf-8")
-    print(f"wrote {out}")
+        items.append("Concentration quality: direct on-chain holder feed available")
+        items.append("Confidence mode: standard")
+    yield Heading(2, "Transparency & Falsification")
+    yield bullets(*items)
+
+
+@static_section
+def section_footer():
+    yield Heading(2, "Human Value Note")
+    yield bullets(
+        "Beyond positions and probabilities, this system is built to preserve what matters most: dignity, care, and gratitude for those who gave us life.",
+        "Daily gratitude to mothers: before every empire of thought, there is a mother’s hand; before every law of reason, there is mercy. From that sacrifice, life receives its covenant — and in this work, with gratitude to zlf, we renew the duty to be worthy of it.",
+    )
+    yield Rule()
+    yield Heading(2, "Collaboration & Inquiries", gap=True)
+    yield para("Interested in our intelligence capabilities, research methodology, or agent integration?")
+    yield bullets(
+        "X/Twitter: [@AlphaC007](https://x.com/AlphaC007) (DM open)",
+        "GitHub: [@AlphaC007](https://github.com/AlphaC007)",
+        "Agent developers: see [For Agents](https://alphac007.github.io/trump3fight/for-agents/) for structured entry points.",
+    )
+
+
+def report_blocks(r: ReportData) -> list:
+    blocks = [Heading(1, f"📅 {r.date} Daily Cross-Market Briefing (CIO Internal)", gap=True)]
+    blocks += section_macro(r)
+    blocks += section_policy()
+    blocks += section_crypto(r)
+    blocks += section_local_radar(r)
+    blocks += section_venues(r)
+    blocks.append(Rule())
+    blocks += section_interpretation(r)
+    blocks.append(Rule())
+    blocks += section_conclusion()
+    blocks.append(Rule())
+    blocks += section_transparency(r)
+    blocks += section_footer()
+    return blocks
+
+
+def render(r: ReportData, formats=("md", "json")) -> dict:
+    """Render `r` into each requested format; returns {format: text}."""
+    blocks = report_blocks(r) if {"md", "html"} & set(formats) else None
+    out = {}
+    if "md" in formats:
+        out["md"] = to_markdown(blocks)
+    if "html" in formats:
+        out["html"] = to_html(blocks, title=f"{r.date} CIO Report")
+    if "json" in formats:
+        out["json"] = r.to_sidecar()
+    return out
+
+
+def write_report(r: ReportData, formats=("md", "json"), out_dir: Path = None) -> list[Path]:
+    out_dir = out_dir or OUT_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    md_path = out_dir / f"{r.date}-CIO-Report.md"
+    written = []
+    for fmt, body in render(r, formats).items():
+        if fmt == "json":
+            path = report_sidecar.write_sidecar(md_path, body)
+        else:
+            path = md_path.with_suffix(f".{fmt}")
+            path.write_text(body, encoding="utf-8")
+        print(f"wrote {path}")
+        written.append(path)
+    return written
+
+
+def main(argv=None, local=None):
+    """Write today's report; `local` is the latest timeseries row when the caller already has it."""
+    parser = argparse.ArgumentParser(description="Generate the daily bull-first CIO report")
+    parser.add_argument("--offline", action="store_true", help="Skip all network/venue fetches; render from local state")
+    parser.add_argument("--social-only", action="store_true", help="Print the social section and exit")
+    parser.add_argument("--formats", default="md,json", help=f"Comma-separated outputs from {','.join(FORMATS)}")
+    parser.add_argument("--from-sidecar", type=Path, help="Re-render from an existing report JSON sidecar (no fetches)")
+    parser.add_argument("--out-dir", type=Path, help="Write outputs here instead of reports/cio_briefings")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", type=Path, metavar="DIR", help="Record every upstream response into a fixture bundle")
+    mode.add_argument("--replay", type=Path, metavar="DIR", help="Serve upstreams from a fixture bundle (no network)")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Replay: multiply recorded latencies (0 = none)")
+    parser.add_argument("--check", action="store_true", help="Replay: exit 1 if the Markdown differs from the recording")
+    args = parser.parse_args(argv)
+
+    if args.social_only:
+        social, source_files = get_social_pulse()
+        print(format_social_section(social, source_files))
+        return 0
+
+    formats = tuple(f.strip() for f in args.formats.split(",") if f.strip())
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"unknown formats: {', '.join(sorted(unknown))}")
+
+    telemetry.start("generate_report")
+    try:
+        return _run(args, formats, local)
+    finally:
+        telemetry.finish()
+
+
+def _load_report(args, session, local) -> ReportData:
+    if args.from_sidecar:
+        data = json.loads(args.from_sidecar.read_text(encoding="utf-8"))
+        return ReportData.from_sidecar(data)
+    if args.replay:
+        return gather(
+            offline=session.meta.get("offline", False),
+            now=dt.datetime.fromisoformat(session.meta["now"]),
+        )
+    return gather(offline=args.offline, local=local)
+
+
+def _run(args, formats, local) -> int:
+    session = None
+    if args.record or args.replay:
+        session = replay.start("record" if args.record else "replay", args.record or args.replay, args.latency_scale)
+
+    t0 = time.perf_counter()
+    with telemetry.span("stage.gather"):
+        report = _load_report(args, session, local)
+    gathered_s = time.perf_counter() - t0
+
+    out_dir = args.out_dir or (args.replay / "out" if args.replay else None)
+    with telemetry.span("stage.render"):
+        write_report(report, formats, out_dir=out_dir)
+    markdown = render(report, ("md",))["md"] if session else None
+
+    if args.record:
+        session.meta = {"now": report.generated_at, "offline": args.offline, "expected_md": markdown}
+        print(f"recorded {session.save()} ({sum(len(v) for v in session.calls.values())} calls)")
+    elif args.replay:
+        print(f"replayed {session.bundle_path}: gather {gathered_s:.3f}s at latency x{args.latency_scale:g}")
+        if args.check:
+            expected = session.meta.get("expected_md") or ""
+            if markdown != expected:
+                diff = difflib.unified_diff(
+                    expected.splitlines(keepends=True), markdown.splitlines(keepends=True),
+                    fromfile="recorded", tofile="replayed",
+                )
+                print("".join(diff), end="")
+                return 1
+            print("replay check: Markdown identical to recording")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
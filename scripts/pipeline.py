@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Run the build as one process: a DAG of the existing script entry points.
+
+    validate_rules
+    sync_docs
+    probe_sources ── build_snapshot ─┬─ build_trend_data
+                                     └─ generate_report ─┬─ check_social_guard
+                                                         └─ build_cio_hub ── check_cio_hub_freshness
+
+Independent steps run concurrently, except that steps sharing the build
+cache or the social aggregates hold a common lock (Step.locks). Rules and
+timeseries rows are loaded once and handed to the steps that need them; the
+row appended by build_snapshot is added in memory rather than re-read. Steps
+that only transform local files are skipped when their inputs are unchanged
+(see thesislab/dag.py). probe_sources refreshes the on-chain source matrix
+(data/cache, not committed) that build_snapshot orders fallbacks and sizes
+timeouts by, once it is older than source_matrix.MAX_AGE_S and only for the
+endpoints and auth headers build_snapshot calls; it never fails the run,
+build_snapshot falls back to the built-in order without it.
+
+Usage:
+  python scripts/pipeline.py                                   # everything
+  python scripts/pipeline.py --only sync_docs,build_snapshot,build_trend_data
+  python scripts/pipeline.py --offline                         # no network steps
+  python scripts/pipeline.py --force --jobs 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+from thesislab import dag, source_matrix, telemetry
+from thesislab.dag import Context, Step
+
+RULES_PATH = dag.ROOT / "config" / "scenario_rules.json"
+NETWORK_STEPS = {"probe_sources", "build_snapshot"}
+PROBE_TIMEOUT_S = "8"
+
+
+def _rules(ctx: Context) -> dict:
+    return ctx.get("rules", lambda: json.loads(RULES_PATH.read_text(encoding="utf-8")))
+
+
+def _timeseries(ctx: Context) -> list[dict]:
+    import build_trend_data
+
+    return ctx.get("timeseries", build_trend_data.load_timeseries_rows)
+
+
+def step_validate_rules(ctx: Context):
+    import validate_rules
+
+    validate_rules.main(rules=_rules(ctx))
+
+
+def step_sync_docs(ctx: Context):
+    import sync_docs
+
+    sync_docs.main(rules=_rules(ctx))
+
+
+def step_probe_sources(ctx: Context):
+    import debug_onchain_sources
+
+    if source_matrix.load() is not None:
+        print(f"[pipeline] probe_sources: matrix younger than {source_matrix.MAX_AGE_S // 3600}h, not re-probing")
+        return
+    try:
+        debug_onchain_sources.main(["--timeout", PROBE_TIMEOUT_S, "--used-only"])
+    except Exception as e:  # noqa: BLE001 - a missing matrix only means the default source order
+        print(f"[pipeline] probe_sources: {type(e).__name__}: {e}")
+
+
+def step_build_snapshot(ctx: Context):
+    import build_snapshot
+
+    out = build_snapshot.main(rules=_rules(ctx))
+    if ctx.has("timeseries"):
+        ctx.get("timeseries").append(out["timeseries_row"])
+    return out
+
+
+def step_build_trend_data(ctx: Context):
+    import build_trend_data
+
+    build_trend_data.main(rows=_timeseries(ctx))
+
+
+def step_generate_report(ctx: Context):
+    import generate_report
+
+    rows = _timeseries(ctx)
+    argv = ["--offline"] if ctx.options.get("offline") else []
+    generate_report.main(argv, local=rows[-1] if rows else None)
+
+
+def step_check_social_guard(ctx: Context):
+    import check_social_guard
+
+    return check_social_guard.main()
+
+
+def step_build_cio_hub(ctx: Context):
+    import build_cio_hub
+
+    build_cio_hub.main()
+
+
+def step_check_cio_hub_freshness(ctx: Context):
+    import check_cio_hub_freshness
+
+    return check_cio_hub_freshness.main()
+
+
+RULE_INPUTS = ("config/scenario_rules.json",)
+# Shared state no dependency edge orders: data/cache/build_cache.json, and the social
+# aggregates generate_report ingests into while build_trend_data reads them.
+BUILD_CACHE = "build_cache"
+SOCIAL_AGGREGATES = "social_aggregates"
+REPORT_INPUTS = ("reports/cio_briefings/*-CIO-Report.md",)
+
+STEPS = [
+    Step(
+        "validate_rules", step_validate_rules,
+        inputs=RULE_INPUTS + ("config/scenario_schema.json",), cacheable=True,
+    ),
+    Step(
+        "sync_docs", step_sync_docs,
+        inputs=RULE_INPUTS + ("rag/corpus_manifest.json",),
+        outputs=("docs/scenario_matrix.md",), locks=(BUILD_CACHE,), cacheable=True,
+    ),
+    Step("probe_sources", step_probe_sources, outputs=("data/cache/source_matrix.json",)),
+    Step(
+        "build_snapshot", step_build_snapshot, deps=("probe_sources",),
+        inputs=RULE_INPUTS,
+        outputs=("data/snapshots/*.snapshot.json", "data/timeseries.jsonl"),
+    ),
+    Step(
+        "build_trend_data", step_build_trend_data, deps=("build_snapshot",),
+        inputs=("data/timeseries.jsonl", "data/cache/social_rolling.json", "data/cache/social_timeseries.jsonl"),
+        outputs=("docs/assets/data/trends.json",), locks=(BUILD_CACHE, SOCIAL_AGGREGATES), cacheable=True,
+    ),
+    Step(
+        "generate_report", step_generate_report, deps=("build_snapshot",),
+        inputs=("data/timeseries.jsonl",), outputs=REPORT_INPUTS, locks=(SOCIAL_AGGREGATES,),
+    ),
+    Step("check_social_guard", step_check_social_guard, deps=("generate_report",), inputs=REPORT_INPUTS),
+    Step(
+        "build_cio_hub", step_build_cio_hub, deps=("generate_report",),
+        inputs=REPORT_INPUTS, outputs=("docs/cio-reports/latest.md",), locks=(BUILD_CACHE,), cacheable=True,
+    ),
+    Step(
+        "check_cio_hub_freshness", step_check_cio_hub_freshness, deps=("build_cio_hub",),
+        inputs=REPORT_INPUTS + ("docs/cio-reports/latest.md",), cacheable=True,
+    ),
+]
+
+
+def select(steps: list[Step], names: set[str]) -> list[Step]:
+    """Keep only `names`; dependencies on steps left out count as satisfied."""
+    kept = [s for s in steps if s.name in names]
+    for s in kept:
+        s.deps = tuple(d for d in s.deps if d in names)
+    return kept
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the build pipeline as a single-process DAG")
+    parser.add_argument("--only", help="Comma-separated step names to run (default: all)")
+    parser.add_argument("--offline", action="store_true", help="Drop network steps; render the report offline")
+    parser.add_argument("--force", action="store_true", help="Run cacheable steps even if inputs are unchanged")
+    parser.add_argument("--jobs", type=int, default=4, help="Maximum concurrent steps")
+    parser.add_argument("--list", action="store_true", help="Print the steps and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for s in STEPS:
+            deps = ", ".join(s.deps) or "-"
+            print(f"{s.name:24} deps: {deps:28} cacheable: {'yes' if s.cacheable else 'no'}")
+        return 0
+
+    names = {s.name for s in STEPS}
+    if args.only:
+        wanted = {n.strip() for n in args.only.split(",") if n.strip()}
+        unknown = wanted - names
+        if unknown:
+            parser.error(f"unknown steps: {', '.join(sorted(unknown))}")
+        names = wanted
+    if args.offline:
+        names -= NETWORK_STEPS
+
+    # build_snapshot, sync_docs and validate_rules resolve paths from the repo root.
+    os.chdir(dag.ROOT)
+    telemetry.start("pipeline")
+    try:
+        results = dag.run(select(STEPS, names), Context(offline=args.offline), jobs=args.jobs, force=args.force)
+    finally:
+        telemetry.finish()
+
+    print("\n[pipeline] summary")
+    for r in results:
+        print(f"  {r.status:8} {r.name:24} {r.elapsed_s:6.2f}s{'  ' + r.error if r.error else ''}")
+    return 1 if any(r.status in ("failed", "blocked") for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
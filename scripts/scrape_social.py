@@ -20,6 +20,8 @@ import subprocess
 import sys
 from pathlib import Path
 
+from thesislab import social_index, social_timeseries
+
 ROOT = Path(__file__).resolve().parent.parent
 SCRAPER_CANDIDATES = [
     Path.home() / ".openclaw" / "workspace" / "tools" / "x-poster" / "scrape-tweets.js",
@@ -95,6 +97,8 @@ def save_results(tweets: list, source_label: str):
             seen_urls.add(t["url"])
 
     filepath.write_text(json.dumps(existing, indent=2, ensure_ascii=False))
+    social_index.record_file(filepath, existing)
+    social_timeseries.ingest_file(filepath, existing)
     print(f"[OK] Saved {len(existing)} tweets to {filepath.relative_to(ROOT)}")
     return filepath
 
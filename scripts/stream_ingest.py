@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Long-running Binance WebSocket ingestion for the derivatives block.
+
+Subscribes to the futures (mark price, aggTrade, forceOrder) and spot
+(aggTrade) combined streams, aggregates them into minute bars
+(thesislab/stream.py) and every FLUSH_S seconds appends closed bars to
+data/stream/bars/ and rewrites data/stream/latest.json. While that file is
+fresh, build_snapshot takes the derivatives block from it instead of polling
+the REST endpoints. Each venue reconnects on its own with exponential
+backoff; the process is meant to run on a host (systemd, tmux), not in the
+cron workflow.
+
+    python scripts/stream_ingest.py [--symbol TRUMPUSDT] [--duration 0] [--record capture.jsonl]
+    python scripts/stream_ingest.py --replay capture.jsonl [--speed 0] [--out-dir /tmp/stream]
+
+--record appends every raw message as {"venue", "recv_ms", "msg"}; --replay
+serves such a capture from a local WebSocket server (thesislab/stream_replay.py)
+and ingests it through the same client path, then exits.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from pathlib import Path
+
+from thesislab import stream, stream_replay, ws
+
+FLUSH_S = 5.0
+RECV_TIMEOUT_S = 60.0
+MAX_BACKOFF_S = 60.0
+
+
+def run_venue(venue: str, url: str, agg: stream.Aggregator, lock: threading.Lock, stop: threading.Event,
+              record=None, once: bool = False) -> None:
+    backoff = 1.0
+    while not stop.is_set():
+        conn = None
+        try:
+            conn = ws.connect(url, timeout=RECV_TIMEOUT_S)
+            print(f"[stream] {venue}: connected")
+            while not stop.is_set():
+                raw = conn.recv()
+                backoff = 1.0  # only a connection that delivers data resets the backoff
+                with lock:
+                    try:
+                        agg.on_message(venue, raw)
+                    except (json.JSONDecodeError, AttributeError, TypeError, ValueError) as e:
+                        print(f"[stream] {venue}: skipped message ({type(e).__name__}: {e})")
+                    if record is not None:
+                        record.write(json.dumps({"venue": venue, "recv_ms": int(time.time() * 1000), "msg": raw}) + "\n")
+        except ws.WebSocketClosed as e:
+            # A server that accepts and then closes at once (rate limit, maintenance) gets the same backoff.
+            print(f"[stream] {venue}: {e}; reconnecting in {backoff:g}s")
+            if once:
+                return
+        except (OSError, ConnectionError, ValueError) as e:
+            print(f"[stream] {venue}: {type(e).__name__}: {e}; reconnecting in {backoff:g}s")
+            if once:
+                return
+        finally:
+            if conn is not None:
+                conn.close()
+        stop.wait(backoff)
+        backoff = min(MAX_BACKOFF_S, backoff * 2)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Ingest Binance futures/spot WebSocket streams into minute bars")
+    parser.add_argument("--symbol", default="TRUMPUSDT")
+    parser.add_argument("--duration", type=float, default=0.0, help="Seconds to run (0 = until interrupted)")
+    parser.add_argument("--futures-url", help="Override the futures stream URL")
+    parser.add_argument("--spot-url", help="Override the spot stream URL")
+    parser.add_argument("--record", type=Path, help="Append raw messages to this capture file")
+    parser.add_argument("--replay", type=Path, help="Ingest a capture through a local replay server, then exit")
+    parser.add_argument("--speed", type=float, default=0.0, help="Replay pacing multiplier (0 = no pacing)")
+    parser.add_argument("--out-dir", type=Path, default=stream.STREAM_DIR, help="Bars and latest.json directory")
+    args = parser.parse_args(argv)
+
+    urls = stream.stream_urls(args.symbol)
+    server = None
+    if args.replay:
+        server = stream_replay.serve(args.replay, speed=args.speed)
+        urls = server.urls
+    urls["futures"] = args.futures_url or urls["futures"]
+    urls["spot"] = args.spot_url or urls["spot"]
+
+    agg = stream.Aggregator(args.symbol)
+    lock, stop = threading.Lock(), threading.Event()
+    record = args.record.open("a", encoding="utf-8") if args.record else None
+    threads = [
+        threading.Thread(target=run_venue, args=(venue, url, agg, lock, stop, record, server is not None), daemon=True)
+        for venue, url in urls.items()
+    ]
+    for t in threads:
+        t.start()
+
+    deadline = time.monotonic() + args.duration if args.duration else None
+    try:
+        while any(t.is_alive() for t in threads) and (deadline is None or time.monotonic() < deadline):
+            time.sleep(min(FLUSH_S, max(0.05, deadline - time.monotonic())) if deadline else FLUSH_S)
+            with lock:
+                agg.flush(args.out_dir)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        for t in threads:
+            t.join(timeout=2)
+        with lock:
+            if server is not None or deadline is not None:
+                agg.close_open()
+            written = agg.flush(args.out_dir)
+        if record is not None:
+            record.close()
+        if server is not None:
+            server.shutdown()
+    print(f"[stream] {agg.messages} messages; latest -> {args.out_dir / 'latest.json'} (+{written} bars on exit)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
+from __future__ import annotations
+
 import json
 from pathlib import Path
 
+from thesislab.build_cache import BuildCache
+
+GENERATOR_VERSION = "1"
 RULES = Path("config/scenario_rules.json")
 DOC = Path("docs/scenario_matrix.md")
 MANIFEST = Path("rag/corpus_manifest.json")
@@ -36,10 +41,7 @@ def validate_manifest() -> None:
             raise SystemExit(f"manifest consistency check failed: {p} not found")
 
 
-def main():
-    validate_manifest()
-    rules = json.loads(RULES.read_text(encoding="utf-8"))
-
+def render(rules: dict) -> str:
     out = []
     out.append("# Scenario Analysis Matrix (No Target Price)\n")
     out.append("<!-- MACHINE_DECLARATION_START -->")
@@ -62,15 +64,31 @@ def main():
     out.append(f"- On-chain concentration: `{w['onchain_concentration']}`")
     out.append(f"- Narrative/volatility buffer: `{w['narrative_volatility_buffer']}`\n")
 
+    tk = rules["derivatives_momentum"]["taker_buy_sell_ratio"]
+    hw = tk.get("horizon_weights") or {"1d": 1.0}
+    li = rules["derivatives_momentum"].get("liquidation_imbalance") or {}
+    out.append("## Derivatives Momentum Inputs")
+    out.append(
+        "- Taker ratio: weighted geometric mean of `derivatives.taker_buy_sell_ratio_<h>` with weights "
+        + ", ".join(f"`{h}`: `{v}`" for h, v in hw.items())
+        + ", renormalised over the horizons present."
+    )
+    out.append("- Stream-only horizons (`5m`, `1h`) count once the WebSocket stream has run that long (`derivatives.minutes`).")
+    if li:
+        out.append(
+            f"- Liquidation imbalance (`{li.get('horizon')}`, stream-only): shifts up to `{li.get('max_shift')}` between Bull and Stress "
+            f"once at least `{li.get('min_total_usd')}` USD was liquidated over the horizon.\n"
+        )
+
     liq = rules["liquidity"]
     mom = rules["momentum"]
     vol = rules["volatility_buffer"]
 
     out.append("## Base")
     out.append("Core observation metrics:")
-    out.append("1. `dex_depth_2pct_usd` (proxy pending)")
+    out.append("1. `dex_depth_2pct_usd` (pool-reserve estimate)")
     out.append("2. `liq_fdv_ratio`")
-    out.append("3. `derivatives.taker_buy_sell_ratio_1d` (primary)")
+    out.append("3. `derivatives.taker_buy_sell_ratio_{1h,4h,1d}` (primary, horizon-weighted)")
     out.append("4. `buy_sell_txn_ratio_24h` (secondary)")
     out.append("5. `price_change_24h_pct`\n")
 
@@ -78,17 +96,19 @@ def main():
     out.append("Core observation metrics:")
     out.append("1. `liquidity_change_24h`")
     out.append("2. `liq_fdv_ratio`")
-    out.append("3. `derivatives.taker_buy_sell_ratio_1d` (primary)")
+    out.append("3. `derivatives.taker_buy_sell_ratio_{1h,4h,1d}` (primary, horizon-weighted)")
     out.append("4. `buy_sell_txn_ratio_24h` (secondary)")
-    out.append("5. `price_change_24h_pct`\n")
+    out.append("5. `derivatives.liquidation_imbalance_1h` (WebSocket bars)")
+    out.append("6. `price_change_24h_pct`\n")
 
     out.append("## Bull")
     out.append("Core observation metrics:")
     out.append("1. `liq_fdv_ratio`")
-    out.append("2. `derivatives.taker_buy_sell_ratio_1d` (primary)")
+    out.append("2. `derivatives.taker_buy_sell_ratio_{1h,4h,1d}` (primary, horizon-weighted)")
     out.append("3. `buy_sell_txn_ratio_24h` (secondary)")
     out.append("4. `liquidity_change_24h`")
-    out.append("5. `price_change_24h_pct`\n")
+    out.append("5. `derivatives.liquidation_imbalance_1h` (WebSocket bars)")
+    out.append("6. `price_change_24h_pct`\n")
 
     out.append("### Phase 3: Discovery Regime & Valuation Re-rating")
     out.append("Cyclic Benchmarking (structure-only): compare current token regime against historical meme-cycle phases (e.g., SHIB/DOGE) using **liquidity structure** and **diffusion velocity** only, not target-price anchoring.")
@@ -98,7 +118,7 @@ def main():
     out.append("")
     out.append("**Evidence:** `data/timeseries.jsonl`, `data/snapshots/*.snapshot.json`, `config/scenario_rules.json`")
     out.append("**Confidence:** medium (proxy-driven; confidence increases with validated holder-distribution endpoints)")
-    out.append("**Falsification Trigger A (Whale-to-exchange netflow spike):** in a 4H rolling window, whale net inflow to exchanges > 5% of current on-chain liquidity.")
+    out.append("**Falsification Trigger A (Whale-to-exchange 24H netflow spike):** 24H whale net inflow to exchanges > 5% of current on-chain liquidity at any sample within the last 4H.")
     out.append("**Falsification Trigger B (Liquidity resilience collapse):** DEX Depth-2% drops > 30% within 1H and does not recover.")
     out.append("**Falsification Trigger C (Concentration decay):** `top10_holder_pct` absolute drop > 3% within 24H (e.g., 98.7% → 95.7%), signaling Diamond Hands breakdown.\n")
 
@@ -115,8 +135,23 @@ def main():
     }, ensure_ascii=False, indent=2))
     out.append("```")
 
-    DOC.write_text("\n".join(out) + "\n", encoding="utf-8")
-    print(f"synced {DOC}")
+    return "\n".join(out) + "\n"
+
+
+def main(rules: dict | None = None):
+    validate_manifest()
+
+    cache = BuildCache()
+    key = cache.key(GENERATOR_VERSION, [RULES, Path(__file__)])
+    if cache.fresh(DOC, key):
+        print(f"{DOC} up to date")
+    else:
+        if rules is None:
+            rules = json.loads(RULES.read_text(encoding="utf-8"))
+        written = cache.write_text(DOC, render(rules), key)
+        print(f"synced {DOC}" if written else f"{DOC} unchanged")
+        cache.save()
+    cache.report(detail=False)
 
 
 if __name__ == "__main__":
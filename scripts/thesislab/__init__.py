@@ -0,0 +1,7 @@
+"""Shared library code for the trump-thesis-lab pipeline scripts.
+
+Scripts under scripts/ run with that directory on sys.path, so modules here are
+imported as `from thesislab import <module>`. Heavy third-party dependencies
+(yfinance/pandas, requests) are only reached through `thesislab.lazy`, keeping
+script startup close to bare-interpreter cost on paths that never use them.
+"""
@@ -0,0 +1,161 @@
+"""Fixed-size ring buffers of trade/liquidation bars at 1m, 5m and 1h.
+
+Each Ring holds `size` slots of `width_ms` in preallocated array("d")
+columns, indexed by (slot start // width_ms) % size, plus running totals of
+the additive columns over the whole ring. An event touches one slot and the
+totals of each ring; rolling into a new slot evicts (subtracts and zeroes)
+the slot it reuses. Memory is fixed at construction and every event is O(1)
+(a gap of k empty slots costs min(k, size) once).
+
+    RESOLUTIONS   1m x 60 (1h)    5m x 288 (1d)    1h x 168 (7d)
+
+    bars = BarSet()
+    bars.trade(t_ms, price, usd, taker_sell=False)
+    bars.liquidation(t_ms, usd, long_side=True)
+    bars.flow("1h")    # {"buy_usd", "sell_usd", "liq_long_usd", "liq_short_usd", "taker_buy_sell_ratio", "liquidation_imbalance"}
+    bars.covers("1h")  # False until an hour of events has been seen
+
+liquidation_imbalance = (short - long) / (short + long) liquidated USD, in
+[-1, 1]; positive means shorts are being squeezed.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+
+SUM_COLUMNS = ("buy_usd", "sell_usd", "liq_long_usd", "liq_short_usd", "trades", "liq_count")
+PRICE_COLUMNS = ("o", "h", "l", "c")
+RESOLUTIONS = {"1m": (60_000, 60), "5m": (300_000, 288), "1h": (3_600_000, 168)}
+# Flow horizons: (ring, slots); a ring's full window is read from its running totals.
+HORIZONS = {"5m": ("1m", 5), "1h": ("1m", 60), "4h": ("5m", 48), "1d": ("5m", 288), "7d": ("1h", 168)}
+
+
+class Ring:
+    def __init__(self, width_ms: int, size: int):
+        self.width_ms = width_ms
+        self.size = size
+        self.cols = {c: array("d", bytes(8 * size)) for c in SUM_COLUMNS}
+        self.cols.update({c: array("d", [math.nan]) * size for c in PRICE_COLUMNS})
+        self.totals = dict.fromkeys(SUM_COLUMNS, 0.0)
+        self.head = None  # start (ms) of the newest slot
+
+    def _clear(self, i: int) -> None:
+        for c in SUM_COLUMNS:
+            self.totals[c] -= self.cols[c][i]
+            self.cols[c][i] = 0.0
+        for c in PRICE_COLUMNS:
+            self.cols[c][i] = math.nan
+
+    def slot(self, t_ms: int) -> tuple[int | None, dict | None]:
+        """Slot index for an event at t_ms (None if older than the ring) and the bar it closed, if any."""
+        start = t_ms - t_ms % self.width_ms
+        closed = None
+        if self.head is None:
+            self.head = start
+        elif start > self.head:
+            closed = self.bar(self.head)
+            for k in range(1, min(self.size, (start - self.head) // self.width_ms) + 1):
+                self._clear((self.head // self.width_ms + k) % self.size)
+            self.head = start
+            if (start // self.width_ms) % self.size == 0:  # once per lap: drop float drift from the running totals
+                self.totals = {c: sum(self.cols[c]) for c in SUM_COLUMNS}
+        elif start <= self.head - self.size * self.width_ms:
+            return None, None
+        return (start // self.width_ms) % self.size, closed
+
+    def bar(self, start: int) -> dict:
+        i = (start // self.width_ms) % self.size
+        out = {"t": start}
+        for c in PRICE_COLUMNS:
+            v = self.cols[c][i]
+            out[c] = None if math.isnan(v) else v
+        for c in SUM_COLUMNS:
+            out[c] = int(self.cols[c][i]) if c in ("trades", "liq_count") else self.cols[c][i]
+        return out
+
+    def add(self, i: int, column: str, value: float) -> None:
+        self.cols[column][i] += value
+        self.totals[column] += value
+
+    def price(self, i: int, price: float) -> None:
+        o, h, l = self.cols["o"], self.cols["h"], self.cols["l"]
+        if math.isnan(o[i]):
+            o[i] = h[i] = l[i] = price
+        h[i], l[i] = max(h[i], price), min(l[i], price)
+        self.cols["c"][i] = price
+
+    def sums(self, slots: int | None = None) -> dict[str, float]:
+        """Totals over the newest `slots` slots (whole ring: the running totals)."""
+        if slots is None or slots >= self.size or self.head is None:
+            return dict(self.totals)
+        last = self.head // self.width_ms
+        idx = [(last - k) % self.size for k in range(slots)]
+        return {c: sum(self.cols[c][i] for i in idx) for c in SUM_COLUMNS}
+
+
+class BarSet:
+    """One Ring per resolution, fed together; closed 1m bars are queued for flushing."""
+
+    def __init__(self):
+        self.rings = {res: Ring(width, size) for res, (width, size) in RESOLUTIONS.items()}
+        self.closed: list[dict] = []
+        self.first_ms = None
+        self.last_ms = None
+
+    def _slots(self, t_ms: int) -> list[tuple[Ring, int]]:
+        self.first_ms = t_ms if self.first_ms is None else min(self.first_ms, t_ms)
+        self.last_ms = t_ms if self.last_ms is None else max(self.last_ms, t_ms)
+        out = []
+        for res, ring in self.rings.items():
+            i, closed = ring.slot(t_ms)
+            if closed is not None and res == "1m":
+                self.closed.append(closed)
+            if i is not None:
+                out.append((ring, i))
+        return out
+
+    def tick(self, t_ms: int) -> None:
+        """Advance the clock without data (closes bars on quiet markets)."""
+        self._slots(t_ms)
+
+    def trade(self, t_ms: int, price: float, usd: float, taker_sell: bool) -> None:
+        for ring, i in self._slots(t_ms):
+            ring.price(i, price)
+            ring.add(i, "sell_usd" if taker_sell else "buy_usd", usd)
+            ring.add(i, "trades", 1)
+
+    def liquidation(self, t_ms: int, usd: float, long_side: bool) -> None:
+        for ring, i in self._slots(t_ms):
+            ring.add(i, "liq_long_usd" if long_side else "liq_short_usd", usd)
+            ring.add(i, "liq_count", 1)
+
+    def close_open(self) -> None:
+        ring = self.rings["1m"]
+        if ring.head is not None:
+            self.closed.append(ring.bar(ring.head))
+
+    def last_price(self) -> float | None:
+        ring = self.rings["1m"]
+        return ring.bar(ring.head)["c"] if ring.head is not None else None
+
+    def flow(self, horizon: str) -> dict:
+        res, slots = HORIZONS[horizon]
+        s = self.rings[res].sums(slots)
+        liq = s["liq_long_usd"] + s["liq_short_usd"]
+        return {
+            "buy_usd": round(s["buy_usd"], 2),
+            "sell_usd": round(s["sell_usd"], 2),
+            "liq_long_usd": round(s["liq_long_usd"], 2),
+            "liq_short_usd": round(s["liq_short_usd"], 2),
+            "taker_buy_sell_ratio": round(s["buy_usd"] / s["sell_usd"], 4) if s["sell_usd"] > 0 else None,
+            "liquidation_imbalance": round((s["liq_short_usd"] - s["liq_long_usd"]) / liq, 4) if liq > 0 else None,
+        }
+
+    def coverage_minutes(self) -> int:
+        return int((self.last_ms - self.first_ms) // 60_000) + 1 if self.first_ms is not None else 0
+
+    def covers(self, horizon: str) -> bool:
+        """Whether the stream has run for the whole horizon (a fresh ring under-fills every window)."""
+        res, slots = HORIZONS[horizon]
+        return self.coverage_minutes() >= slots * RESOLUTIONS[res][0] // 60_000
@@ -0,0 +1,131 @@
+"""Content-hash build cache for generated artifacts.
+
+An artifact's key is the sha256 of its generator version plus the path and
+content hash of every input file. When the key matches the last build and
+the artifact on disk still has the recorded hash, regeneration is skipped
+(a hit). On a miss the new content is only written if it differs byte-wise
+from what is already there, so unchanged artifacts keep their mtime and do
+not show up as churn in git.
+
+    cache = BuildCache()
+    key = cache.key("1", [RULES])
+    if not cache.fresh(DOC, key):
+        cache.write_text(DOC, render(), key)
+    cache.save()
+    cache.report()
+
+State lives in data/cache/build_cache.json (git-ignored). Several generators
+share it and the pipeline runs them in parallel threads, so save() re-reads the
+file under a lock and merges in only the entries this instance recorded,
+writing through a per-thread tmp file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Iterable
+
+from thesislab import telemetry
+
+ROOT = Path(__file__).resolve().parents[2]
+CACHE_PATH = ROOT / "data" / "cache" / "build_cache.json"
+
+_SAVE_LOCK = threading.Lock()
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _rel(path: Path) -> str:
+    path = Path(path).resolve()
+    try:
+        return str(path.relative_to(ROOT))
+    except ValueError:
+        return str(path)
+
+
+class BuildCache:
+    def __init__(self, path: Path = CACHE_PATH):
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self.stats: dict[str, str] = {}
+        self.entries = self._load()
+
+    def _load(self) -> dict[str, dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def digest_key(version: str, digests: dict[str, str]) -> str:
+        """Key from already-known input digests (name -> sha256)."""
+        h = hashlib.sha256(version.encode("utf-8"))
+        for name in sorted(digests):
+            h.update(name.encode("utf-8"))
+            h.update(digests[name].encode("ascii"))
+        return h.hexdigest()
+
+    @classmethod
+    def key(cls, version: str, inputs: Iterable[Path]) -> str:
+        return cls.digest_key(
+            version,
+            {_rel(p): file_sha256(p) if p.exists() else "missing" for p in (Path(x) for x in inputs)},
+        )
+
+    def fresh(self, artifact: Path, key: str) -> bool:
+        """True (and counted as a hit) if `artifact` was built from `key` and is untouched."""
+        entry = self.entries.get(_rel(artifact))
+        hit = bool(entry) and entry.get("key") == key and artifact.exists() and file_sha256(artifact) == entry.get("sha256")
+        if hit:
+            self.stats[_rel(artifact)] = "hit"
+            telemetry.incr("cache_hits")
+        return hit
+
+    def _record(self, artifact: Path, key: str, digest: str, written: bool) -> bool:
+        self.entries[_rel(artifact)] = {"key": key, "sha256": digest}
+        self.stats[_rel(artifact)] = "miss" if written else "miss-unchanged"
+        return written
+
+    def write_bytes(self, artifact: Path, data: bytes, key: str) -> bool:
+        """Write `data` unless the file already holds exactly these bytes; returns True if written."""
+        digest = hashlib.sha256(data).hexdigest()
+        if artifact.exists() and file_sha256(artifact) == digest:
+            return self._record(artifact, key, digest, False)
+        artifact.parent.mkdir(parents=True, exist_ok=True)
+        artifact.write_bytes(data)
+        return self._record(artifact, key, digest, True)
+
+    def write_text(self, artifact: Path, text: str, key: str) -> bool:
+        return self.write_bytes(artifact, text.encode("utf-8"), key)
+
+    def save(self) -> None:
+        """Merge this instance's recorded artifacts into the on-disk state (other builders' entries survive)."""
+        recorded = {name: self.entries[name] for name, status in self.stats.items() if status != "hit"}
+        with _SAVE_LOCK:
+            self.entries = self._load() | recorded
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(self.entries, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+            os.replace(tmp, self.path)
+
+    def report(self, detail: bool = True) -> None:
+        counts: dict[str, int] = {}
+        for status in self.stats.values():
+            counts[status] = counts.get(status, 0) + 1
+        if detail:
+            for name, status in sorted(self.stats.items()):
+                print(f"[build-cache] {status:14} {name}")
+        summary = ", ".join(f"{k}={v}" for k, v in sorted(counts.items())) or "no artifacts"
+        print(f"[build-cache] {summary}")
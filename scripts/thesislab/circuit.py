@@ -0,0 +1,259 @@
+"""Per-host circuit breaker (persisted across runs) and token-bucket rate limiter.
+
+Circuit states, per host:
+
+    closed     calls go through; FAILURE_THRESHOLD consecutive failed calls open it
+    open       calls are refused instantly until `retry_at`
+    half_open  cooldown elapsed: one call is let through as a probe (others are
+               refused until it reports or PROBE_TIMEOUT_S passes); success
+               closes the circuit, failure re-opens it with twice the cooldown
+
+401/403 open the host's circuit at once for HARD_COOLDOWN_S: a missing key will
+not fix itself between two runs. A 404 does the same for that endpoint only
+(circuit key "host/path", see endpoint_key), so one dead path does not block
+the host's other endpoints. A different credential (auth fingerprint) than the
+one that tripped the breaker closes it again.
+
+State is kept in data/circuit_breaker.json so the next scheduled run skips
+hosts that are known to be down (CI restores it from the Actions cache and
+commits it only when a circuit changes state, see states_changed). Rate limits are in-process only: one token
+bucket per host (HOST_RATES, else DEFAULT_RATE); a Retry-After response
+pauses that bucket, and a Retry-After longer than MAX_INLINE_WAIT_S opens
+the circuit until then instead of sleeping.
+"""
+
+from __future__ import annotations
+
+import email.utils
+import hashlib
+import json
+import threading
+import time
+import urllib.parse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+STATE_PATH = ROOT / "data" / "circuit_breaker.json"
+
+FAILURE_THRESHOLD = 2
+BASE_COOLDOWN_S = 15 * 60
+MAX_COOLDOWN_S = 24 * 3600
+HARD_COOLDOWN_S = 12 * 3600
+MAX_INLINE_WAIT_S = 30.0
+PROBE_TIMEOUT_S = 60.0
+
+# (requests per second, burst), from the public quota of each API.
+DEFAULT_RATE = (5.0, 5)
+HOST_RATES = {
+    "api.coingecko.com": (0.5, 3),
+    "pro-api.coingecko.com": (8.0, 8),
+    "api.dexscreener.com": (5.0, 5),
+    "pro-api.solscan.io": (2.0, 2),
+    "solana-gateway.moralis.io": (2.0, 2),
+    "public-api.birdeye.so": (1.0, 1),
+    "api.dune.com": (0.5, 1),
+    "fapi.binance.com": (10.0, 10),
+    "api.binance.com": (10.0, 10),
+    "web3.binance.com": (5.0, 5),
+}
+
+
+class CircuitOpen(Exception):
+    def __init__(self, host: str, reason: str, retry_at: float):
+        self.host = host
+        self.reason = reason
+        self.retry_at = retry_at
+        wait = max(0.0, retry_at - time.time())
+        super().__init__(f"circuit open for {host} ({reason}), retry in {wait:.0f}s")
+
+
+def auth_fingerprint(headers: dict | None) -> str:
+    """Short hash of the credential headers, so a new key resets a tripped breaker."""
+    creds = sorted(
+        (k.lower(), str(v)) for k, v in (headers or {}).items()
+        if any(t in k.lower() for t in ("key", "token", "auth", "sign"))
+    )
+    if not creds:
+        return ""
+    return hashlib.sha256(json.dumps(creds).encode("utf-8")).hexdigest()[:12]
+
+
+def endpoint_key(url: str) -> str:
+    """Circuit key of one endpoint: host plus path, without the query."""
+    parts = urllib.parse.urlsplit(url)
+    return f"{parts.hostname or url}{parts.path.rstrip('/')}"
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class Breaker:
+    def __init__(self, path: Path = STATE_PATH):
+        self.path = path
+        self.hosts: dict[str, dict] = {}
+        self.dirty = False
+        self.lock = threading.Lock()
+        self.probes: dict[str, float] = {}  # half_open circuits with a probe in flight (monotonic start)
+        if path.exists():
+            try:
+                self.hosts = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                self.hosts = {}
+
+    def state(self, host: str) -> str:
+        return (self.hosts.get(host) or {}).get("state", "closed")
+
+    def check(self, host: str, auth: str = "") -> None:
+        """Raise CircuitOpen if `host` must be skipped; moves expired circuits to half_open."""
+        with self.lock:
+            entry = self.hosts.get(host)
+            if not entry or entry.get("state") == "closed":
+                return
+            if entry.get("state") == "open":
+                if entry.get("reason") in ("unauthorized", "not_found") and entry.get("auth", "") != auth:
+                    self._set(host, state="closed", failures=0, reason=None)
+                    return
+                if time.time() < entry.get("retry_at", 0):
+                    raise CircuitOpen(host, entry.get("reason") or "failing", entry["retry_at"])
+                self._set(host, state="half_open")
+            started = self.probes.get(host)
+            if started is not None and time.monotonic() - started < PROBE_TIMEOUT_S:
+                raise CircuitOpen(host, "probe in flight", time.time() + PROBE_TIMEOUT_S - (time.monotonic() - started))
+            self.probes[host] = time.monotonic()
+
+    def success(self, host: str) -> None:
+        with self.lock:
+            self.probes.pop(host, None)
+            entry = self.hosts.get(host)
+            if entry and (entry.get("state") != "closed" or entry.get("failures")):
+                self._set(host, state="closed", failures=0, reason=None, cooldown_s=0)
+
+    def failure(self, host: str, reason: str, hard: bool = False, retry_after: float | None = None, auth: str = "") -> None:
+        """Count a failed call; opens the circuit when the policy says so."""
+        with self.lock:
+            self.probes.pop(host, None)
+            entry = self.hosts.get(host) or {}
+            failures = entry.get("failures", 0) + 1
+            if hard:
+                cooldown = HARD_COOLDOWN_S
+            elif retry_after is not None:
+                cooldown = retry_after
+            elif entry.get("state") == "half_open":
+                cooldown = min(MAX_COOLDOWN_S, max(BASE_COOLDOWN_S, 2 * entry.get("cooldown_s", 0)))
+            elif failures >= FAILURE_THRESHOLD:
+                cooldown = BASE_COOLDOWN_S
+            else:
+                self._set(host, state=entry.get("state", "closed"), failures=failures, reason=reason)
+                return
+            self._set(
+                host, state="open", failures=failures, reason=reason,
+                cooldown_s=cooldown, retry_at=time.time() + cooldown, auth=auth,
+            )
+
+    def _set(self, host: str, **fields) -> None:
+        entry = self.hosts.setdefault(host, {})
+        entry.update(fields, updated_at=round(time.time(), 3))
+        if "retry_at" in fields:
+            entry["retry_at"] = round(fields["retry_at"], 3)
+        self.dirty = True
+
+    def save(self) -> None:
+        """Persist state if anything changed (atomic replace)."""
+        with self.lock:
+            if not self.dirty and self.path.exists():
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.hosts, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+            tmp.replace(self.path)
+            self.dirty = False
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping as needed; returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1.0:
+                        self.tokens -= 1.0
+                        return waited
+                    wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float) -> None:
+        """Honor a Retry-After: no tokens are handed out for `seconds`."""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 1.0
+            self.updated = self.paused_until
+
+
+_breaker: Breaker | None = None
+_buckets: dict[str, TokenBucket] = {}
+_lock = threading.Lock()
+
+
+def breaker() -> Breaker:
+    global _breaker
+    with _lock:
+        if _breaker is None:
+            _breaker = Breaker()
+        return _breaker
+
+
+def bucket(host: str) -> TokenBucket:
+    with _lock:
+        if host not in _buckets:
+            _buckets[host] = TokenBucket(*HOST_RATES.get(host, DEFAULT_RATE))
+        return _buckets[host]
+
+
+def save() -> None:
+    if _breaker is not None:
+        _breaker.save()
+
+
+def _tripped(path: Path) -> dict[str, str]:
+    try:
+        hosts = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return {h: e.get("state", "closed") for h, e in hosts.items() if e.get("state", "closed") != "closed"}
+
+
+def states_changed(previous: Path, path: Path = STATE_PATH) -> bool:
+    """Whether any circuit changed state (closed/open/half_open) since `previous`.
+
+    Failure counts and timestamps alone do not count: CI commits the breaker
+    and pool state only when this is true and carries the rest in its cache.
+    """
+    return _tripped(previous) != _tripped(path)
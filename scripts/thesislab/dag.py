@@ -0,0 +1,202 @@
+"""Small in-process DAG scheduler for the build pipeline.
+
+Each Step declares the steps it depends on, the files it reads (`inputs`)
+and the files it writes (`outputs`), as glob patterns relative to the repo
+root. Steps whose dependencies are done run concurrently on a thread pool;
+values they return are merged into a shared Context so later steps can use
+already-loaded data instead of re-reading it from disk.
+
+Steps that share mutable state no dependency edge orders (e.g. the build
+cache file) name it in `locks`; steps holding a common lock never run at the
+same time, in either order.
+
+A step marked `cacheable` is skipped when the content hash of its inputs
+(plus its `version`) matches the last successful run and all of its outputs
+exist. Hashes are kept in data/cache/pipeline_state.json.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from thesislab import telemetry
+from thesislab.build_cache import file_sha256
+
+ROOT = Path(__file__).resolve().parents[2]
+STATE_PATH = ROOT / "data" / "cache" / "pipeline_state.json"
+
+
+class Context:
+    """Shared, thread-safe store of data loaded or produced by steps."""
+
+    def __init__(self, **options):
+        self.options = options
+        self._values: dict = {}
+        self._lock = threading.RLock()
+
+    def get(self, key: str, loader: Callable | None = None):
+        """Return a cached value, loading it once (under the lock) if missing."""
+        with self._lock:
+            if key not in self._values and loader is not None:
+                self._values[key] = loader()
+            return self._values.get(key)
+
+    def has(self, key: str) -> bool:
+        with self._lock:
+            return key in self._values
+
+    def update(self, values: dict) -> None:
+        with self._lock:
+            self._values.update(values)
+
+
+@dataclass
+class Step:
+    name: str
+    run: Callable[[Context], dict | int | None]
+    deps: tuple[str, ...] = ()
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+    locks: tuple[str, ...] = ()
+    cacheable: bool = False
+    version: str = "1"
+
+
+@dataclass
+class StepResult:
+    name: str
+    status: str  # ran | skipped | failed | blocked
+    elapsed_s: float = 0.0
+    error: str | None = None
+    input_hash: str | None = field(default=None, repr=False)
+
+
+def expand(patterns: tuple[str, ...]) -> list[Path]:
+    paths: set[Path] = set()
+    for pattern in patterns:
+        paths.update(p for p in ROOT.glob(pattern) if p.is_file())
+    return sorted(paths)
+
+
+def inputs_hash(step: Step) -> str:
+    h = hashlib.sha256(f"{step.name}@{step.version}".encode("utf-8"))
+    for p in expand(step.inputs):
+        h.update(str(p.relative_to(ROOT)).encode("utf-8"))
+        h.update(file_sha256(p).encode("ascii"))
+    return h.hexdigest()
+
+
+def _outputs_present(step: Step) -> bool:
+    return all(any(ROOT.glob(pattern)) for pattern in step.outputs)
+
+
+def load_state(path: Path = STATE_PATH) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(state: dict, path: Path = STATE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    tmp.replace(path)
+
+
+def _validate(steps: list[Step]) -> dict[str, Step]:
+    by_name = {s.name: s for s in steps}
+    if len(by_name) != len(steps):
+        raise ValueError("duplicate step names")
+    for s in steps:
+        missing = [d for d in s.deps if d not in by_name]
+        if missing:
+            raise ValueError(f"step {s.name!r} depends on unknown steps {missing}")
+
+    # Kahn's algorithm, only to reject cycles up front.
+    indegree = {s.name: len(s.deps) for s in steps}
+    ready = [n for n, d in indegree.items() if d == 0]
+    seen = 0
+    while ready:
+        n = ready.pop()
+        seen += 1
+        for s in steps:
+            if n in s.deps:
+                indegree[s.name] -= 1
+                if indegree[s.name] == 0:
+                    ready.append(s.name)
+    if seen != len(steps):
+        raise ValueError("pipeline has a dependency cycle")
+    return by_name
+
+
+def _execute(step: Step, ctx: Context, state: dict, force: bool, locks: dict[str, threading.Lock]) -> StepResult:
+    t0 = time.perf_counter()
+    digest = inputs_hash(step) if step.cacheable else None
+    prev = state.get(step.name) or {}
+    if digest and not force and prev.get("inputs") == digest and _outputs_present(step):
+        return StepResult(step.name, "skipped", time.perf_counter() - t0, input_hash=digest)
+
+    try:
+        with ExitStack() as held:
+            for name in sorted(step.locks):  # fixed order: no lock-order deadlocks
+                held.enter_context(locks[name])
+            with telemetry.span(f"step.{step.name}"):
+                out = step.run(ctx)
+    except SystemExit as e:
+        out = e.code
+    except Exception as e:  # noqa: BLE001 - one failing step must not take down its siblings
+        return StepResult(step.name, "failed", time.perf_counter() - t0, error=f"{type(e).__name__}: {e}")
+
+    if isinstance(out, dict):
+        ctx.update(out)
+    elif out not in (None, 0):
+        return StepResult(step.name, "failed", time.perf_counter() - t0, error=f"exit code {out}")
+
+    return StepResult(step.name, "ran", time.perf_counter() - t0, input_hash=digest)
+
+
+def run(steps: list[Step], ctx: Context, jobs: int = 4, force: bool = False, state_path: Path = STATE_PATH) -> list[StepResult]:
+    """Run `steps` respecting dependencies; return one result per step in declaration order."""
+    by_name = _validate(steps)
+    state = load_state(state_path)
+    results: dict[str, StepResult] = {}
+    pending = dict(by_name)
+    running = {}
+    locks = {name: threading.Lock() for s in steps for name in s.locks}
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while pending or running:
+            for name, step in list(pending.items()):
+                dep_status = [results[d].status for d in step.deps if d in results]
+                if any(s in ("failed", "blocked") for s in dep_status):
+                    results[name] = StepResult(name, "blocked", error="upstream step failed")
+                    del pending[name]
+                elif len(dep_status) == len(step.deps):
+                    print(f"[pipeline] start {name}")
+                    running[pool.submit(_execute, step, ctx, state, force, locks)] = name
+                    del pending[name]
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                res = fut.result()
+                results[name] = res
+                print(f"[pipeline] {res.status} {name} ({res.elapsed_s:.2f}s){' - ' + res.error if res.error else ''}")
+                if res.status == "ran" and res.input_hash:
+                    state[name] = {"inputs": res.input_hash}
+
+    save_state(state, state_path)
+    return [results[s.name] for s in steps]
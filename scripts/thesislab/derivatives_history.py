@@ -0,0 +1,203 @@
+"""Binance Futures history store and multi-window derivatives features.
+
+Three series per symbol, one append-only JSONL file each under
+data/derivatives/ (rows {"t": epoch ms, ...}, oldest first):
+
+    open_interest   /futures/data/openInterestHist       5m   {"oi", "oi_usd"}
+    taker           /futures/data/takerlongshortRatio    5m   {"ratio", "buy_vol", "sell_vol"}
+    funding         /fapi/v1/fundingRate                 8h   {"rate", "mark_price"}
+
+update() fetches only what is newer than the last stored row, paging
+forward in `limit`-sized windows; an empty store is backfilled
+BACKFILL_DAYS (Binance serves the /futures/data series for 30 days only).
+Rows older than RETENTION_DAYS are dropped when the file is next rewritten.
+
+features() turns the store into the flat block merged into
+snapshot["derivatives"]:
+
+    open_interest_change_pct_{4h,1d,7d}   OI value change over the window
+    open_interest_z_{4h,1d,7d}            z-score of the latest OI value in the window
+    taker_buy_sell_ratio_{4h,1d,7d}       taker buy volume / sell volume over the window
+    taker_ratio_z_{4h,1d,7d}              z-score of the latest 5m log(buy/sell ratio)
+    funding_ema                           EMA of the funding rate (FUNDING_EMA_SPAN events)
+    funding_z_7d                          z-score of the latest funding rate over 7d
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import statistics
+import time
+import urllib.parse
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parents[2]
+HISTORY_DIR = ROOT / "data" / "derivatives"
+
+BACKFILL_DAYS = 29
+RETENTION_DAYS = 30
+MAX_PAGES = 40
+FUNDING_EMA_SPAN = 9  # funding events, i.e. 3 days at 8h
+MIN_Z_SAMPLES = 3
+DAY_MS = 24 * 3600 * 1000
+WINDOWS_MS = {"4h": 4 * 3600 * 1000, "1d": DAY_MS, "7d": 7 * DAY_MS}
+
+SERIES = {
+    "open_interest": {
+        "url": "https://fapi.binance.com/futures/data/openInterestHist",
+        "period": "5m", "period_ms": 5 * 60 * 1000, "limit": 500, "ts": "timestamp",
+        "fields": {"sumOpenInterest": "oi", "sumOpenInterestValue": "oi_usd"},
+    },
+    "taker": {
+        "url": "https://fapi.binance.com/futures/data/takerlongshortRatio",
+        "period": "5m", "period_ms": 5 * 60 * 1000, "limit": 500, "ts": "timestamp",
+        "fields": {"buySellRatio": "ratio", "buyVol": "buy_vol", "sellVol": "sell_vol"},
+    },
+    "funding": {
+        "url": "https://fapi.binance.com/fapi/v1/fundingRate",
+        "period": None, "period_ms": None, "limit": 1000, "ts": "fundingTime",
+        "fields": {"fundingRate": "rate", "markPrice": "mark_price"},
+    },
+}
+
+
+def _num(v) -> float | None:
+    try:
+        return float(v) if v not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def series_path(symbol: str, series: str, root: Path = HISTORY_DIR) -> Path:
+    return root / f"{symbol}.{series}.jsonl"
+
+
+def load(symbol: str, series: str, root: Path = HISTORY_DIR) -> list[dict]:
+    path = series_path(symbol, series, root)
+    if not path.exists():
+        return []
+    rows = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            rows.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return rows
+
+
+def _save(path: Path, rows: list[dict], new: list[dict], cutoff_ms: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if rows and rows[0]["t"] < cutoff_ms:
+        kept = [r for r in rows + new if r["t"] >= cutoff_ms]
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text("".join(json.dumps(r, separators=(",", ":")) + "\n" for r in kept), encoding="utf-8")
+        tmp.replace(path)
+        return
+    with path.open("a", encoding="utf-8") as f:
+        for r in new:
+            f.write(json.dumps(r, separators=(",", ":")) + "\n")
+
+
+def _parse(spec: dict, item: dict) -> dict | None:
+    t = item.get(spec["ts"])
+    if t is None:
+        return None
+    row = {"t": int(t)}
+    for src, dst in spec["fields"].items():
+        row[dst] = _num(item.get(src))
+    return row
+
+
+def fetch_since(spec: dict, symbol: str, since_ms: int, now_ms: int, fetch_json: Callable) -> list[dict]:
+    """Rows with since_ms <= t <= now_ms, paging forward one `limit` window at a time."""
+    out: list[dict] = []
+    start = since_ms
+    for _ in range(MAX_PAGES):
+        if start > now_ms:
+            break
+        params = {"symbol": symbol, "limit": spec["limit"], "startTime": start}
+        if spec["period"]:
+            params["period"] = spec["period"]
+            params["endTime"] = min(now_ms, start + spec["limit"] * spec["period_ms"])
+        else:
+            params["endTime"] = now_ms
+        batch = fetch_json(f"{spec['url']}?{urllib.parse.urlencode(params)}")
+        rows = sorted(
+            (r for r in (_parse(spec, x) for x in (batch if isinstance(batch, list) else [])) if r and r["t"] >= start),
+            key=lambda r: r["t"],
+        )
+        out.extend(rows)
+        if spec["period"]:
+            # Fixed windows: move on even if this one was empty (before listing, or a gap).
+            start = max(params["endTime"], rows[-1]["t"] if rows else 0) + 1
+        elif len(rows) < spec["limit"]:
+            break
+        else:
+            start = rows[-1]["t"] + 1
+    return out
+
+
+def update(symbol: str, fetch_json: Callable, now_ms: int | None = None, root: Path = HISTORY_DIR) -> dict[str, int]:
+    """Fetch what is new for every series; returns {series: rows added}. A failing series is skipped."""
+    now_ms = now_ms or int(time.time() * 1000)
+    added = {}
+    for name, spec in SERIES.items():
+        rows = load(symbol, name, root)
+        floor = now_ms - BACKFILL_DAYS * DAY_MS
+        since = max(rows[-1]["t"] + 1, floor) if rows else floor
+        try:
+            new = fetch_since(spec, symbol, since, now_ms, fetch_json)
+        except Exception as e:  # noqa: BLE001 - keep what we have, retry next run
+            print(f"[derivatives-history] {name}: {type(e).__name__}: {e}")
+            added[name] = 0
+            continue
+        _save(series_path(symbol, name, root), rows, new, now_ms - RETENTION_DAYS * DAY_MS)
+        added[name] = len(new)
+    return added
+
+
+def zscore(values: list[float]) -> float | None:
+    """z-score of the last value against the whole list."""
+    if len(values) < MIN_Z_SAMPLES:
+        return None
+    sd = statistics.pstdev(values)
+    return round((values[-1] - statistics.fmean(values)) / sd, 4) if sd > 0 else 0.0
+
+
+def ema(values: list[float], span: int) -> float | None:
+    if not values:
+        return None
+    alpha = 2 / (span + 1)
+    out = values[0]
+    for v in values[1:]:
+        out = alpha * v + (1 - alpha) * out
+    return out
+
+
+def _window(rows: list[dict], key: str, since_ms: int) -> list[float]:
+    return [r[key] for r in rows if r["t"] >= since_ms and r.get(key) is not None]
+
+
+def features(symbol: str, now_ms: int | None = None, root: Path = HISTORY_DIR) -> dict:
+    """Flat multi-window feature block (see module docstring); keys are None without data."""
+    now_ms = now_ms or int(time.time() * 1000)
+    oi, taker, funding = (load(symbol, s, root) for s in ("open_interest", "taker", "funding"))
+    out: dict = {}
+    for w, span_ms in WINDOWS_MS.items():
+        since = now_ms - span_ms
+        oi_usd = _window(oi, "oi_usd", since)
+        out[f"open_interest_change_pct_{w}"] = (
+            round((oi_usd[-1] / oi_usd[0] - 1) * 100, 4) if len(oi_usd) >= 2 and oi_usd[0] else None
+        )
+        out[f"open_interest_z_{w}"] = zscore(oi_usd)
+        buy, sell = sum(_window(taker, "buy_vol", since)), sum(_window(taker, "sell_vol", since))
+        out[f"taker_buy_sell_ratio_{w}"] = round(buy / sell, 4) if sell else None
+        out[f"taker_ratio_z_{w}"] = zscore([math.log(r) for r in _window(taker, "ratio", since) if r > 0])
+    rates = [r["rate"] for r in funding if r.get("rate") is not None]
+    f_ema = ema(rates, FUNDING_EMA_SPAN)
+    out["funding_ema"] = round(f_ema, 8) if f_ema is not None else None
+    out["funding_z_7d"] = zscore(_window(funding, "rate", now_ms - WINDOWS_MS["7d"]))
+    out["history_rows"] = {"open_interest": len(oi), "taker": len(taker), "funding": len(funding)}
+    return out
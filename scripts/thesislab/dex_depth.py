@@ -0,0 +1,186 @@
+"""DEX depth-2% estimate: USD needed to move the TRUMP price +2% / -2% across its pools.
+
+Constant-product pools (x * y = k) hold `t` USD of TRUMP and `o` USD of the
+other token. Moving the price by a factor (1 + d) means moving the pool to
+reserves whose ratio changed by that factor, so
+
+    up   (TRUMP +2%): other token in  = o * (sqrt(1 + d) - 1)
+    down (TRUMP -2%): TRUMP in         = t * (1 / sqrt(1 - d) - 1)
+
+Concentrated-liquidity pools (Raydium CLMM, Orca Whirlpool) trade like a
+constant-product pool with *virtual* reserves L / sqrtP and L * sqrtP around
+the current tick, both worth the same in USD. Those come from the pool
+account (active liquidity L, sqrt_price_x64) read over Solana RPC; without it
+the pool falls back to its DexScreener reserves, which understates its depth.
+Liquidity is assumed constant within ±2% (no tick crossing).
+
+    depth_2pct_usd = sum(up) + sum(down) over the TOP_POOLS largest pools
+
+The pool math runs column-wise over all pairs in one pass; decoded pool
+accounts are cached with the slot they were read at (CLMM_CACHE_PATH).
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import math
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+CLMM_CACHE_PATH = ROOT / "data" / "cache" / "clmm_pools.json"
+CLMM_CACHE_TTL_S = 60.0  # ~150 slots
+
+DEPTH_PCT = 0.02
+TOP_POOLS = 10
+MIN_POOL_LIQUIDITY_USD = 1_000.0
+UP_FACTOR = math.sqrt(1 + DEPTH_PCT) - 1
+DOWN_FACTOR = 1 / math.sqrt(1 - DEPTH_PCT) - 1
+
+# Pool account layouts; byte offsets include the 8-byte Anchor discriminator.
+#   raydium CLMM PoolState: token_mint_0/1 @73/105, mint_decimals_0/1 @233/234, liquidity u128 @237, sqrt_price_x64 u128 @253
+#   orca Whirlpool:         liquidity u128 @49, sqrt_price u128 @65, token_mint_a/b @101/181
+CLMM_LAYOUTS = {
+    "raydium": {"liquidity": 237, "sqrt_price": 253, "mints": (73, 105), "decimals": (233, 234)},
+    "orca": {"liquidity": 49, "sqrt_price": 65, "mints": (101, 181), "decimals": None},
+}
+
+_B58 = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def b58decode(s: str) -> bytes:
+    n = 0
+    for c in s:
+        n = n * 58 + _B58.index(c)
+    raw = n.to_bytes((n.bit_length() + 7) // 8, "big") if n else b""
+    return b"\0" * (len(s) - len(s.lstrip("1"))) + raw
+
+
+def _num(v) -> float | None:
+    try:
+        return float(v) if v is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def clmm_kind(pair: dict) -> str | None:
+    """Layout key for a concentrated-liquidity pair, else None."""
+    dex = pair.get("dexId")
+    labels = [str(x).upper() for x in pair.get("labels") or []]
+    if dex == "raydium" and "CLMM" in labels:
+        return "raydium"
+    if dex == "orca":
+        return "orca"
+    return None
+
+
+def decode_clmm(kind: str, data: bytes) -> dict | None:
+    """Active liquidity, sqrt price (Q64.64) and both mints (hex) from a raw pool account."""
+    layout = CLMM_LAYOUTS[kind]
+    if len(data) < max(layout["mints"]) + 32:
+        return None
+    out = {
+        "liquidity": int.from_bytes(data[layout["liquidity"]:layout["liquidity"] + 16], "little"),
+        "sqrt_price_x64": int.from_bytes(data[layout["sqrt_price"]:layout["sqrt_price"] + 16], "little"),
+        "mints": [data[i:i + 32].hex() for i in layout["mints"]],
+    }
+    if layout["decimals"]:
+        out["decimals"] = [data[i] for i in layout["decimals"]]
+    return out
+
+
+def load_clmm_cache(path: Path = CLMM_CACHE_PATH) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def clmm_states(pairs: list[dict], rpc_call, path: Path = CLMM_CACHE_PATH) -> dict:
+    """{"slot", "pools": {pair address: decoded account}} for the CLMM pairs, read in one getMultipleAccounts.
+
+    A cached read younger than CLMM_CACHE_TTL_S that covers every pool is
+    reused as is; `rpc_call(method, params)` returns the JSON-RPC response.
+    """
+    wanted = {p["pairAddress"]: kind for p in pairs if p.get("pairAddress") and (kind := clmm_kind(p))}
+    if not wanted:
+        return {"slot": None, "pools": {}}
+    cache = load_clmm_cache(path)
+    if time.time() - cache.get("fetched_at", 0) < CLMM_CACHE_TTL_S and set(wanted) <= set(cache.get("pools") or {}):
+        return cache
+    resp = rpc_call("getMultipleAccounts", [list(wanted), {"encoding": "base64"}])
+    result = (resp or {}).get("result") or {}
+    pools = {}
+    for addr, acc in zip(wanted, result.get("value") or []):
+        data = (acc or {}).get("data") or []
+        if data:
+            state = decode_clmm(wanted[addr], base64.b64decode(data[0]))
+            if state:
+                pools[addr] = state
+    cache = {"slot": (result.get("context") or {}).get("slot"), "fetched_at": round(time.time(), 3), "pools": pools}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cache, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    tmp.replace(path)
+    return cache
+
+
+def _virtual_usd(state: dict, token_mint: str, decimals: int, price_usd: float) -> float | None:
+    """USD value of one side of a CLMM pool's virtual reserves at the current tick."""
+    sqrt_p = state["sqrt_price_x64"] / 2**64
+    mint = b58decode(token_mint).hex()
+    if not state["liquidity"] or not sqrt_p or mint not in state["mints"]:
+        return None
+    token_is_0 = state["mints"][0] == mint
+    if state.get("decimals"):
+        decimals = state["decimals"][0 if token_is_0 else 1]
+    raw = state["liquidity"] / sqrt_p if token_is_0 else state["liquidity"] * sqrt_p
+    return raw / 10**decimals * price_usd
+
+
+def estimate(
+    pairs: list[dict],
+    token_mint: str,
+    price_usd: float | None,
+    decimals: int = 6,
+    clmm: dict | None = None,
+) -> dict:
+    """{"depth_2pct_usd", "up_usd", "down_usd", "pools", "clmm_pools", "slot"} for `token_mint`'s pools."""
+    pools = sorted(
+        (p for p in pairs if (_num((p.get("liquidity") or {}).get("usd")) or 0) >= MIN_POOL_LIQUIDITY_USD),
+        key=lambda p: -_num(p["liquidity"]["usd"]),
+    )[:TOP_POOLS]
+    states = (clmm or {}).get("pools") or {}
+
+    # Columns: USD of TRUMP (t) and of the other token (o) each pool trades against.
+    t_col, o_col, virtual = [], [], 0
+    for p in pools:
+        liq = p.get("liquidity") or {}
+        usd = _num(liq.get("usd"))
+        state = states.get(p.get("pairAddress"))
+        v = _virtual_usd(state, token_mint, decimals, price_usd) if state and price_usd else None
+        if v is not None:
+            t_col.append(v)
+            o_col.append(v)
+            virtual += 1
+            continue
+        base_is_token = (p.get("baseToken") or {}).get("address") == token_mint
+        base_usd = (_num(liq.get("base")) or 0) * (_num(p.get("priceUsd")) or 0)
+        if not 0 < base_usd < usd:
+            base_usd = usd / 2
+        t_col.append(base_usd if base_is_token else usd - base_usd)
+        o_col.append(usd - base_usd if base_is_token else base_usd)
+
+    if not pools:
+        return {"depth_2pct_usd": None, "up_usd": None, "down_usd": None, "pools": 0, "clmm_pools": 0, "slot": None}
+    up = sum(o * UP_FACTOR for o in o_col)
+    down = sum(t * DOWN_FACTOR for t in t_col)
+    return {
+        "depth_2pct_usd": round(up + down, 2),
+        "up_usd": round(up, 2),
+        "down_usd": round(down, 2),
+        "pools": len(pools),
+        "clmm_pools": virtual,
+        "slot": (clmm or {}).get("slot") if virtual else None,
+    }
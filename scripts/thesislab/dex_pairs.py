@@ -0,0 +1,126 @@
+"""Aggregation of every DexScreener pair of the token (instead of pairs[0]).
+
+Each pair is priced in USD per TRUMP (priceUsd when TRUMP is the base token,
+priceUsd / priceNative when it is the quote; the 24h change is inverted
+likewise), then rejected when
+
+    thin      liquidity below MIN_POOL_LIQUIDITY_USD (or missing)
+    outlier   price more than PRICE_OUTLIER_PCT away from the
+              liquidity-weighted median price of the non-thin pairs
+
+The accepted pairs give the liquidity-weighted price and 24h price change,
+summed liquidity/volume/buys/sells and a per-DEX breakdown. Every pair, kept
+or not, goes into a compact table for the snapshot:
+
+    {"columns": PAIR_COLUMNS, "rows": [[...], ...], "rejected": n}
+"""
+
+from __future__ import annotations
+
+MIN_POOL_LIQUIDITY_USD = 1_000.0
+PRICE_OUTLIER_PCT = 0.10
+PAIR_COLUMNS = [
+    "pair", "dex", "quote", "liquidity_usd", "price_usd", "volume_24h_usd",
+    "buys_24h", "sells_24h", "price_change_24h_pct", "status",
+]
+
+
+def _num(v) -> float | None:
+    try:
+        return float(v) if v is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def token_price(pair: dict, token_mint: str) -> float | None:
+    """USD price of `token_mint` implied by one pair."""
+    price_usd = _num(pair.get("priceUsd"))
+    if price_usd is None:
+        return None
+    if (pair.get("baseToken") or {}).get("address") == token_mint:
+        return price_usd
+    native = _num(pair.get("priceNative"))
+    return price_usd / native if native else None
+
+
+def token_change_pct(pair: dict, token_mint: str) -> float | None:
+    """24h price change of `token_mint` in one pair (DexScreener reports it for the base token)."""
+    change = _num((pair.get("priceChange") or {}).get("h24"))
+    if change is None or (pair.get("baseToken") or {}).get("address") == token_mint:
+        return change
+    return (1 / (1 + change / 100) - 1) * 100 if change > -100 else None
+
+
+def weighted_median(values: list[float], weights: list[float]) -> float | None:
+    pairs = sorted(zip(values, weights))
+    half = sum(weights) / 2
+    acc = 0.0
+    for v, w in pairs:
+        acc += w
+        if acc >= half:
+            return v
+    return None
+
+
+def aggregate(pairs: list[dict], token_mint: str) -> dict:
+    """Aggregates of the accepted pairs plus the per-pair table (see module docstring)."""
+    rows = []
+    for p in pairs:
+        h24 = (p.get("txns") or {}).get("h24") or {}
+        rows.append({
+            "pair": p.get("pairAddress"),
+            "dex": p.get("dexId"),
+            "quote": ((p.get("quoteToken") if (p.get("baseToken") or {}).get("address") == token_mint
+                       else p.get("baseToken")) or {}).get("symbol"),
+            "liquidity_usd": _num((p.get("liquidity") or {}).get("usd")),
+            "price_usd": token_price(p, token_mint),
+            "volume_24h_usd": _num((p.get("volume") or {}).get("h24")),
+            "buys_24h": _num(h24.get("buys")),
+            "sells_24h": _num(h24.get("sells")),
+            "price_change_24h_pct": token_change_pct(p, token_mint),
+            "fdv": _num(p.get("fdv")),
+            "raw": p,
+        })
+
+    for r in rows:
+        r["status"] = "ok" if (r["liquidity_usd"] or 0) >= MIN_POOL_LIQUIDITY_USD and r["price_usd"] else "thin"
+    liquid = [r for r in rows if r["status"] == "ok"]
+    median = weighted_median([r["price_usd"] for r in liquid], [r["liquidity_usd"] for r in liquid]) if liquid else None
+    for r in liquid:
+        if abs(r["price_usd"] / median - 1) > PRICE_OUTLIER_PCT:
+            r["status"] = "outlier"
+    kept = [r for r in rows if r["status"] == "ok"]
+
+    liquidity = sum(r["liquidity_usd"] for r in kept)
+    changes = [r for r in kept if r["price_change_24h_pct"] is not None]
+    change_w = sum(r["liquidity_usd"] for r in changes)
+    counted = [r for r in kept if r["buys_24h"] is not None and r["sells_24h"] is not None]
+    by_dex: dict[str, dict] = {}
+    for r in kept:
+        d = by_dex.setdefault(r["dex"] or "unknown", {"pairs": 0, "liquidity_usd": 0.0, "volume_24h_usd": 0.0, "buys_24h": 0, "sells_24h": 0})
+        d["pairs"] += 1
+        d["liquidity_usd"] += r["liquidity_usd"]
+        d["volume_24h_usd"] += r["volume_24h_usd"] or 0.0
+        d["buys_24h"] += int(r["buys_24h"] or 0)
+        d["sells_24h"] += int(r["sells_24h"] or 0)
+    for d in by_dex.values():
+        d["liquidity_usd"] = round(d["liquidity_usd"], 2)
+        d["volume_24h_usd"] = round(d["volume_24h_usd"], 2)
+
+    top = max(kept, key=lambda r: r["liquidity_usd"]) if kept else None
+    return {
+        "price_usd": round(sum(r["price_usd"] * r["liquidity_usd"] for r in kept) / liquidity, 8) if kept else None,
+        "liquidity_usd": round(liquidity, 2) if kept else None,
+        "fdv_usd": top["fdv"] if top else None,
+        "volume_24h_usd": round(sum(r["volume_24h_usd"] or 0.0 for r in kept), 2) if kept else None,
+        "buys_24h": sum(r["buys_24h"] for r in counted) if counted else None,
+        "sells_24h": sum(r["sells_24h"] for r in counted) if counted else None,
+        "price_change_24h_pct": round(sum(r["price_change_24h_pct"] * r["liquidity_usd"] for r in changes) / change_w, 4) if change_w else None,
+        "by_dex": by_dex,
+        "accepted": [r["raw"] for r in kept],
+        "table": {
+            "columns": PAIR_COLUMNS,
+            "rows": [[round(r[c], 8) if isinstance(r[c], float) else r[c] for c in PAIR_COLUMNS] for r in rows],
+            "rejected": len(rows) - len(kept),
+        },
+    }
@@ -0,0 +1,46 @@
+"""Deferred imports for heavy optional dependencies.
+
+    yf = lazy_import("yfinance")   # nothing imported yet
+    yf.download(...)               # imported here, on first attribute access
+
+Measure the effect with scripts/bench_import_time.py.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+
+
+class LazyModule:
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__dict__["_name"])
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module {self.__dict__['_name']!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
+
+
+def is_loaded(name: str) -> bool:
+    """True if `name` has really been imported in this process."""
+    return name in sys.modules
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Macro quote service shared by generate_report.py and daily_cio_briefing.py.
+
+All macro symbols are fetched in one batched yfinance download; any symbol the
+batch could not price is retried individually on a thread pool. Successful
+quotes are cached on disk (data/cache/macro_quotes.json) with a TTL, so the two
+report scripts running back-to-back share one round-trip.
+
+Failure isolation: a symbol that cannot be priced degrades to
+{"price": None, "change_pct": None} (rendered as N/A) without affecting others.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from thesislab import telemetry
+from thesislab.lazy import lazy_import
+
+yf = lazy_import("yfinance")
+
+ROOT = Path(__file__).resolve().parents[2]
+CACHE_PATH = ROOT / "data" / "cache" / "macro_quotes.json"
+CACHE_TTL_S = 15 * 60
+
+MACRO_SYMBOLS = {
+    "S&P 500": "^GSPC",
+    "Nasdaq": "^IXIC",
+    "DXY": "DX-Y.NYB",
+    "US10Y": "^TNX",
+    "Gold": "GC=F",
+    "Crude": "CL=F",
+}
+
+_NA = {"price": None, "change_pct": None}
+
+
+def _quote_from_closes(closes) -> dict:
+    """Last close and change vs the previous close (NaN rows skipped)."""
+    vals = [float(v) for v in closes if v is not None and v == v]
+    if not vals:
+        return dict(_NA)
+    close = vals[-1]
+    prev = vals[-2] if len(vals) > 1 else None
+    chg = ((close - prev) / prev * 100) if prev else None
+    return {"price": close, "change_pct": chg}
+
+
+def _fetch_single(symbol: str) -> dict:
+    """Fetch 2d daily close via yfinance.
+
+    Fail-safe: yfinance sometimes returns nonstandard payloads (e.g. missing 'chart'),
+    which previously crashed the whole report build. We degrade to N/A instead.
+    """
+    try:
+        h = yf.Ticker(symbol).history(period="2d", interval="1d")
+        if getattr(h, "empty", True):
+            return dict(_NA)
+        return _quote_from_closes(h["Close"].tolist())
+    except Exception:
+        return dict(_NA)
+
+
+def _fetch_batch(symbols: list[str]) -> dict:
+    """One download for all symbols; 5d so every calendar yields two closes."""
+    out = {}
+    try:
+        df = yf.download(
+            symbols, period="5d", interval="1d", group_by="ticker",
+            threads=True, progress=False,
+        )
+    except Exception:
+        return out
+    if df is None or getattr(df, "empty", True):
+        return out
+    for sym in symbols:
+        try:
+            out[sym] = _quote_from_closes(df[sym]["Close"].tolist())
+        except Exception:
+            continue
+    return out
+
+
+def _load_cache(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+def _save_cache(cache: dict, path: Path) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(cache, indent=2) + "\n", encoding="utf-8")
+        tmp.replace(path)
+    except OSError:
+        pass
+
+
+def get_macro_quotes(symbols: dict | None = None, ttl_s: int = CACHE_TTL_S, cache_path: Path = CACHE_PATH) -> tuple[dict, dict]:
+    """Return ({label: quote}, metrics) for the macro panel.
+
+    metrics: elapsed_s, cache_hits, batched, retried (per-symbol fallback) and
+    failed (symbols left at N/A).
+    """
+    symbols = symbols or MACRO_SYMBOLS
+    started = time.perf_counter()
+    now = time.time()
+
+    cache = _load_cache(cache_path)
+    quotes = {}
+    for sym in symbols.values():
+        hit = cache.get(sym)
+        if hit and now - hit.get("fetched_at", 0) <= ttl_s:
+            quotes[sym] = {"price": hit.get("price"), "change_pct": hit.get("change_pct")}
+    cache_hits = len(quotes)
+
+    missing = [s for s in symbols.values() if s not in quotes]
+    batched = _fetch_batch(missing) if missing else {}
+    quotes.update({s: q for s, q in batched.items() if q["price"] is not None})
+
+    retry = [s for s in missing if s not in quotes]
+    if retry:
+        with ThreadPoolExecutor(max_workers=len(retry)) as pool:
+            for sym, q in zip(retry, pool.map(_fetch_single, retry)):
+                quotes[sym] = q
+
+    fetched = [s for s in missing if quotes[s]["price"] is not None]
+    for sym in fetched:
+        cache[sym] = dict(quotes[sym], fetched_at=now)
+    if fetched:
+        _save_cache(cache, cache_path)
+
+    telemetry.incr("cache_hits", cache_hits)
+    telemetry.incr("retries", len(retry))
+    metrics = {
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "cache_hits": cache_hits,
+        "batched": len([s for s in batched if batched[s]["price"] is not None]),
+        "retried": len(retry),
+        "failed": [s for s in symbols.values() if quotes[s]["price"] is None],
+    }
+    return {label: quotes[sym] for label, sym in symbols.items()}, metrics
+
+
+def offline_quotes(symbols: dict | None = None) -> dict:
+    """N/A quotes for every label, for --offline runs."""
+    return {label: dict(_NA) for label in (symbols or MACRO_SYMBOLS)}
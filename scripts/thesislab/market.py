@@ -0,0 +1,83 @@
+"""Crypto market fetchers and formatting shared by the CIO report scripts."""
+
+from __future__ import annotations
+
+from thesislab.lazy import lazy_import
+
+requests = lazy_import("requests")
+
+COINGECKO_SIMPLE_PRICE_URL = "https://api.coingecko.com/api/v3/simple/price"
+FEAR_GREED_URL = "https://api.alternative.me/fng/"
+
+
+def pct(v):
+    return "N/A" if v is None else f"{v:+.2f}%"
+
+
+def fmt_price(q):
+    p = q.get("price")
+    return "N/A" if p is None else f"{p:.2f}"
+
+
+# (display label, macro_quotes label), in report order.
+MACRO_DISPLAY = (
+    ("S&P 500", "S&P 500"),
+    ("Nasdaq", "Nasdaq"),
+    ("DXY", "DXY"),
+    ("US10Y", "US10Y"),
+    ("Gold", "Gold"),
+    ("Crude Oil", "Crude"),
+)
+
+
+def fmt_quote(label, q):
+    return f"{label}: {fmt_price(q)} ({pct(q['change_pct'])})"
+
+
+def macro_lines(macro):
+    return [fmt_quote(label, macro[key]) for label, key in MACRO_DISPLAY]
+
+
+def crypto_lines(btc, eth, fg):
+    return [
+        f"BTC: ${fmt_price(btc)} ({pct(btc['change_pct'])})",
+        f"ETH: ${fmt_price(eth)} ({pct(eth['change_pct'])})",
+        f"Fear & Greed: {fg['value']} ({fg['classification']})",
+    ]
+
+
+def get_coingecko_prices():
+    params = {
+        "ids": "bitcoin,ethereum",
+        "vs_currencies": "usd",
+        "include_24hr_change": "true",
+    }
+    r = requests.get(COINGECKO_SIMPLE_PRICE_URL, params=params, timeout=20)
+    r.raise_for_status()
+    d = r.json()
+    return {
+        "btc": {
+            "price": d.get("bitcoin", {}).get("usd"),
+            "change_pct": d.get("bitcoin", {}).get("usd_24h_change"),
+        },
+        "eth": {
+            "price": d.get("ethereum", {}).get("usd"),
+            "change_pct": d.get("ethereum", {}).get("usd_24h_change"),
+        },
+    }
+
+
+def get_fear_greed():
+    r = requests.get(FEAR_GREED_URL, timeout=20)
+    r.raise_for_status()
+    d = r.json().get("data", [{}])[0]
+    return {
+        "value": d.get("value"),
+        "classification": d.get("value_classification"),
+    }
+
+
+def offline_crypto():
+    """Placeholders for --offline runs (rendered as N/A)."""
+    na = {"price": None, "change_pct": None}
+    return {"btc": dict(na), "eth": dict(na)}, {"value": "N/A", "classification": "offline"}
@@ -0,0 +1,116 @@
+"""Format-neutral report layout: sections are lists of blocks, rendered to Markdown or HTML.
+
+Section builders return blocks (Heading, Bullets, Para, Rule) computed from a
+ReportData; static sections are built once and cached with @static_section.
+Renderers walk the same block list, so every output format of a report
+comes from one pass over one dataset.
+
+Markdown layout rule: blocks are separated by a blank line, except directly
+after a heading, which is followed by a blank line only if `gap` is set.
+"""
+
+from __future__ import annotations
+
+import functools
+import html
+import re
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Heading:
+    level: int
+    text: str
+    gap: bool = False
+
+
+@dataclass(frozen=True)
+class Bullets:
+    items: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Para:
+    lines: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Rule:
+    pass
+
+
+def bullets(*items: str) -> Bullets:
+    return Bullets(tuple(items))
+
+
+def para(*lines: str) -> Para:
+    return Para(tuple(lines))
+
+
+def static_section(fn):
+    """Cache a section builder that takes no data: its blocks are built once per process."""
+
+    @functools.wraps(fn)
+    @functools.lru_cache(maxsize=None)
+    def cached():
+        return tuple(fn())
+
+    return cached
+
+
+@functools.lru_cache(maxsize=4096)
+def _md_block(block) -> str:
+    if isinstance(block, Heading):
+        return f"{'#' * block.level} {block.text}"
+    if isinstance(block, Bullets):
+        return "\n".join(f"- {item}" for item in block.items)
+    if isinstance(block, Para):
+        return "\n".join(block.lines)
+    if isinstance(block, Rule):
+        return "---"
+    raise TypeError(f"unknown block {block!r}")
+
+
+def to_markdown(blocks) -> str:
+    out = []
+    prev = None
+    for block in blocks:
+        if prev is not None and not (isinstance(prev, Heading) and not prev.gap):
+            out.append("")
+        out.append(_md_block(block))
+        prev = block
+    return "\n".join(out) + "\n"
+
+
+_LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+_CODE_RE = re.compile(r"`([^`]+)`")
+
+
+def _inline_html(text: str) -> str:
+    s = html.escape(text, quote=False)
+    s = _LINK_RE.sub(lambda m: f'<a href="{html.escape(m.group(2))}">{m.group(1)}</a>', s)
+    s = _BOLD_RE.sub(r"<strong>\1</strong>", s)
+    return _CODE_RE.sub(r"<code>\1</code>", s)
+
+
+@functools.lru_cache(maxsize=4096)
+def _html_block(block) -> str:
+    if isinstance(block, Heading):
+        return f"<h{block.level}>{_inline_html(block.text)}</h{block.level}>"
+    if isinstance(block, Bullets):
+        items = "".join(f"<li>{_inline_html(item)}</li>" for item in block.items)
+        return f"<ul>{items}</ul>"
+    if isinstance(block, Para):
+        return f"<p>{'<br>'.join(_inline_html(line) for line in block.lines)}</p>"
+    if isinstance(block, Rule):
+        return "<hr>"
+    raise TypeError(f"unknown block {block!r}")
+
+
+def to_html(blocks, title: str = "") -> str:
+    body = "\n".join(_html_block(b) for b in blocks)
+    return (
+        "<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>{html.escape(title)}</title>\n</head>\n<body>\n{body}\n</body>\n</html>\n"
+    )
@@ -0,0 +1,125 @@
+"""Record/replay of report upstream calls.
+
+Every upstream the CIO report touches (CoinGecko, alternative.me, yfinance
+macro quotes, the Binance/OKX/Bitget venue scripts, the Node derivatives
+panel and the local timeseries row) goes through `call(name, fn, *args)`.
+
+- No session: `fn(*args)` is simply called.
+- record: the call runs for real; its JSON result (or error) and latency
+  are appended to the session under `name`.
+- replay: the next recorded result for `name` is returned after sleeping
+  `elapsed_s * latency_scale` (0 = pure CPU); recorded errors are re-raised.
+
+A session is saved as one pretty-printed, key-sorted JSON bundle so two
+recordings can be diffed, and it is small enough to keep as a CI fixture:
+
+    {"version": 1, "recorded_at": ..., "meta": {...}, "calls": {name: [{"elapsed_s", "result" | "error"}]}}
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import time
+from pathlib import Path
+
+BUNDLE_VERSION = 1
+BUNDLE_NAME = "bundle.json"
+
+
+class ReplayError(RuntimeError):
+    """A recorded upstream failure, or a call that is missing from the bundle."""
+
+
+class Session:
+    def __init__(self, mode: str, path: Path, latency_scale: float = 1.0):
+        self.mode = mode
+        self.path = Path(path)
+        self.latency_scale = latency_scale
+        self.calls: dict[str, list[dict]] = {}
+        self.meta: dict = {}
+        self.recorded_at = None
+        self._cursor: dict[str, int] = {}
+
+    @property
+    def bundle_path(self) -> Path:
+        return self.path / BUNDLE_NAME if self.path.suffix != ".json" else self.path
+
+    def load(self) -> "Session":
+        data = json.loads(self.bundle_path.read_text(encoding="utf-8"))
+        if data.get("version") != BUNDLE_VERSION:
+            raise ReplayError(f"unsupported bundle version {data.get('version')!r} in {self.bundle_path}")
+        self.calls = data.get("calls") or {}
+        self.meta = data.get("meta") or {}
+        self.recorded_at = data.get("recorded_at")
+        return self
+
+    def save(self) -> Path:
+        path = self.bundle_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        body = {
+            "version": BUNDLE_VERSION,
+            "recorded_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+            "meta": self.meta,
+            "calls": self.calls,
+        }
+        path.write_text(json.dumps(body, ensure_ascii=False, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        return path
+
+    def record(self, name: str, fn, *args):
+        t0 = time.perf_counter()
+        entry: dict = {}
+        try:
+            result = fn(*args)
+            entry["result"] = result
+            return result
+        except Exception as e:
+            entry["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            entry["elapsed_s"] = round(time.perf_counter() - t0, 4)
+            self.calls.setdefault(name, []).append(entry)
+
+    def replay(self, name: str):
+        entries = self.calls.get(name) or []
+        i = self._cursor.get(name, 0)
+        if i >= len(entries):
+            raise ReplayError(f"no recorded call #{i + 1} for {name!r} in {self.bundle_path}")
+        self._cursor[name] = i + 1
+        entry = entries[i]
+        if self.latency_scale > 0:
+            time.sleep(entry.get("elapsed_s", 0) * self.latency_scale)
+        if "error" in entry:
+            raise ReplayError(entry["error"])
+        return entry.get("result")
+
+
+_session: Session | None = None
+
+
+def start(mode: str, path: Path, latency_scale: float = 1.0) -> Session:
+    """Activate a record or replay session for this process."""
+    global _session
+    if mode not in ("record", "replay"):
+        raise ValueError(f"unknown replay mode {mode!r}")
+    _session = Session(mode, path, latency_scale)
+    if mode == "replay":
+        _session.load()
+    return _session
+
+
+def stop() -> None:
+    global _session
+    _session = None
+
+
+def active() -> Session | None:
+    return _session
+
+
+def call(name: str, fn, *args):
+    if _session is None:
+        return fn(*args)
+    if _session.mode == "record":
+        return _session.record(name, fn, *args)
+    return _session.replay(name)
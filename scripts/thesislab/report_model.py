@@ -0,0 +1,274 @@
+"""Typed data model for the CIO reports, and the shared market gathering step.
+
+Data is gathered once into a ReportData; renderers (thesislab/render.py and
+the section builders in generate_report.py / daily_cio_briefing.py) only
+read from it. A ReportData round-trips through the JSON sidecar, so a report
+can be re-rendered from a fixed dataset without touching the network.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from thesislab import macro_quotes, replay, telemetry
+from thesislab.market import get_coingecko_prices, get_fear_greed, offline_crypto
+
+ROOT = Path(__file__).resolve().parents[2]
+TS_PATH = ROOT / "data" / "timeseries.jsonl"
+MARKET_SOURCES = ("macro", "coingecko", "fear_greed")
+
+
+def _pct_or_none(v):
+    return round(v * 100, 2) if isinstance(v, (int, float)) else None
+
+
+def latest_timeseries_row(path: Path = TS_PATH) -> dict | None:
+    if not path.exists():
+        return None
+    lines = [x for x in path.read_text(encoding="utf-8").splitlines() if x.strip()]
+    if not lines:
+        return None
+    return json.loads(lines[-1])
+
+
+def _succeeded(result) -> bool:
+    """Fetchers swallow their own errors: empty, None-first tuples and {"error"} dicts are failures."""
+    if isinstance(result, tuple):
+        result = result[0] if result else None
+    if isinstance(result, dict) and ("error" in result or result.get("status", "ok") != "ok"):
+        return False
+    return bool(result)
+
+
+def timed(sources: dict, name: str, fn, *args):
+    """Call fn(*args), recording its latency and outcome under sources[name] and in telemetry."""
+    t0 = time.perf_counter()
+    status = "failed"
+    try:
+        with telemetry.span(f"upstream.{name}") as mark:
+            result = replay.call(name, fn, *args)
+            if _succeeded(result):
+                status = "ok"
+            else:
+                mark["status"] = "error"
+        return result
+    finally:
+        sources[name] = {"status": status, "elapsed_s": round(time.perf_counter() - t0, 3)}
+
+
+@dataclass
+class LocalState:
+    """Latest data/timeseries.jsonl row, as used by the reports."""
+
+    price_usd: float | None = None
+    top10_holder_pct: float | None = None
+    bull: float | None = None
+    base: float | None = None
+    stress: float | None = None
+    buy_sell_txn_ratio_24h: float | None = None
+    risk_flags: list[str] = field(default_factory=list)
+    triggers: dict[str, str] = field(default_factory=dict)
+    available: bool = False
+
+    @classmethod
+    def from_row(cls, row: dict | None) -> "LocalState":
+        if not row:
+            return cls()
+        probs = row.get("scenario_probabilities", {})
+        return cls(
+            price_usd=row.get("price_usd"),
+            top10_holder_pct=row.get("top10_holder_pct"),
+            bull=probs.get("Bull"),
+            base=probs.get("Base"),
+            stress=probs.get("Stress"),
+            buy_sell_txn_ratio_24h=row.get("buy_sell_txn_ratio_24h"),
+            risk_flags=row.get("risk_flags", []),
+            triggers=row.get("triggers") or {},
+            available=True,
+        )
+
+
+@dataclass
+class DerivativesPanel:
+    """The slice of the Node derivatives panel that the report shows."""
+
+    open_interest: list[dict] = field(default_factory=list)
+    funding_rates: list[dict] = field(default_factory=list)
+    taker_buy_sell_ratio_4h: float | None = None
+
+    @classmethod
+    def from_panel(cls, panel: dict | None) -> "DerivativesPanel | None":
+        if not panel or not isinstance(panel, dict):
+            return None
+        oi_list = panel.get("open_interest") or []
+        funding_list = panel.get("funding_rates") or []
+        taker_list = panel.get("taker_buy_sell") or []
+        out = cls()
+        if isinstance(oi_list, list):
+            out.open_interest = [
+                {"exchange": x.get("exchange", "?"), "oi_usd": x.get("oi_usd"), "oi_quantity": x.get("oi_quantity")}
+                for x in oi_list[:3]
+            ]
+        if isinstance(funding_list, list):
+            out.funding_rates = [
+                {"exchange": x.get("exchange", "?"), "funding_rate": x.get("funding_rate")}
+                for x in funding_list[:3]
+            ]
+        if isinstance(taker_list, list) and taker_list:
+            ratio = taker_list[-1].get("buy_sell_ratio")
+            if isinstance(ratio, (int, float)):
+                out.taker_buy_sell_ratio_4h = ratio
+        return out
+
+
+@dataclass
+class MarketData:
+    """Macro quotes, BTC/ETH and Fear & Greed, shared by both reports."""
+
+    macro: dict
+    btc: dict
+    eth: dict
+    fear_greed: dict
+    sources: dict = field(default_factory=dict)
+
+
+@dataclass
+class ReportData:
+    date: str
+    generated_at: str
+    offline: bool
+    market: MarketData
+    local: LocalState
+    derivatives: DerivativesPanel | None = None
+    binance: dict | None = None
+    okx: dict | None = None
+    bitget: dict | None = None  # {"tx_stats": ..., "security": ...}
+
+    @property
+    def sources(self) -> dict:
+        return self.market.sources
+
+    @property
+    def adverse_signals(self) -> list[str]:
+        adverse = []
+        buy_sell = self.local.buy_sell_txn_ratio_24h
+        conc = self.local.top10_holder_pct
+        if isinstance(buy_sell, (int, float)) and buy_sell < 1.0:
+            adverse.append(f"Seller-dominant transaction flow (buy/sell={buy_sell:.4f})")
+        if isinstance(conc, (int, float)) and conc >= 90:
+            adverse.append(f"Very high concentration (top10_holder_pct={conc:.2f}%)")
+        return adverse
+
+    @property
+    def confidence(self) -> str:
+        bull = self.local.bull
+        return "medium-high" if isinstance(bull, (int, float)) and bull >= 0.45 else "medium"
+
+    @property
+    def trigger_states(self) -> dict[str, str]:
+        """Falsification trigger states of the local row (missing, e.g. rows before the trigger engine: blind)."""
+        return {name: self.local.triggers.get(name, "blind") for name in ("A", "B", "C")}
+
+    @property
+    def using_proxy(self) -> bool:
+        return any(flag in self.local.risk_flags for flag in ("using_heuristic_proxy", "using_moralis_enhanced_proxy"))
+
+    def section_status(self) -> dict:
+        def _status(ok):
+            return {"status": "skipped" if self.offline else ("ok" if ok else "unavailable")}
+
+        return {
+            "macro": _status(any(q.get("price") is not None for q in self.market.macro.values())),
+            "crypto": _status(self.market.btc.get("price") is not None),
+            "derivatives": _status(self.derivatives is not None),
+            "local_radar": {"status": "ok" if self.local.available else "unavailable"},
+            "binance": _status(self.binance is not None),
+            "okx": _status(self.okx is not None),
+            "bitget": _status(self.bitget is not None),
+            # Social section removed by design (source instability).
+            "social": {"status": "omitted"},
+        }
+
+    def to_sidecar(self) -> dict:
+        """Payload for thesislab.report_sidecar.write_sidecar."""
+        local = self.local
+        return {
+            "date": self.date,
+            "generated_at": self.generated_at,
+            "offline": self.offline,
+            "metrics": {
+                "price_usd": local.price_usd,
+                "top10_holder_pct": local.top10_holder_pct,
+                "bull_pct": _pct_or_none(local.bull),
+                "base_pct": _pct_or_none(local.base),
+                "stress_pct": _pct_or_none(local.stress),
+                "buy_sell_txn_ratio_24h": local.buy_sell_txn_ratio_24h,
+                "risk_flags": local.risk_flags,
+                "confidence": self.confidence,
+                "adverse_signals": self.adverse_signals,
+                "concentration_quality": "model-estimated" if self.using_proxy else "direct",
+                "macro": self.market.macro,
+                "btc": self.market.btc,
+                "eth": self.market.eth,
+                "fear_greed": self.market.fear_greed,
+                "derivatives": asdict(self.derivatives) if self.derivatives else None,
+                "binance": self.binance,
+                "okx": self.okx,
+                "bitget": self.bitget,
+                "local": asdict(local),
+            },
+            "sections": self.section_status(),
+            "triggers": self.trigger_states,
+            "sources": self.sources,
+        }
+
+    @classmethod
+    def from_sidecar(cls, sidecar: dict) -> "ReportData":
+        m = sidecar.get("metrics") or {}
+        deriv = m.get("derivatives")
+        return cls(
+            date=sidecar["date"],
+            generated_at=sidecar.get("generated_at", ""),
+            offline=bool(sidecar.get("offline")),
+            market=MarketData(
+                macro=m.get("macro") or {},
+                btc=m.get("btc") or {},
+                eth=m.get("eth") or {},
+                fear_greed=m.get("fear_greed") or {},
+                sources=sidecar.get("sources") or {},
+            ),
+            local=LocalState(**(m.get("local") or {})),
+            derivatives=DerivativesPanel(**deriv) if deriv else None,
+            binance=m.get("binance"),
+            okx=m.get("okx"),
+            bitget=m.get("bitget"),
+        )
+
+
+def gather_market(offline: bool = False) -> MarketData:
+    """Fetch macro quotes, BTC/ETH and Fear & Greed (or N/A placeholders offline)."""
+    if offline:
+        cg, fg = offline_crypto()
+        return MarketData(
+            macro=macro_quotes.offline_quotes(),
+            btc=cg["btc"],
+            eth=cg["eth"],
+            fear_greed=fg,
+            sources={name: {"status": "skipped", "elapsed_s": 0.0} for name in MARKET_SOURCES},
+        )
+
+    sources: dict = {}
+    macro, macro_metrics = timed(sources, "macro", macro_quotes.get_macro_quotes)
+    if macro_metrics["failed"]:
+        sources["macro"]["status"] = "failed" if len(macro_metrics["failed"]) == len(macro) else "partial"
+    print(
+        f"Macro quotes: {macro_metrics['elapsed_s']:.2f}s "
+        f"(cache {macro_metrics['cache_hits']}, batch {macro_metrics['batched']}, "
+        f"retried {macro_metrics['retried']}, failed {len(macro_metrics['failed'])})"
+    )
+    cg = timed(sources, "coingecko", get_coingecko_prices)
+    fg = timed(sources, "fear_greed", get_fear_greed)
+    return MarketData(macro=macro, btc=cg["btc"], eth=cg["eth"], fear_greed=fg, sources=sources)
@@ -0,0 +1,57 @@
+"""Machine-readable companion to each CIO report.
+
+generate_report.py writes `{date}-CIO-Report.json` next to the Markdown
+report. Consumers (hub, guards, health report) read these fields instead of
+scraping the rendered text:
+
+    schema_version  int, bumped on incompatible changes
+    date            report date (UTC+8), matches the Markdown file name
+    generated_at    ISO timestamp
+    offline         True if rendered without network fetches
+    metrics         every number shown in the report (None when unavailable)
+    sections        {name: {"status": "ok" | "unavailable" | "skipped" | "omitted" | "no_fresh"}}
+    triggers        {"A" | "B" | "C": "not_confirmed" | "confirmed" | "blind"}
+    sources         {name: {"status": "ok" | "failed" | "skipped", "elapsed_s": float}}
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+SCHEMA_VERSION = 1
+REPORT_GLOB = "*-CIO-Report.md"
+
+
+def sidecar_path(report_md: Path) -> Path:
+    return report_md.with_suffix(".json")
+
+
+def write_sidecar(report_md: Path, payload: dict) -> Path:
+    path = sidecar_path(report_md)
+    body = {"schema_version": SCHEMA_VERSION, **payload}
+    path.write_text(json.dumps(body, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return path
+
+
+def load_sidecar(report_md: Path) -> dict | None:
+    """Sidecar for `report_md`, or None if missing, unreadable or from a newer schema."""
+    path = sidecar_path(report_md)
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(data, dict) or data.get("schema_version", 0) > SCHEMA_VERSION:
+        return None
+    return data
+
+
+def section_status(sidecar: dict, name: str) -> str | None:
+    return ((sidecar.get("sections") or {}).get(name) or {}).get("status")
+
+
+def latest_report(report_dir: Path) -> Path | None:
+    files = sorted(report_dir.glob(REPORT_GLOB))
+    return files[-1] if files else None
@@ -0,0 +1,188 @@
+"""Latency-aware Solana JSON-RPC endpoint pool.
+
+Each endpoint keeps an exponentially weighted latency and error rate
+(EWMA_ALPHA), persisted in data/rpc_pool.json so the next run starts from
+what the last one learned. Endpoints are tried best-first:
+
+    score = latency_ewma_s * (1 + ERROR_PENALTY * error_rate)
+
+endpoints whose error rate is above UNHEALTHY_ERROR_RATE, or whose circuit
+(thesislab/circuit.py) is open, go to the back. An endpoint that was never
+called is tried first once, so every endpoint gets measured; probe matrix
+results (debug_onchain_sources.py) count as that first sample. The per-request timeout follows the endpoint's latency
+(TIMEOUT_FACTOR x, clamped to MIN/MAX_TIMEOUT_S) instead of a flat 25s.
+
+    pool = RpcPool(SOLANA_RPC_URLS)
+    pool.call("getSlot", [])                        # best endpoint, fail over
+    pool.call("getSlot", [], race=True)             # top two in parallel, first answer wins
+    pool.batch([("getTokenSupply", [mint]), ...])   # one HTTP round-trip
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from thesislab import circuit, source_matrix, telemetry
+
+ROOT = Path(__file__).resolve().parents[2]
+STATE_PATH = ROOT / "data" / "rpc_pool.json"
+
+EWMA_ALPHA = 0.3
+ERROR_PENALTY = 4.0
+UNHEALTHY_ERROR_RATE = 0.5
+DEFAULT_LATENCY_S = 1.0
+TIMEOUT_FACTOR = 4.0
+MIN_TIMEOUT_S = 3.0
+MAX_TIMEOUT_S = 25.0
+USER_AGENT = "trump-thesis-lab/3.3"
+
+
+class RpcError(RuntimeError):
+    """Every endpoint failed (or was skipped) for a request."""
+
+
+class RpcPool:
+    def __init__(self, urls: list[str], path: Path = STATE_PATH):
+        self.urls = list(urls)
+        self.path = path
+        self.stats: dict[str, dict] = {}
+        self.lock = threading.Lock()
+        self.dirty = False
+        if path.exists():
+            try:
+                self.stats = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                self.stats = {}
+        matrix = source_matrix.load()
+        for r in (matrix or {}).get("sources") or []:
+            if r.get("group") == "solana-rpc" and r.get("name") in self.urls and r["name"] not in self.stats:
+                self.stats[r["name"]] = {
+                    "latency_ewma_s": r.get("latency_s") or MAX_TIMEOUT_S,
+                    "error_rate": 0.0 if r.get("ok") else 1.0,
+                    "n": 1,
+                }
+
+    # -- health ---------------------------------------------------------------
+
+    def _stat(self, url: str) -> dict:
+        return self.stats.get(url) or {"latency_ewma_s": DEFAULT_LATENCY_S, "error_rate": 0.0, "n": 0}
+
+    def score(self, url: str) -> float:
+        s = self._stat(url)
+        return s["latency_ewma_s"] * (1 + ERROR_PENALTY * s["error_rate"])
+
+    def timeout(self, url: str) -> float:
+        return min(MAX_TIMEOUT_S, max(MIN_TIMEOUT_S, TIMEOUT_FACTOR * self._stat(url)["latency_ewma_s"]))
+
+    def ranked(self) -> list[str]:
+        """Endpoints best-first; unhealthy or circuit-open endpoints last."""
+        breaker = circuit.breaker()
+
+        def key(url):
+            host = urllib.parse.urlsplit(url).hostname
+            bad = self._stat(url)["error_rate"] > UNHEALTHY_ERROR_RATE or breaker.state(host) == "open"
+            # Never-measured endpoints go first once, so every endpoint gets a sample.
+            return (bad, self.score(url) if self._stat(url).get("n") else 0.0)
+
+        return sorted(self.urls, key=key)
+
+    def record(self, url: str, latency_s: float | None, ok: bool, error: str | None = None) -> None:
+        with self.lock:
+            s = dict(self._stat(url))
+            if latency_s is not None:
+                prev = s["latency_ewma_s"] if s.get("n") else latency_s
+                s["latency_ewma_s"] = round((1 - EWMA_ALPHA) * prev + EWMA_ALPHA * latency_s, 4)
+            s["error_rate"] = round((1 - EWMA_ALPHA) * s["error_rate"] + EWMA_ALPHA * (0.0 if ok else 1.0), 4)
+            s["n"] = s.get("n", 0) + 1
+            s["last_error"] = None if ok else error
+            s["updated_at"] = round(time.time(), 3)
+            self.stats[url] = s
+            self.dirty = True
+
+    def save(self) -> None:
+        with self.lock:
+            if not self.dirty and self.path.exists():
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.stats, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+            tmp.replace(self.path)
+            self.dirty = False
+
+    # -- transport ------------------------------------------------------------
+
+    def _post(self, url: str, payload: bytes):
+        """One HTTP round-trip to `url`; updates the endpoint's stats and circuit."""
+        host = urllib.parse.urlsplit(url).hostname
+        breaker = circuit.breaker()
+        breaker.check(host)
+        circuit.bucket(host).acquire()
+        req = urllib.request.Request(
+            url, data=payload, headers={"Content-Type": "application/json", "User-Agent": USER_AGENT},
+        )
+        t0 = time.perf_counter()
+        try:
+            with telemetry.span(f"upstream.{host}"), urllib.request.urlopen(req, timeout=self.timeout(url)) as r:
+                body = r.read()
+            telemetry.incr("bytes_in", len(body))
+            data = json.loads(body.decode("utf-8"))
+        except Exception as e:
+            # A timeout is as slow as the timeout; other failures say nothing about latency.
+            timed_out = isinstance(e, TimeoutError) or isinstance(getattr(e, "reason", None), TimeoutError)
+            latency = time.perf_counter() - t0 if timed_out else None
+            self.record(url, latency, False, f"{type(e).__name__}: {e}")
+            breaker.failure(host, "unavailable")
+            raise
+        self.record(url, time.perf_counter() - t0, True)
+        breaker.success(host)
+        return data
+
+    def _send(self, payload: bytes, race: bool):
+        order = self.ranked()
+        errors = []
+        if race and len(order) >= 2:
+            pool = ThreadPoolExecutor(max_workers=2)
+            pending = {pool.submit(self._post, url, payload): url for url in order[:2]}
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        url = pending.pop(fut)
+                        try:
+                            return fut.result()
+                        except Exception as e:  # noqa: BLE001 - fall through to the other racer
+                            errors.append(f"{url}: {e}")
+            finally:
+                pool.shutdown(wait=False)
+            order = order[2:]
+        for url in order:
+            try:
+                return self._post(url, payload)
+            except Exception as e:  # noqa: BLE001 - fail over to the next endpoint
+                telemetry.incr("retries")
+                errors.append(f"{url}: {e}")
+        raise RpcError("; ".join(errors) or "no Solana RPC endpoint available")
+
+    def call(self, method: str, params: list, race: bool = False) -> dict:
+        """Full JSON-RPC response ({"result": ...} or {"error": ...}) for one call."""
+        payload = json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params}).encode("utf-8")
+        return self._send(payload, race)
+
+    def batch(self, calls: list[tuple[str, list]], race: bool = False) -> list[dict]:
+        """Responses for several calls sent as one JSON-RPC batch, in the order of `calls`."""
+        payload = json.dumps([
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ]).encode("utf-8")
+        resp = self._send(payload, race)
+        if not isinstance(resp, list):
+            # Some gateways answer a batch with a single error object.
+            return [resp for _ in calls]
+        by_id = {r.get("id"): r for r in resp if isinstance(r, dict)}
+        return [by_id.get(i) or {"error": {"message": "missing from batch response"}} for i in range(len(calls))]
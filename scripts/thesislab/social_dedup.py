@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Near-duplicate collapsing for social evidence (SimHash + LSH banding).
+
+Copy-pasta shill posts and quote-tweets of the same text differ only in handles,
+links or a couple of words, so exact-URL dedup lets them through. Each tweet gets
+a 64-bit SimHash over word shingles of its normalized text; tweets within
+`MAX_HAMMING` bits of each other are clustered and collapsed into the most
+engaged representative, annotated with `cluster_size`.
+
+Candidate pairs come from LSH bands: with 8 bands of 8 bits, any two signatures
+within 7 bits share at least one identical band, so only same-band buckets are
+compared and clustering stays roughly linear in the day's corpus.
+
+Signatures are cached in data/cache/simhash_cache.json (git-ignored) keyed by
+social_index.tweet_id, so re-runs only hash tweets they have not seen before.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from thesislab import social_index
+
+ROOT = Path(__file__).resolve().parents[2]
+CACHE_PATH = ROOT / "data" / "cache" / "simhash_cache.json"
+CACHE_RETENTION_DAYS = 14
+
+BITS = 64
+BANDS = 8
+BAND_BITS = BITS // BANDS
+MAX_HAMMING = 6
+SHINGLE = 2
+
+_URL_RE = re.compile(r"https?://\S+|\S+\.\S+/\S*")
+_MENTION_RE = re.compile(r"@\w+")
+_NON_WORD_RE = re.compile(r"[^\w$#]+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop links/mentions/punctuation and collapse whitespace."""
+    text = _URL_RE.sub(" ", (text or "").lower())
+    text = _MENTION_RE.sub(" ", text)
+    return " ".join(_NON_WORD_RE.sub(" ", text).split())
+
+
+def simhash(text: str) -> int | None:
+    """64-bit SimHash over word shingles (None for empty text)."""
+    tokens = text.split()
+    if not tokens:
+        return None
+    if len(tokens) < SHINGLE:
+        shingles = tokens
+    else:
+        shingles = [" ".join(tokens[i:i + SHINGLE]) for i in range(len(tokens) - SHINGLE + 1)]
+
+    weights = [0] * BITS
+    for sh in shingles:
+        h = int.from_bytes(hashlib.blake2b(sh.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+    sig = 0
+    for bit, w in enumerate(weights):
+        if w > 0:
+            sig |= 1 << bit
+    return sig
+
+
+def load_cache(path: Path = CACHE_PATH) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data.get("signatures") or {}
+    except Exception:
+        return {}
+
+
+def save_cache(signatures: dict, path: Path = CACHE_PATH) -> None:
+    if not signatures:
+        return
+    # Entries are [sig_hex, day]; keep the most recent CACHE_RETENTION_DAYS days.
+    days = sorted({v[1] for v in signatures.values() if v[1]}, reverse=True)
+    keep = set(days[:CACHE_RETENTION_DAYS])
+    pruned = {k: v for k, v in signatures.items() if not v[1] or v[1] in keep}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"signatures": pruned}, separators=(",", ":")) + "\n", encoding="utf-8")
+
+
+def signatures_for(tweets: list, cache: dict) -> list:
+    """Return per-tweet signatures (None = unclusterable), filling `cache` on misses."""
+    sigs = []
+    for t in tweets:
+        tid = social_index.tweet_id(t)
+        hit = cache.get(tid)
+        if hit is not None:
+            sigs.append(int(hit[0], 16) if hit[0] else None)
+            continue
+        sig = simhash(normalize_text(t.get("text") or ""))
+        cache[tid] = [format(sig, "016x") if sig is not None else "", str(t.get("time", ""))[:10]]
+        sigs.append(sig)
+    return sigs
+
+
+def cluster(sigs: list) -> list[list[int]]:
+    """Group indices whose signatures are within MAX_HAMMING bits (union-find)."""
+    parent = list(range(len(sigs)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    mask = (1 << BAND_BITS) - 1
+    buckets: dict[tuple[int, int], list[int]] = {}
+    first_with_sig: dict[int, int] = {}
+    for i, sig in enumerate(sigs):
+        if sig is None:
+            continue
+        # Exact copies join directly; only distinct signatures enter the bands.
+        if sig in first_with_sig:
+            parent[find(i)] = find(first_with_sig[sig])
+            continue
+        first_with_sig[sig] = i
+        for band in range(BANDS):
+            key = (band, (sig >> (band * BAND_BITS)) & mask)
+            for j in buckets.get(key, ()):
+                if find(i) != find(j) and bin(sig ^ sigs[j]).count("1") <= MAX_HAMMING:
+                    parent[find(i)] = find(j)
+            buckets.setdefault(key, []).append(i)
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(sigs)):
+        groups.setdefault(find(i), []).append(i)
+    return sorted(groups.values(), key=lambda g: g[0])
+
+
+def collapse(tweets: list, cache: dict | None = None) -> list:
+    """Collapse near-duplicate tweets into their most engaged representative.
+
+    Order follows each cluster's first occurrence; representatives of clusters
+    with more than one member are shallow copies carrying `cluster_size`.
+    """
+    if cache is None:
+        cache = load_cache()
+    sigs = signatures_for(tweets, cache)
+    out = []
+    for group in cluster(sigs):
+        if len(group) == 1:
+            out.append(tweets[group[0]])
+            continue
+        best = max(group, key=lambda i: (social_index.engagement_score(tweets[i]), -i))
+        rep = dict(tweets[best])
+        rep["cluster_size"] = len(group)
+        out.append(rep)
+    return out
+
+
+def collapse_dimensions(result: dict) -> dict:
+    """Collapse every dimension of a social pulse, sharing one signature cache."""
+    cache = load_cache()
+    size_before = len(cache)
+    collapsed = {k: collapse(v, cache) for k, v in result.items()}
+    if len(cache) != size_before:
+        save_cache(cache)
+    return collapsed
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Per-day index of raw social files under data/social.
+
+Each scrape writes/refreshes `data/social/<date>_manifest.json`:
+
+    {
+      "date": "2026-02-28",
+      "files": {
+        "2026-02-28_TRUMP.json": {
+          "dimension": "search_trump",
+          "count": 15,
+          "min_time": "2026-02-27T21:04:11Z",
+          "max_time": "2026-02-28T06:27:49Z",
+          "mtime": 1772260069.123,
+          "size": 48211
+        },
+        "2026-02-28_interpreted.json": {"dimension": "interpreted", "count": 5, ...}
+      }
+    }
+
+Readers (report social pulse) consult the manifest first and only open files whose
+tweet time range intersects the freshness window. Every read checks the entries
+against the directory listing and each file's mtime/size, so files written by
+other tools (the external interpreter, a git pull) are indexed on the next read
+and removed files are dropped. Manifests are local caches (gitignored).
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SOCIAL_DIR = ROOT / "data" / "social"
+
+MANIFEST_SUFFIX = "_manifest.json"
+INTERPRETED = "interpreted"
+
+# Report dimensions, in display order.
+DIMENSIONS = ("meme_account", "search_trump", "trump_policy", "trump_crypto", "white_house")
+
+# File label (filename without the "<date>_" prefix) -> report dimension.
+LABEL_DIMENSIONS = {
+    "GetTrumpMemes": "meme_account",
+    "TRUMP": "search_trump",
+    "TRUMPMEME": "search_trump",
+    "TRUMP_memecoin": "search_trump",
+    "Trump_policy": "trump_policy",
+    "Trump_crypto": "trump_crypto",
+    "WhiteHouse": "white_house",
+    INTERPRETED: INTERPRETED,
+}
+
+
+def parse_tweet_time(v) -> dt.datetime | None:
+    try:
+        return dt.datetime.fromisoformat(str(v).replace("Z", "+00:00"))
+    except Exception:
+        return None
+
+
+def metric_count(tweet: dict, key: str) -> int:
+    """Parse scraper metric strings like '16245 Likes. Like' / '1,204 reposts. Repost'."""
+    try:
+        raw = (tweet.get("metrics") or {}).get(key, "0")
+        parts = str(raw).split()
+        if parts:
+            return int(parts[0].replace(",", ""))
+    except (ValueError, IndexError, AttributeError):
+        pass
+    return 0
+
+
+def engagement_score(tweet: dict) -> int:
+    """Combined engagement score for ranking: likes + 2 x retweets."""
+    return metric_count(tweet, "likes") + metric_count(tweet, "retweets") * 2
+
+
+def tweet_id(tweet: dict) -> str:
+    """Stable short id (URL, else handle|time|text) shared by the timeseries and dedup caches."""
+    ident = tweet.get("url") or f"{tweet.get('handle', '')}|{tweet.get('time', '')}|{tweet.get('text', '')}"
+    return hashlib.sha1(str(ident).encode("utf-8")).hexdigest()[:12]
+
+
+def _iso(ts: dt.datetime) -> str:
+    return ts.astimezone(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def manifest_path(day: str, social_dir: Path = SOCIAL_DIR) -> Path:
+    return social_dir / f"{day}{MANIFEST_SUFFIX}"
+
+
+def _split_name(name: str) -> tuple[str, str] | None:
+    """'2026-02-28_TRUMP_memecoin.json' -> ('2026-02-28', 'TRUMP_memecoin')."""
+    if not name.endswith(".json") or name.endswith(MANIFEST_SUFFIX):
+        return None
+    day, sep, label = name[: -len(".json")].partition("_")
+    if not sep or len(day) != 10:
+        return None
+    return day, label
+
+
+def describe_file(fp: Path, payload=None) -> dict | None:
+    """Build the manifest entry for one social file (None if not a tracked dimension)."""
+    parts = _split_name(fp.name)
+    if not parts:
+        return None
+    dimension = LABEL_DIMENSIONS.get(parts[1])
+    if not dimension:
+        return None
+
+    if payload is None:
+        try:
+            payload = json.loads(fp.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+
+    if dimension == INTERPRETED:
+        dims = payload.get("dimensions") if isinstance(payload, dict) else None
+        return {"dimension": dimension, "count": len(dims or {})}
+
+    if not isinstance(payload, list):
+        return None
+    times = [ts for ts in (parse_tweet_time(t.get("time")) for t in payload if isinstance(t, dict)) if ts]
+    entry = {"dimension": dimension, "count": len(payload)}
+    if times:
+        entry["min_time"] = _iso(min(times))
+        entry["max_time"] = _iso(max(times))
+    return entry
+
+
+def _write_manifest(day: str, files: dict, social_dir: Path) -> dict:
+    manifest = {"date": day, "files": dict(sorted(files.items()))}
+    manifest_path(day, social_dir).write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return manifest
+
+
+def _read_entries(day: str, social_dir: Path) -> dict:
+    try:
+        files = json.loads(manifest_path(day, social_dir).read_text(encoding="utf-8")).get("files")
+    except Exception:
+        return {}
+    return files if isinstance(files, dict) else {}
+
+
+def _stat(fp: Path) -> dict:
+    st = fp.stat()
+    return {"mtime": round(st.st_mtime, 3), "size": st.st_size}
+
+
+def _tracked(day: str, social_dir: Path) -> list[Path]:
+    out = []
+    for fp in sorted(social_dir.glob(f"{day}_*.json")):
+        parts = _split_name(fp.name)
+        if parts and parts[0] == day and parts[1] in LABEL_DIMENSIONS:
+            out.append(fp)
+    return out
+
+
+def load_day_manifest(day: str, social_dir: Path = SOCIAL_DIR, rebuild: bool = False) -> dict:
+    """The day's manifest, re-describing files that are new, changed (mtime/size) or gone."""
+    stored = {} if rebuild else _read_entries(day, social_dir)
+    listing = _tracked(day, social_dir)
+    changed = set(stored) != {fp.name for fp in listing}
+    files = {}
+    for fp in listing:
+        try:
+            st = _stat(fp)
+        except OSError:
+            changed = True
+            continue
+        entry = stored.get(fp.name)
+        if entry and entry.get("mtime") == st["mtime"] and entry.get("size") == st["size"]:
+            files[fp.name] = entry
+            continue
+        changed = True
+        # Unreadable files get a placeholder so they are not re-parsed until they change.
+        files[fp.name] = (describe_file(fp) or {"dimension": None, "count": 0}) | st
+    if changed and files:
+        return _write_manifest(day, files, social_dir)
+    return {"date": day, "files": files}
+
+
+def build_day_manifest(day: str, social_dir: Path = SOCIAL_DIR) -> dict:
+    """Index every tracked file of one day from scratch."""
+    return load_day_manifest(day, social_dir, rebuild=True)
+
+
+def record_file(fp: Path, payload=None) -> dict | None:
+    """Refresh the manifest entry for a file just written by a scraper."""
+    parts = _split_name(fp.name)
+    entry = describe_file(fp, payload)
+    if not parts or not entry:
+        return None
+    social_dir = fp.parent
+    day = parts[0]
+    files = _read_entries(day, social_dir)  # other entries are re-validated on the next read
+    files[fp.name] = entry | _stat(fp)
+    return _write_manifest(day, files, social_dir)
+
+
+def files_in_window(days: list[str], cutoff: dt.datetime, social_dir: Path = SOCIAL_DIR) -> list[tuple[str, Path]]:
+    """Return (dimension, path) for raw files with at least one tweet at/after cutoff."""
+    selected = []
+    for day in days:
+        for name, entry in load_day_manifest(day, social_dir).get("files", {}).items():
+            dimension = entry.get("dimension")
+            if dimension not in DIMENSIONS or not entry.get("count"):
+                continue
+            max_ts = parse_tweet_time(entry.get("max_time"))
+            if max_ts is None or max_ts < cutoff:
+                continue
+            selected.append((dimension, social_dir / name))
+    return selected
+
+
+def latest_interpreted(days: list[str], social_dir: Path = SOCIAL_DIR) -> tuple[str, Path] | None:
+    """Return (day, path) of the most recent non-empty interpreted snapshot."""
+    for day in days:
+        for name, entry in load_day_manifest(day, social_dir).get("files", {}).items():
+            if entry.get("dimension") == INTERPRETED and entry.get("count"):
+                return day, social_dir / name
+    return None
+
+
+def iter_tweets(paths):
+    """Stream tweets from raw social files one file at a time."""
+    for fp in paths:
+        try:
+            tweets = json.loads(Path(fp).read_text(encoding="utf-8"))
+        except Exception:
+            continue
+        if not isinstance(tweets, list):
+            continue
+        for t in tweets:
+            if isinstance(t, dict):
+                yield t
+
+
+def day_files(day: str, social_dir: Path = SOCIAL_DIR) -> list[Path]:
+    """Raw tweet files (all report dimensions) indexed for one day."""
+    files = load_day_manifest(day, social_dir).get("files", {})
+    return [social_dir / name for name, entry in files.items() if entry.get("dimension") in DIMENSIONS]
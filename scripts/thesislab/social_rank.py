@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Streaming top-K selection of social posts by engagement.
+
+Both report generators rank tweets through here instead of sorting whole lists:
+`top_k` keeps a heap of at most K items, so memory stays bounded by K no matter
+how many tweets the store yields.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import heapq
+import math
+from typing import Callable, Iterable
+
+from thesislab import social_index
+
+RETWEET_WEIGHT = 2.0
+
+
+def engagement_scorer(retweet_weight: float = RETWEET_WEIGHT, half_life_hours: float | None = None, now=None) -> Callable[[dict], float]:
+    """Build a score function: likes + retweet_weight x retweets.
+
+    With `half_life_hours`, the score decays exponentially with tweet age
+    (halved every `half_life_hours`); undated tweets get no recency credit.
+    """
+    if half_life_hours:
+        now = now or dt.datetime.now(dt.timezone.utc)
+        decay_per_hour = math.log(2) / float(half_life_hours)
+
+    def score(tweet: dict) -> float:
+        base = social_index.metric_count(tweet, "likes") + retweet_weight * social_index.metric_count(tweet, "retweets")
+        if not half_life_hours:
+            return base
+        ts = social_index.parse_tweet_time(tweet.get("time"))
+        if ts is None:
+            return 0.0
+        age_hours = max(0.0, (now - ts).total_seconds() / 3600.0)
+        return base * math.exp(-decay_per_hour * age_hours)
+
+    return score
+
+
+def top_k(items: Iterable[dict], k: int, score: Callable[[dict], float] | None = None) -> list[dict]:
+    """Return the K highest-scoring items, best first (ties keep input order)."""
+    if k <= 0:
+        return []
+    score = score or engagement_scorer()
+    heap: list[tuple[float, int, dict]] = []
+    for i, item in enumerate(items):
+        entry = (score(item), -i, item)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+    # -i is unique, so tuple comparison never falls through to the dicts.
+    return [item for _, _, item in sorted(heap, reverse=True)]
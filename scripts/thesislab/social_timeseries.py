@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""Hourly social engagement aggregates, maintained incrementally at ingest.
+
+Outputs (under data/cache/, git-ignored like the raw social files they derive from):
+- social_timeseries.jsonl: append-only ledger, one row per (dimension, hour)
+  bucket touched by an ingest. A later row for the same bucket supersedes the
+  earlier one (readers keep the last row per key).
+- social_rolling.json: rolling 24h/72h/7d aggregates per dimension, rewritten
+  on every ingest so reports read pre-aggregated numbers instead of raw tweets.
+
+Per-bucket tweet ids and engagement values (needed for dedup and percentiles) live
+in timeseries_state.json next to them and are pruned past the longest window;
+`--rebuild` regenerates all three from the raw files. Readers that render the
+windows should use current_windows(), which re-aggregates the retained buckets as
+of now instead of trusting the last ingest's as_of_utc.
+
+CLI: scripts/build_social_timeseries.py
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+from pathlib import Path
+
+from thesislab import social_index
+
+ROOT = Path(__file__).resolve().parents[2]
+CACHE_DIR = ROOT / "data" / "cache"
+TIMESERIES_PATH = CACHE_DIR / "social_timeseries.jsonl"
+ROLLING_PATH = CACHE_DIR / "social_rolling.json"
+STATE_PATH = CACHE_DIR / "timeseries_state.json"
+# Earlier locations, adopted on first load.
+LEGACY_PATHS = {
+    TIMESERIES_PATH: ROOT / "data" / "social_timeseries.jsonl",
+    ROLLING_PATH: ROOT / "data" / "social_rolling.json",
+    STATE_PATH: social_index.SOCIAL_DIR / "timeseries_state.json",
+}
+
+WINDOWS_HOURS = {"24h": 24, "72h": 72, "7d": 168}
+RETENTION_HOURS = max(WINDOWS_HOURS.values()) + 24
+
+
+def _hour_key(ts: dt.datetime) -> str:
+    return ts.astimezone(dt.timezone.utc).strftime("%Y-%m-%dT%H:00:00Z")
+
+
+def percentile(sorted_vals: list, q: float) -> float | None:
+    """Linear-interpolated percentile over an already sorted list."""
+    if not sorted_vals:
+        return None
+    pos = (len(sorted_vals) - 1) * q
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return round(sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (pos - lo), 2)
+
+
+def _adopt_legacy(path: Path) -> None:
+    legacy = LEGACY_PATHS.get(path)
+    if legacy is not None and not path.exists() and legacy.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        legacy.replace(path)
+
+
+def load_state(path: Path = STATE_PATH) -> dict:
+    for p in LEGACY_PATHS:
+        _adopt_legacy(p)
+    if not path.exists():
+        return {"buckets": {}}
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+        if isinstance(state.get("buckets"), dict):
+            return state
+    except Exception:
+        pass
+    return {"buckets": {}}
+
+
+def _save_state(state: dict, path: Path = STATE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state, separators=(",", ":")) + "\n", encoding="utf-8")
+
+
+def _bucket_row(dimension: str, hour: str, bucket: dict) -> dict:
+    values = sorted(bucket["values"])
+    return {
+        "hour": hour,
+        "dimension": dimension,
+        "count": len(values),
+        "likes_sum": bucket["likes"],
+        "retweets_sum": bucket["retweets"],
+        "engagement_sum": sum(values),
+        "engagement_p50": percentile(values, 0.5),
+        "engagement_p90": percentile(values, 0.9),
+    }
+
+
+def _prune(state: dict, now: dt.datetime) -> None:
+    oldest = _hour_key(now - dt.timedelta(hours=RETENTION_HOURS))
+    for key in [k for k in state["buckets"] if k.split("|", 1)[1] < oldest]:
+        del state["buckets"][key]
+
+
+def rolling_windows(state: dict, now: dt.datetime) -> dict:
+    """Aggregate retained hourly buckets into the configured rolling windows."""
+    out = {}
+    for label, hours in WINDOWS_HOURS.items():
+        start = _hour_key(now - dt.timedelta(hours=hours))
+        per_dim = {}
+        for key, bucket in state["buckets"].items():
+            dimension, hour = key.split("|", 1)
+            if hour < start:
+                continue
+            agg = per_dim.setdefault(dimension, {"values": [], "likes": 0, "retweets": 0})
+            agg["values"].extend(bucket["values"])
+            agg["likes"] += bucket["likes"]
+            agg["retweets"] += bucket["retweets"]
+        out[label] = {}
+        for dimension in social_index.DIMENSIONS:
+            agg = per_dim.get(dimension)
+            if not agg:
+                continue
+            values = sorted(agg["values"])
+            out[label][dimension] = {
+                "count": len(values),
+                "likes_sum": agg["likes"],
+                "retweets_sum": agg["retweets"],
+                "engagement_sum": sum(values),
+                "engagement_p50": percentile(values, 0.5),
+                "engagement_p90": percentile(values, 0.9),
+            }
+    return out
+
+
+def write_rolling(state: dict, now: dt.datetime) -> dict:
+    payload = {
+        "as_of_utc": now.replace(microsecond=0).isoformat().replace("+00:00", "Z"),
+        "windows": rolling_windows(state, now),
+    }
+    ROLLING_PATH.parent.mkdir(parents=True, exist_ok=True)
+    ROLLING_PATH.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return payload
+
+
+def _fold(state: dict, dimension: str, tweets: list, oldest: str) -> set:
+    """Add unseen tweets to `state`'s hourly buckets; return the bucket keys touched."""
+    seen = {key: set(b["ids"]) for key, b in state["buckets"].items()}
+    touched = set()
+    for t in tweets:
+        if not isinstance(t, dict):
+            continue
+        ts = social_index.parse_tweet_time(t.get("time"))
+        if ts is None:
+            continue
+        hour = _hour_key(ts)
+        if hour < oldest:
+            continue
+        key = f"{dimension}|{hour}"
+        tid = social_index.tweet_id(t)
+        ids = seen.setdefault(key, set())
+        if tid in ids:
+            continue
+        ids.add(tid)
+        bucket = state["buckets"].setdefault(key, {"ids": [], "values": [], "likes": 0, "retweets": 0})
+        likes = social_index.metric_count(t, "likes")
+        retweets = social_index.metric_count(t, "retweets")
+        bucket["ids"].append(tid)
+        bucket["values"].append(likes + retweets * 2)
+        bucket["likes"] += likes
+        bucket["retweets"] += retweets
+        touched.add(key)
+    return touched
+
+
+def _append_rows(state: dict, touched: set) -> None:
+    if not touched:
+        return
+    TIMESERIES_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with TIMESERIES_PATH.open("a", encoding="utf-8") as f:
+        for key in sorted(touched, key=lambda k: k.split("|", 1)[::-1]):
+            dim, hour = key.split("|", 1)
+            f.write(json.dumps(_bucket_row(dim, hour, state["buckets"][key]), ensure_ascii=False) + "\n")
+
+
+def ingest(dimension: str, tweets: list, now: dt.datetime | None = None, retention: bool = True) -> int:
+    """Fold new tweets of one dimension into hourly buckets; return rows appended.
+
+    Tweets already counted (by URL) are skipped, so scrapers can pass the full merged
+    file contents after every run.
+    """
+    if dimension not in social_index.DIMENSIONS:
+        return 0
+    now = now or dt.datetime.now(dt.timezone.utc)
+    oldest = _hour_key(now - dt.timedelta(hours=RETENTION_HOURS)) if retention else ""
+
+    state = load_state()
+    touched = _fold(state, dimension, tweets, oldest)
+    _append_rows(state, touched)
+    if retention:
+        _prune(state, now)
+    _save_state(state)
+    write_rolling(state, now)
+    return len(touched)
+
+
+def ingest_file(fp: Path, tweets: list | None = None, now: dt.datetime | None = None) -> int:
+    """Ingest a raw social file written by a scraper (dimension derived from its name)."""
+    entry = social_index.describe_file(fp, tweets)
+    if not entry:
+        return 0
+    if tweets is None:
+        try:
+            tweets = json.loads(fp.read_text(encoding="utf-8"))
+        except Exception:
+            return 0
+    return ingest(entry["dimension"], tweets, now=now)
+
+
+def load_hourly(path: Path = TIMESERIES_PATH, since_hours: int | None = None) -> list[dict]:
+    """Latest row per (dimension, hour), sorted by hour; optionally only recent hours."""
+    _adopt_legacy(path)
+    if not path.exists():
+        return []
+    latest = {}
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            latest[(row.get("dimension"), row.get("hour"))] = row
+    rows = sorted(latest.values(), key=lambda r: (r.get("hour", ""), r.get("dimension", "")))
+    if since_hours and rows:
+        last = social_index.parse_tweet_time(rows[-1]["hour"])
+        start = _hour_key(last - dt.timedelta(hours=since_hours))
+        rows = [r for r in rows if r.get("hour", "") >= start]
+    return rows
+
+
+def load_rolling(path: Path = ROLLING_PATH) -> dict | None:
+    _adopt_legacy(path)
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+def current_windows(now: dt.datetime | None = None) -> dict:
+    """Rolling windows as of `now` from the retained buckets (read-only; {} without state)."""
+    state = load_state()
+    if not state["buckets"]:
+        return {}
+    return rolling_windows(state, now or dt.datetime.now(dt.timezone.utc))
+
+
+def rebuild() -> int:
+    """Re-ingest every raw social file from scratch (no retention cut-off).
+
+    Buckets are accumulated in memory and the ledger, state and rolling file are
+    written once at the end; unreadable files are skipped with a warning.
+    """
+    state = {"buckets": {}}
+    touched = set()
+    for fp in sorted(social_index.SOCIAL_DIR.glob("*.json")):
+        if fp.name.endswith(social_index.MANIFEST_SUFFIX):
+            continue
+        try:
+            tweets = json.loads(fp.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[social-timeseries] skipped {fp.name}: {e}")
+            continue
+        entry = social_index.describe_file(fp, tweets)
+        if entry and entry["dimension"] in social_index.DIMENSIONS:
+            touched |= _fold(state, entry["dimension"], tweets, "")
+    TIMESERIES_PATH.unlink(missing_ok=True)
+    _append_rows(state, touched)
+    _save_state(state)
+    write_rolling(state, dt.datetime.now(dt.timezone.utc))
+    return len(touched)
+
+
+def refresh_rolling(now: dt.datetime | None = None) -> dict:
+    """Prune retained buckets and rewrite the rolling windows as of `now`."""
+    now = now or dt.datetime.now(dt.timezone.utc)
+    state = load_state()
+    _prune(state, now)
+    _save_state(state)
+    return write_rolling(state, now)
@@ -0,0 +1,80 @@
+"""Latency/status/size matrix of the on-chain sources, written by debug_onchain_sources.py.
+
+    {"probed_at": ISO, "timeout_s": float,
+     "sources": [{"name", "group", "url", "auth", "ok", "status", "latency_s",
+                  "bytes", "error", "suggested_timeout_s"}],
+     "order": {group: [name, ...]}}     # ok first, then fastest
+
+build_snapshot reads it (when fresh) to order fallbacks and size timeouts;
+without a matrix the hard-coded order and timeouts apply. The file is a local
+cache: the pipeline's probe_sources step regenerates it before build_snapshot
+once it is older than MAX_AGE_S, and CI carries it between runs in the
+Actions cache.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+MATRIX_PATH = ROOT / "data" / "cache" / "source_matrix.json"
+MAX_AGE_S = 24 * 3600
+MIN_TIMEOUT_S = 3.0
+
+
+def suggested_timeout(latency_s: float | None, ok: bool, cap: float) -> float | None:
+    """A healthy source gets 4x its probe latency (at least MIN_TIMEOUT_S, at most `cap`); None otherwise."""
+    if not ok or latency_s is None:
+        return None
+    return round(min(cap, max(MIN_TIMEOUT_S, 4 * latency_s)), 1)
+
+
+def build(results: list[dict], timeout_s: float) -> dict:
+    order: dict[str, list[str]] = {}
+    for r in sorted(results, key=lambda r: (not r["ok"], r["latency_s"] if r["latency_s"] is not None else float("inf"))):
+        order.setdefault(r["group"], []).append(r["name"])
+    return {
+        "probed_at": dt.datetime.now(dt.timezone.utc).isoformat().replace("+00:00", "Z"),
+        "timeout_s": timeout_s,
+        "sources": results,
+        "order": order,
+    }
+
+
+def save(matrix: dict, path: Path = MATRIX_PATH) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(matrix, indent=2) + "\n", encoding="utf-8")
+    tmp.replace(path)
+    return path
+
+
+def load(path: Path = MATRIX_PATH, max_age_s: float = MAX_AGE_S) -> dict | None:
+    """The matrix, or None if missing, unreadable or older than `max_age_s`."""
+    if not path.exists():
+        return None
+    try:
+        matrix = json.loads(path.read_text(encoding="utf-8"))
+        probed = dt.datetime.fromisoformat(matrix["probed_at"].replace("Z", "+00:00"))
+    except (OSError, json.JSONDecodeError, KeyError, ValueError):
+        return None
+    if (dt.datetime.now(dt.timezone.utc) - probed).total_seconds() > max_age_s:
+        return None
+    return matrix
+
+
+def ranked(matrix: dict | None, group: str, names: list[str]) -> list[str]:
+    """`names` reordered by the matrix order for `group`; unknown names keep their place at the end."""
+    if not matrix:
+        return list(names)
+    pos = {n: i for i, n in enumerate((matrix.get("order") or {}).get(group) or [])}
+    return sorted(names, key=lambda n: pos.get(n, len(pos)))
+
+
+def timeout_for(matrix: dict | None, name: str, default: float) -> float:
+    for r in (matrix or {}).get("sources") or []:
+        if r.get("name") == name:
+            return min(default, r.get("suggested_timeout_s") or default)
+    return default
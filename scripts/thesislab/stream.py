@@ -0,0 +1,152 @@
+"""Binance futures/spot WebSocket ingestion: rolling aggregates, minute bars, latest derivatives block.
+
+Streams (combined-stream payloads {"stream", "data"}):
+
+    futures  <sym>@markPrice@1s   mark/index price, funding rate, next funding time
+             <sym>@aggTrade       taker flow (m=true: buyer is maker, i.e. a taker sell)
+             <sym>@forceOrder     liquidations (side SELL: a long was liquidated)
+    spot     <sym>@aggTrade       spot taker flow, last price
+
+Aggregator feeds, per venue, fixed-size 1m/5m/1h ring buffers
+(thesislab/bars.py: bounded memory, O(1) per event). Bars are keyed by the
+exchange event time, so a replayed capture builds the same bars as the live
+stream. latest() reads taker ratios and liquidation imbalance over
+STREAM_HORIZONS from the futures rings, None for a horizon the stream has not
+covered yet; flush() appends closed 1m bars to
+data/stream/bars/<SYMBOL>-<YYYY-MM-DD>.jsonl and rewrites
+data/stream/latest.json, which build_snapshot reads (load_latest) instead of
+polling the REST endpoints while it is fresh.
+
+Bar: {"t": minute start ms, "venue", "o", "h", "l", "c", "trades",
+      "buy_usd", "sell_usd", "liq_long_usd", "liq_short_usd", "liq_count"}
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import time
+from pathlib import Path
+
+from thesislab import bars
+
+ROOT = Path(__file__).resolve().parents[2]
+STREAM_DIR = ROOT / "data" / "stream"
+BARS_DIR = STREAM_DIR / "bars"
+LATEST_PATH = STREAM_DIR / "latest.json"
+
+FUTURES_WS = "wss://fstream.binance.com/stream?streams={s}@markPrice@1s/{s}@aggTrade/{s}@forceOrder"
+SPOT_WS = "wss://stream.binance.com:9443/stream?streams={s}@aggTrade"
+VENUES = ("futures", "spot")
+STREAM_HORIZONS = ("5m", "1h", "4h", "1d")
+MAX_AGE_S = 120
+
+
+def stream_urls(symbol: str) -> dict[str, str]:
+    s = symbol.lower()
+    return {"futures": FUTURES_WS.format(s=s), "spot": SPOT_WS.format(s=s)}
+
+
+def _f(v) -> float:
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class Aggregator:
+    def __init__(self, symbol: str):
+        self.symbol = symbol.upper()
+        self.bars = {v: bars.BarSet() for v in VENUES}
+        self.mark: dict = {}
+        self.last_event_ms = 0
+        self.messages = 0
+
+    def on_message(self, venue: str, raw: str | dict) -> None:
+        msg = json.loads(raw) if isinstance(raw, str) else raw
+        data = msg.get("data", msg)
+        event = data.get("e")
+        event_ms = int(data.get("E") or 0)
+        if not event_ms:
+            return
+        self.messages += 1
+        self.last_event_ms = max(self.last_event_ms, event_ms)
+        bs = self.bars[venue]
+        if event == "markPriceUpdate":
+            bs.tick(event_ms)  # rolls the minute over even without trades
+            self.mark = {
+                "mark_price": _f(data.get("p")),
+                "index_price": _f(data.get("i")),
+                "funding_rate": _f(data.get("r")),
+                "next_funding_time": data.get("T"),
+            }
+        elif event == "aggTrade":
+            price = _f(data.get("p"))
+            bs.trade(event_ms, price, price * _f(data.get("q")), taker_sell=bool(data.get("m")))
+        elif event == "forceOrder":
+            o = data.get("o") or {}
+            usd = _f(o.get("ap") or o.get("p")) * _f(o.get("z") or o.get("q"))
+            bs.liquidation(event_ms, usd, long_side=o.get("S") == "SELL")
+
+    def close_open(self) -> None:
+        """Close the bars still being built (end of a replay or of a bounded run)."""
+        for bs in self.bars.values():
+            bs.close_open()
+
+    def latest(self) -> dict:
+        """Derivatives block over the futures rings (the shape build_snapshot merges)."""
+        fut = self.bars["futures"]
+        as_of = dt.datetime.fromtimestamp(self.last_event_ms / 1000, dt.timezone.utc) if self.last_event_ms else None
+        out = {
+            "source": "binance-ws",
+            "symbol": self.symbol,
+            "as_of_utc": as_of.isoformat().replace("+00:00", "Z") if as_of else None,
+            **self.mark,
+        }
+        # A horizon stays None until the stream has covered it (e.g. right after a restart).
+        for h in STREAM_HORIZONS:
+            flow = fut.flow(h) if fut.covers(h) else {}
+            out[f"taker_buy_sell_ratio_{h}"] = flow.get("taker_buy_sell_ratio")
+            out[f"liquidation_imbalance_{h}"] = flow.get("liquidation_imbalance")
+            out[f"liquidations_long_usd_{h}"] = flow.get("liq_long_usd")
+            out[f"liquidations_short_usd_{h}"] = flow.get("liq_short_usd")
+        hour = fut.flow("1h") if fut.covers("1h") else {}
+        out["taker_buy_usd_1h"], out["taker_sell_usd_1h"] = hour.get("buy_usd"), hour.get("sell_usd")
+        out["spot_last_price"] = self.bars["spot"].last_price()
+        out["minutes"] = fut.coverage_minutes()
+        return out
+
+    def flush(self, stream_dir: Path = STREAM_DIR) -> int:
+        """Append closed 1m bars to the daily bar files and rewrite latest.json; returns bars written."""
+        closed = []
+        for venue, bs in self.bars.items():
+            closed += [{"t": b["t"], "venue": venue, **b} for b in bs.closed]
+            bs.closed = []
+        bars_dir = stream_dir / "bars"
+        bars_dir.mkdir(parents=True, exist_ok=True)
+        by_day: dict[str, list[dict]] = {}
+        for bar in sorted(closed, key=lambda b: (b["t"], b["venue"])):
+            day = dt.datetime.fromtimestamp(bar["t"] / 1000, dt.timezone.utc).strftime("%Y-%m-%d")
+            by_day.setdefault(day, []).append(bar)
+        for day, rows in by_day.items():
+            with (bars_dir / f"{self.symbol}-{day}.jsonl").open("a", encoding="utf-8") as f:
+                for bar in rows:
+                    f.write(json.dumps({k: round(v, 8) if isinstance(v, float) else v for k, v in bar.items()},
+                                       separators=(",", ":")) + "\n")
+        path = stream_dir / "latest.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.latest(), indent=2) + "\n", encoding="utf-8")
+        tmp.replace(path)
+        return len(closed)
+
+
+def load_latest(symbol: str, max_age_s: float = MAX_AGE_S, path: Path = LATEST_PATH) -> dict | None:
+    """The ingest service's latest derivatives block for `symbol`, or None if missing or stale."""
+    try:
+        latest = json.loads(path.read_text(encoding="utf-8"))
+        as_of = dt.datetime.fromisoformat(latest["as_of_utc"].replace("Z", "+00:00")).timestamp()
+    except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError, AttributeError):
+        return None
+    if latest.get("symbol") != symbol.upper() or time.time() - as_of > max_age_s:
+        return None
+    return latest
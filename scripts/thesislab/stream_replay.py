@@ -0,0 +1,78 @@
+"""File-based WebSocket replay server: serves a recorded capture as if it were Binance.
+
+A capture is what `stream_ingest.py --record` writes, one message per line:
+
+    {"venue": "futures" | "spot", "recv_ms": int, "msg": "<raw combined-stream payload>"}
+
+A client connecting to ws://host:port/<venue> receives that venue's messages
+in order (paced by recv_ms / speed; speed 0 = as fast as possible), then a
+close frame. Used to test the ingest path without network:
+
+    server = stream_replay.serve(Path("capture.jsonl"))
+    server.urls   # {"futures": "ws://127.0.0.1:PORT/futures", "spot": ...}
+    server.shutdown()
+"""
+
+from __future__ import annotations
+
+import json
+import socketserver
+import threading
+import time
+from pathlib import Path
+
+from thesislab import ws
+
+
+def load_capture(path: Path) -> list[dict]:
+    rows = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            rows.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return rows
+
+
+class ReplayServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, capture: list[dict], host: str, port: int, speed: float):
+        self.capture = capture
+        self.speed = speed
+        super().__init__((host, port), _Handler)
+
+    @property
+    def urls(self) -> dict[str, str]:
+        host, port = self.server_address[:2]
+        return {venue: f"ws://{host}:{port}/{venue}" for venue in ("futures", "spot")}
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        try:
+            conn = ws.accept(self.request)
+        except (ConnectionError, ws.WebSocketClosed, OSError):
+            return
+        venue = conn.path.split("?")[0].strip("/")
+        prev = None
+        try:
+            for row in self.server.capture:
+                if row.get("venue") != venue:
+                    continue
+                if self.server.speed > 0 and prev is not None:
+                    time.sleep(max(0.0, (row["recv_ms"] - prev) / 1000 / self.server.speed))
+                prev = row.get("recv_ms")
+                conn.send(row["msg"])
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+
+def serve(capture_path: Path, host: str = "127.0.0.1", port: int = 0, speed: float = 0.0) -> ReplayServer:
+    """Start a replay server in a background thread (port 0: any free port)."""
+    server = ReplayServer(load_capture(capture_path), host, port, speed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,183 @@
+"""Lightweight run telemetry: timed spans and counters, one JSON file per run.
+
+    telemetry.start("build_snapshot")
+    with telemetry.span("upstream.api.dexscreener.com"):
+        ...
+    telemetry.incr("retries")
+    telemetry.finish()          # -> data/telemetry/{run_id}.json
+
+Span names are dotted: `upstream.<host or source>` for network calls,
+`stage.<name>` for script phases, `step.<name>` for pipeline steps.
+Counters in use: retries, bytes_in, cache_hits.
+
+Without an active run, span() and incr() cost next to nothing and record
+nothing. start() inside an active run (a script called from pipeline.py)
+joins it; only the outermost finish() writes the file. The newest
+KEEP_RUNS files are kept. Run files are not committed: CI carries them from
+run to run in the Actions cache and uploads each run's files as an artifact.
+
+Run file: {"run_id", "script", "started_at", "elapsed_s", "spans": [{"name",
+"start_s", "elapsed_s", "status"}], "counters": {name: int}}
+"""
+
+from __future__ import annotations
+
+import contextlib
+import datetime as dt
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+TELEMETRY_DIR = ROOT / "data" / "telemetry"
+KEEP_RUNS = 200
+
+
+class Run:
+    def __init__(self, script: str):
+        now = dt.datetime.now(dt.timezone.utc)
+        self.run_id = f"{now.strftime('%Y%m%dT%H%M%SZ')}-{script}-{os.getpid()}"
+        self.script = script
+        self.started_at = now.isoformat().replace("+00:00", "Z")
+        self.t0 = time.perf_counter()
+        self.spans: list[dict] = []
+        self.counters: dict[str, int] = {}
+        self.depth = 1
+        self.lock = threading.Lock()
+
+    def to_dict(self) -> dict:
+        with self.lock:
+            return {
+                "run_id": self.run_id,
+                "script": self.script,
+                "started_at": self.started_at,
+                "elapsed_s": round(time.perf_counter() - self.t0, 4),
+                "spans": list(self.spans),
+                "counters": dict(self.counters),
+            }
+
+
+_run: Run | None = None
+_lock = threading.Lock()
+
+
+def start(script: str) -> Run:
+    """Begin a run, or join the one already active in this process."""
+    global _run
+    with _lock:
+        if _run is not None:
+            _run.depth += 1
+        else:
+            _run = Run(script)
+        return _run
+
+
+def finish(out_dir: Path = TELEMETRY_DIR) -> Path | None:
+    """End the run; the outermost call writes and returns the run file."""
+    global _run
+    with _lock:
+        run = _run
+        if run is None:
+            return None
+        run.depth -= 1
+        if run.depth > 0:
+            return None
+        _run = None
+    try:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        path = out_dir / f"{run.run_id}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(run.to_dict(), indent=2) + "\n", encoding="utf-8")
+        tmp.replace(path)
+        for old in sorted(out_dir.glob("*.json"))[:-KEEP_RUNS]:
+            old.unlink()
+    except OSError as e:
+        print(f"[telemetry] could not write run file: {e}")
+        return None
+    print(f"wrote {path}")
+    return path
+
+
+def active() -> Run | None:
+    return _run
+
+
+@contextlib.contextmanager
+def span(name: str):
+    """Time the block under `name`; status is "error" if it raises.
+
+    Yields a dict whose "status" the block may set itself, for callees that
+    report failure by return value instead of raising.
+    """
+    mark = {"status": "ok"}
+    run = _run
+    if run is None:
+        yield mark
+        return
+    t0 = time.perf_counter()
+    try:
+        yield mark
+    except BaseException:
+        mark["status"] = "error"
+        raise
+    finally:
+        entry = {
+            "name": name,
+            "start_s": round(t0 - run.t0, 4),
+            "elapsed_s": round(time.perf_counter() - t0, 4),
+            "status": mark["status"],
+        }
+        with run.lock:
+            run.spans.append(entry)
+
+
+def incr(name: str, n: int = 1) -> None:
+    run = _run
+    if run is None:
+        return
+    with run.lock:
+        run.counters[name] = run.counters.get(name, 0) + n
+
+
+def load_runs(last: int = 30, in_dir: Path = TELEMETRY_DIR) -> list[dict]:
+    """The newest `last` run files, oldest first (unreadable files skipped)."""
+    runs = []
+    for path in sorted(in_dir.glob("*.json"))[-last:] if in_dir.exists() else []:
+        try:
+            runs.append(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, json.JSONDecodeError):
+            continue
+    return runs
+
+
+def _percentile(sorted_vals: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_vals[max(0, math.ceil(q * len(sorted_vals)) - 1)]
+
+
+def latency_summary(runs: list[dict], prefix: str = "upstream.") -> dict:
+    """{name: {"n", "errors", "p50_s", "p95_s"}} for spans starting with `prefix`."""
+    samples: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    for run in runs:
+        for s in run.get("spans") or []:
+            name = s.get("name", "")
+            if not name.startswith(prefix):
+                continue
+            key = name[len(prefix):]
+            samples.setdefault(key, []).append(float(s.get("elapsed_s") or 0.0))
+            if s.get("status") != "ok":
+                errors[key] = errors.get(key, 0) + 1
+    out = {}
+    for key, vals in sorted(samples.items()):
+        vals.sort()
+        out[key] = {
+            "n": len(vals),
+            "errors": errors.get(key, 0),
+            "p50_s": round(_percentile(vals, 0.50), 3),
+            "p95_s": round(_percentile(vals, 0.95), 3),
+        }
+    return out
@@ -0,0 +1,162 @@
+"""Streaming evaluator for the falsification triggers (docs/scenario_matrix.md).
+
+    A  24H whale-to-exchange net inflow > 5% of liquidity at any sample of the last 4H
+       (the netflow feed is a 24H aggregate; no 4H netflow is available)
+    B  DEX depth-2% down > 30% from its 1H high, not recovered
+    C  top10_holder_pct down > 3 points from its 24H high
+
+Each trigger keeps a time-windowed ring buffer of its metric with monotonic
+deques for the window max/min, so a new sample costs O(1) amortized no
+matter how often we sample. States:
+
+    confirmed       the condition holds at the latest sample
+    not_confirmed   the metric is observed and the condition does not hold
+    blind           the latest sample has no value for the metric
+
+Samples are timeseries rows (build_snapshot.timeseries_row); the engine for
+a new snapshot is warmed up by replaying the rows inside the longest window.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+from collections import deque
+from pathlib import Path
+
+TRIGGERS = {
+    "A": {"metric": "netflow_24h_liquidity_ratio", "window_h": 4, "threshold": 0.05,
+          "label": "24H whale-to-exchange netflow spike"},
+    "B": {"metric": "dex_depth_2pct_usd", "window_h": 1, "threshold": 0.30,
+          "label": "orderbook depth shock"},
+    "C": {"metric": "top10_holder_pct", "window_h": 24, "threshold": 3.0,
+          "label": "holder concentration decay"},
+}
+RING_CAPACITY = 1024
+MAX_WINDOW_S = max(t["window_h"] for t in TRIGGERS.values()) * 3600
+
+
+def _ts(as_of_utc: str) -> float:
+    return dt.datetime.fromisoformat(as_of_utc.replace("Z", "+00:00")).timestamp()
+
+
+def _num(v):
+    return float(v) if isinstance(v, (int, float)) else None
+
+
+def metric(row: dict, name: str) -> float | None:
+    if name == "netflow_24h_liquidity_ratio":
+        netflow, liq = _num(row.get("exchange_netflow_usd_24h")), _num(row.get("liquidity_usd"))
+        return netflow / liq if netflow is not None and liq else None
+    return _num(row.get(name))
+
+
+class RollingWindow:
+    """(t, value) samples of the last `window_s` seconds with O(1) amortized max/min."""
+
+    def __init__(self, window_s: float, capacity: int = RING_CAPACITY):
+        self.window_s = window_s
+        self.items: deque = deque(maxlen=capacity)
+        self._max: deque = deque()
+        self._min: deque = deque()
+
+    def push(self, t: float, v: float) -> None:
+        self.items.append((t, v))
+        while self._max and self._max[-1][1] <= v:
+            self._max.pop()
+        self._max.append((t, v))
+        while self._min and self._min[-1][1] >= v:
+            self._min.pop()
+        self._min.append((t, v))
+        self.evict(t)
+
+    def evict(self, now: float) -> None:
+        cutoff = now - self.window_s
+        while self.items and self.items[0][0] < cutoff:
+            self.items.popleft()
+        oldest = self.items[0][0] if self.items else float("inf")
+        for mono in (self._max, self._min):
+            while mono and mono[0][0] < oldest:
+                mono.popleft()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def latest(self) -> float | None:
+        return self.items[-1][1] if self.items else None
+
+    def max(self) -> float | None:
+        return self._max[0][1] if self._max else None
+
+    def min(self) -> float | None:
+        return self._min[0][1] if self._min else None
+
+
+class TriggerEngine:
+    def __init__(self):
+        self.windows = {k: RollingWindow(t["window_h"] * 3600) for k, t in TRIGGERS.items()}
+        self.state = {k: "blind" for k in TRIGGERS}
+        self.values: dict[str, float | None] = {k: None for k in TRIGGERS}
+
+    def _evaluate(self, name: str) -> tuple[str, float | None]:
+        w = self.windows[name]
+        threshold = TRIGGERS[name]["threshold"]
+        latest, high = w.latest(), w.max()
+        if name == "A":
+            return ("confirmed" if high > threshold else "not_confirmed"), high
+        if name == "B":
+            drop = 1 - latest / high if high else 0.0
+            return ("confirmed" if drop > threshold else "not_confirmed"), round(drop, 6)
+        drop = high - latest
+        return ("confirmed" if drop > threshold else "not_confirmed"), round(drop, 6)
+
+    def update(self, row: dict) -> list[dict]:
+        """Feed one timeseries row; returns the state transitions it caused."""
+        t = _ts(row["as_of_utc"])
+        transitions = []
+        for name, spec in TRIGGERS.items():
+            w = self.windows[name]
+            v = metric(row, spec["metric"])
+            if v is None:
+                w.evict(t)
+                state, value = "blind", None
+            else:
+                w.push(t, v)
+                state, value = self._evaluate(name)
+            if state != self.state[name]:
+                transitions.append({"trigger": name, "from": self.state[name], "to": state, "at": row["as_of_utc"]})
+            self.state[name] = state
+            self.values[name] = value
+        return transitions
+
+    def report(self) -> dict:
+        """{name: {"state", "value", "threshold", "window_h", "samples"}} for the snapshot."""
+        return {
+            name: {
+                "state": self.state[name],
+                "value": self.values[name],
+                "threshold": spec["threshold"],
+                "window_h": spec["window_h"],
+                "samples": len(self.windows[name]),
+            }
+            for name, spec in TRIGGERS.items()
+        }
+
+
+def from_rows(rows: list[dict], until: str | None = None) -> TriggerEngine:
+    """Engine warmed up with the rows inside the longest window before `until` (default: last row)."""
+    rows = [r for r in rows if r.get("as_of_utc")]
+    engine = TriggerEngine()
+    if not rows:
+        return engine
+    end = _ts(until) if until else _ts(rows[-1]["as_of_utc"])
+    for row in rows:
+        if end - MAX_WINDOW_S <= _ts(row["as_of_utc"]) <= end:
+            engine.update(row)
+    return engine
+
+
+def load_rows(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    return [json.loads(x) for x in path.read_text(encoding="utf-8").splitlines() if x.strip()]
@@ -0,0 +1,111 @@
+"""Cross-venue reconciliation of TRUMP price, liquidity and 24h volume.
+
+Venue fetchers run concurrently; one that has not answered after
+GATHER_TIMEOUT_S is dropped (status "timeout") instead of holding up the
+snapshot. The caller turns each payload into a quote
+
+    {"price_usd", "liquidity_usd", "volume_24h_usd", "as_of"}   # any subset
+
+and reconcile() takes, per field, the median of the fresh quotes (staleness
+<= MAX_STALENESS_S). A venue diverges on a field when it is further from the
+median than MAD_K robust sigmas (1.4826 * MAD) *and* than the field's floor
+in FIELDS (relative to the median), so that three venues agreeing to the
+cent do not flag a fourth 0.5% away. Fields with a None floor get a
+consensus but never flag (venues define volume too differently).
+
+    raw = venues.gather({"coingecko": fetch_coingecko_price, ...})
+    rec = venues.reconcile({name: quote, ...}, raw)
+    rec["consensus"]["price_usd"]["value"]
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable
+
+FIELDS = {"price_usd": 0.02, "liquidity_usd": 0.50, "volume_24h_usd": None}
+MAD_K = 3.0
+MAD_SIGMA = 1.4826
+MAX_STALENESS_S = 15 * 60
+GATHER_TIMEOUT_S = 40.0
+
+
+def gather(fetchers: dict[str, Callable], timeout: float = GATHER_TIMEOUT_S) -> dict[str, dict]:
+    """{venue: {"status", "data", "latency_s", "fetched_at", "error"}}; status is ok/empty/error/timeout."""
+    t0 = time.perf_counter()
+    out: dict[str, dict] = {}
+
+    def run(name, fn):
+        try:
+            data = fn()
+        except Exception as e:  # noqa: BLE001 - one bad venue must not sink the others
+            return {"status": "error", "data": None, "error": f"{type(e).__name__}: {e}"}
+        finally:
+            out[name] = {"latency_s": round(time.perf_counter() - t0, 3), "fetched_at": round(time.time(), 3)}
+        return {"status": "ok" if data else "empty", "data": data, "error": None}
+
+    pool = ThreadPoolExecutor(max_workers=max(1, len(fetchers)))
+    futures = {name: pool.submit(run, name, fn) for name, fn in fetchers.items()}
+    wait(futures.values(), timeout=timeout)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    result = {}
+    for name, fut in futures.items():
+        if fut.done():
+            result[name] = out[name] | fut.result()
+        else:
+            result[name] = {"status": "timeout", "data": None, "latency_s": None, "fetched_at": None,
+                            "error": f"no answer within {timeout:g}s"}
+    return result
+
+
+def _consensus(values: dict[str, float], floor: float | None) -> tuple[dict, list[str]]:
+    median = statistics.median(values.values())
+    mad = statistics.median(abs(v - median) for v in values.values())
+    divergent = []
+    if floor is not None and median and len(values) >= 3:
+        limit = max(MAD_K * MAD_SIGMA * mad, floor * abs(median))
+        divergent = [name for name, v in values.items() if abs(v - median) > limit]
+    return {"value": round(median, 8), "mad": round(mad, 8), "venues": len(values)}, divergent
+
+
+def reconcile(quotes: dict[str, dict], raw: dict[str, dict] | None = None, now: float | None = None) -> dict:
+    """{"consensus": {field: {"value", "mad", "venues"}}, "venues": {name: {...}}, "divergent": [(venue, field)]}.
+
+    `raw` (from gather) supplies status, latency and fetch time; a quote
+    without "as_of" is as old as its fetch.
+    """
+    now = now if now is not None else time.time()
+    raw = raw or {}
+    venues: dict[str, dict] = {}
+    for name in sorted(set(raw) | set(quotes)):
+        r = raw.get(name) or {}
+        q = quotes.get(name) or {}
+        as_of = q.get("as_of") or r.get("fetched_at")
+        venues[name] = {
+            "status": r.get("status", "ok" if q else "empty"),
+            "latency_s": r.get("latency_s"),
+            "staleness_s": round(max(0.0, now - as_of), 1) if as_of else None,
+            **{f: q.get(f) for f in FIELDS},
+            "divergent": [],
+        }
+        if r.get("error"):
+            venues[name]["error"] = r["error"]
+
+    consensus, divergent = {}, []
+    for field, floor in FIELDS.items():
+        values = {
+            name: v[field] for name, v in venues.items()
+            if isinstance(v[field], (int, float)) and v[field] > 0
+            and v["staleness_s"] is not None and v["staleness_s"] <= MAX_STALENESS_S
+        }
+        if not values:
+            consensus[field] = {"value": None, "mad": None, "venues": 0}
+            continue
+        consensus[field], names = _consensus(values, floor)
+        for name in names:
+            venues[name]["divergent"].append(field)
+            divergent.append((name, field))
+    return {"consensus": consensus, "venues": venues, "divergent": divergent}
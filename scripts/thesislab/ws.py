@@ -0,0 +1,174 @@
+"""Minimal RFC 6455 WebSocket client and server on the standard library.
+
+Enough for exchange market-data streams and the local replay server: text
+frames, fragmentation, ping/pong and close; no extensions or compression.
+
+    conn = ws.connect("wss://fstream.binance.com/stream?streams=trumpusdt@aggTrade")
+    msg = conn.recv()          # str; answers pings, raises WebSocketClosed on close
+
+    conn = ws.accept(sock)     # server side, after socket.accept()
+    conn.path                  # request path, e.g. "/futures"
+    conn.send(json.dumps(...))
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import socket
+import ssl
+import struct
+import urllib.parse
+
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_CONT, OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x0, 0x1, 0x2, 0x8, 0x9, 0xA
+MAX_HEADER_BYTES = 16384
+
+
+class WebSocketClosed(Exception):
+    """The peer closed the connection (close frame or EOF)."""
+
+
+def accept_key(key: str) -> str:
+    return base64.b64encode(hashlib.sha1((key + GUID).encode("ascii")).digest()).decode("ascii")
+
+
+def _read_headers(sock: socket.socket) -> tuple[str, dict[str, str], bytes]:
+    """Status/request line, lower-cased headers, and any bytes read past the headers."""
+    data = b""
+    while b"\r\n\r\n" not in data:
+        chunk = sock.recv(1024)
+        if not chunk:
+            raise WebSocketClosed("connection closed during handshake")
+        data += chunk
+        if len(data) > MAX_HEADER_BYTES:
+            raise ValueError("handshake headers too large")
+    head, _, rest = data.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        k, _, v = line.partition(":")
+        headers[k.strip().lower()] = v.strip()
+    return lines[0], headers, rest
+
+
+class Connection:
+    def __init__(self, sock: socket.socket, mask: bool, path: str = "/", buffered: bytes = b""):
+        self.sock = sock
+        self.buf = buffered
+        self.mask = mask  # clients mask their frames, servers do not
+        self.path = path
+        self.closed = False
+
+    def _read_exact(self, n: int) -> bytes:
+        while len(self.buf) < n:
+            chunk = self.sock.recv(max(4096, n - len(self.buf)))
+            if not chunk:
+                self.closed = True
+                raise WebSocketClosed("connection closed by peer")
+            self.buf += chunk
+        out, self.buf = self.buf[:n], self.buf[n:]
+        return out
+
+    def _read_frame(self) -> tuple[bool, int, bytes]:
+        b0, b1 = self._read_exact(2)
+        length = b1 & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", self._read_exact(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", self._read_exact(8))[0]
+        key = self._read_exact(4) if b1 & 0x80 else None
+        payload = self._read_exact(length)
+        if key:
+            payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+        return bool(b0 & 0x80), b0 & 0x0F, payload
+
+    def send(self, data: str | bytes, opcode: int = OP_TEXT) -> None:
+        payload = data.encode("utf-8") if isinstance(data, str) else data
+        n = len(payload)
+        head = bytes([0x80 | opcode])
+        bit = 0x80 if self.mask else 0
+        if n < 126:
+            head += bytes([bit | n])
+        elif n < 1 << 16:
+            head += bytes([bit | 126]) + struct.pack("!H", n)
+        else:
+            head += bytes([bit | 127]) + struct.pack("!Q", n)
+        if self.mask:
+            key = os.urandom(4)
+            head += key
+            payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+        self.sock.sendall(head + payload)
+
+    def recv(self) -> str:
+        """Next text (or binary, decoded) message; control frames are handled here."""
+        parts: list[bytes] = []
+        while True:
+            fin, opcode, payload = self._read_frame()
+            if opcode == OP_PING:
+                self.send(payload, OP_PONG)
+                continue
+            if opcode == OP_PONG:
+                continue
+            if opcode == OP_CLOSE:
+                if not self.closed:
+                    self.closed = True
+                    try:
+                        self.send(payload[:2], OP_CLOSE)
+                    except OSError:
+                        pass
+                raise WebSocketClosed("close frame received")
+            parts.append(payload)
+            if fin:
+                return b"".join(parts).decode("utf-8")
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            try:
+                self.send(struct.pack("!H", 1000), OP_CLOSE)
+            except OSError:
+                pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+def connect(url: str, timeout: float = 30.0) -> Connection:
+    """Open a ws:// or wss:// connection; `timeout` also bounds every later recv()."""
+    u = urllib.parse.urlsplit(url)
+    secure = u.scheme == "wss"
+    port = u.port or (443 if secure else 80)
+    sock = socket.create_connection((u.hostname, port), timeout=timeout)
+    if secure:
+        sock = ssl.create_default_context().wrap_socket(sock, server_hostname=u.hostname)
+    key = base64.b64encode(os.urandom(16)).decode("ascii")
+    path = (u.path or "/") + (f"?{u.query}" if u.query else "")
+    host = u.hostname if u.port is None else f"{u.hostname}:{u.port}"
+    sock.sendall((
+        f"GET {path} HTTP/1.1\r\nHost: {host}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\nUser-Agent: trump-thesis-lab/stream\r\n\r\n"
+    ).encode("ascii"))
+    status, headers, rest = _read_headers(sock)
+    if " 101 " not in f"{status} " or headers.get("sec-websocket-accept") != accept_key(key):
+        sock.close()
+        raise ConnectionError(f"websocket handshake failed: {status}")
+    return Connection(sock, mask=True, path=path, buffered=rest)
+
+
+def accept(sock: socket.socket) -> Connection:
+    """Server-side handshake on an accepted socket."""
+    request, headers, rest = _read_headers(sock)
+    key = headers.get("sec-websocket-key")
+    if not key or headers.get("upgrade", "").lower() != "websocket":
+        sock.sendall(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+        sock.close()
+        raise ConnectionError(f"not a websocket request: {request}")
+    sock.sendall((
+        "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        f"Sec-WebSocket-Accept: {accept_key(key)}\r\n\r\n"
+    ).encode("ascii"))
+    parts = request.split(" ")
+    return Connection(sock, mask=False, path=parts[1] if len(parts) > 1 else "/", buffered=rest)
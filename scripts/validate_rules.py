@@ -12,8 +12,9 @@ def assert_close(a, b, eps=1e-9):
     return abs(a - b) <= eps
 
 
-def main():
-    rules = json.loads(RULES_PATH.read_text(encoding="utf-8"))
+def main(rules=None):
+    if rules is None:
+        rules = json.loads(RULES_PATH.read_text(encoding="utf-8"))
     schema = json.loads(SCHEMA_PATH.read_text(encoding="utf-8"))
 
     validator = Draft202012Validator(schema)